@@ -4,6 +4,8 @@ from app.api.endpoints import auth
 from app.api.endpoints import events
 from app.api.endpoints import inscriptions
 from app.api.endpoints import rating
+from app.api.endpoints import monitoring
+from app.api.endpoints import jobs
 
 api_router = APIRouter()
 
@@ -20,4 +22,10 @@ api_router.include_router(events.router, tags=["Events"])
 api_router.include_router(inscriptions.router, tags=["Inscriptions"])
 
 # Rotas de Avaliações (NOVO - Adicionamos o prefixo /ratings aqui pois no arquivo é /)
-api_router.include_router(rating.router, prefix="/ratings", tags=["Ratings"])
\ No newline at end of file
+api_router.include_router(rating.router, prefix="/ratings", tags=["Ratings"])
+
+# Rotas de Monitoramento (estatísticas internas, apenas Admin)
+api_router.include_router(monitoring.router, tags=["Monitoring"])
+
+# Rotas das tarefas em segundo plano (status e arquivos gerados)
+api_router.include_router(jobs.router, tags=["Jobs"])
@@ -44,7 +44,7 @@ async def get_current_user(
     except (JWTError, ValidationError):
         raise credentials_exception
 
-    user = await user_service.get_user_by_email(db, email=token_data.email)
+    user = await user_service.get_principal(db, email=token_data.email)
 
     if user is None:
         raise credentials_exception
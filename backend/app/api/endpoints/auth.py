@@ -22,7 +22,7 @@ async def login_for_access_token(
     """
     user = await user_service.get_user_by_email(db, email=form_data.username)
 
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    if not user or not await verify_password(form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="E-mail ou senha incorretos",
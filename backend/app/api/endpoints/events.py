@@ -1,12 +1,22 @@
-from fastapi import APIRouter, Depends, Response, status
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from fastapi.responses import FileResponse
+from datetime import datetime
+from enum import Enum
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 
 from app.db.base import get_db
+from app.db.replicas import get_read_db, is_primary_session, replica_router
 from app.db.models.user import User
 from app.db.models.event import EventType
-from app.schemas.event import EventCreate, EventRead, EventUpdate
-from app.services import event_service
+from app.schemas.event import EventCreate, EventRead, EventUpdate, EventPage, EventSort, EventConflict, EventMaterialRead
+from app.schemas.stats import DashboardStats
+from app.services import event_service, material_service, search_service
+from app.core.conditional import is_not_modified, not_modified, set_validators, make_etag
+from app.core.config import settings
+from app.core.response_cache import CachedResponse
+from app.core.responses import dump_json, json_response
+from app.services.event_service import event_cache, visibility_class
 from app.api.deps import (
     get_current_organizer_user, 
     get_current_user_optional,
@@ -16,6 +26,15 @@ from app.api.deps import get_current_organizer_user, get_current_user_optional
 
 router = APIRouter()
 
+def _cached_json(cached: CachedResponse) -> Response:
+    """Devolve o corpo já serializado, com os validadores HTTP."""
+    response = Response(content=cached.body, media_type="application/json")
+    return set_validators(response, cached.etag, cached.last_modified)
+
+def _cache_ttl(db: AsyncSession) -> Optional[float]:
+    """TTL da resposta montada com `db`: o padrão no primário, curto em uma réplica."""
+    return None if is_primary_session(db) else settings.RESPONSE_CACHE_REPLICA_TTL_SECONDS
+
 @router.post(
     "/events",
     response_model=EventRead,
@@ -35,43 +54,147 @@ async def create_new_event(
     )
     return new_event
 
+@router.get(
+    "/events/search",
+    response_model=List[EventRead]
+)
+async def search_events(
+    q: str = Query(..., min_length=1, max_length=200),
+    event_type: Optional[EventType] = None,
+    limit: int = Query(20, ge=1, le=50),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Optional[User] = Depends(get_current_user_optional)
+):
+    """
+    Busca eventos por título, descrição, host e local (RF29), por relevância.
+    Ignora acentos e aceita a última palavra incompleta (para autocompletar).
+    Eventos privados só são visíveis para organizadores/admins.
+    """
+    events = await search_service.search_events(
+        db, current_user, q, event_type=event_type, limit=limit
+    )
+    return json_response(List[EventRead], events)
+
+@router.get(
+    "/events/conflicts",
+    response_model=List[EventConflict]
+)
+async def get_event_conflicts(
+    start_time: datetime,
+    end_time: datetime,
+    location: Optional[str] = None,
+    host: Optional[str] = None,
+    event_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_organizer_user)
+):
+    """
+    Lista todos os eventos que conflitam com o horário, local e host informados.
+    Use `event_id` para ignorar o próprio evento ao editá-lo.
+    Acessível apenas para Organizadores e Administradores.
+    """
+    conflicts = await event_service.find_conflicts(
+        db, start_time, end_time, location, host, event_id_to_ignore=event_id
+    )
+    return json_response(List[EventConflict], [
+        EventConflict(
+            id=event.id,
+            title=event.title,
+            start_time=event.start_time,
+            end_time=event.end_time,
+            location=event.location,
+            host=event.host,
+            same_location=bool(location) and event.location == location,
+            same_host=bool(host) and event.host == host
+        )
+        for event in conflicts
+    ])
+
 @router.get(
     "/events/{event_id}",
     response_model=EventRead
 )
 async def get_event_details(
     event_id: int,
-    db: AsyncSession = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_read_db),
     current_user: Optional[User] = Depends(get_current_user_optional)
 ):
     """
     Retorna os detalhes de um evento específico.
     Eventos privados só são visíveis para organizadores/admins.
+    Suporta GET condicional (If-None-Match / If-Modified-Since → 304)
+    e é servido do cache de respostas quando possível.
     """
-    event = await event_service.get_event_by_id(
-        db=db, event_id=event_id, user=current_user
-    )
-    return event
+    cached, token = await event_cache.lookup(f"detail:{visibility_class(current_user)}:{event_id}")
+    if replica_router.is_sticky():
+        # Quem acabou de escrever ignora o cache (pode ter vindo de uma réplica atrasada)
+        cached = None
+
+    if cached is None:
+        validators = await event_service.get_event_validators(db, event_id, current_user)
+        if validators and is_not_modified(request, *validators):
+            return not_modified(*validators)
+
+        event = await event_service.get_event_by_id(
+            db=db, event_id=event_id, user=current_user
+        )
+        cached = CachedResponse(
+            body=dump_json(EventRead, event),
+            etag=make_etag(event.id, event.version),
+            last_modified=event.updated_at
+        )
+        await event_cache.store(token, cached, ttl=_cache_ttl(db))
+
+    if is_not_modified(request, cached.etag, cached.last_modified):
+        return not_modified(cached.etag, cached.last_modified)
+    return _cached_json(cached)
 
 @router.get(
     "/events",
-    response_model=List[EventRead]
+    response_model=EventPage
 )
 async def get_all_events(
-    db: AsyncSession = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_read_db),
     current_user: Optional[User] = Depends(get_current_user_optional),
 
     event_type: Optional[EventType] = None,
-    title: Optional[str] = None
+    title: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    sort: EventSort = EventSort.start_time_desc
 ):
     """
-    Retorna uma lista de eventos, com filtros.
+    Retorna uma página de eventos, com filtros.
+    Para a próxima página, envie o `next_cursor` recebido no parâmetro `cursor`.
     Eventos privados só são visíveis para organizadores/admins.
+    Suporta GET condicional (If-None-Match → 304) com um ETag da coleção
+    e é servido do cache de respostas quando possível.
     """
-    events = await event_service.get_events(
-        db=db, user=current_user, event_type=event_type, title=title
+    filters = dict(event_type=event_type, title=title, limit=limit, cursor=cursor, sort=sort)
+    cache_key = "list:" + visibility_class(current_user) + ":" + ":".join(
+        str(value.value if isinstance(value, Enum) else value) for value in filters.values()
     )
-    return events
+    cached, token = await event_cache.lookup(cache_key)
+    if replica_router.is_sticky():
+        cached = None
+
+    if cached is None:
+        etag = await event_service.get_events_etag(db=db, user=current_user, **filters)
+        if is_not_modified(request, etag):
+            return not_modified(etag)
+
+        page = await event_service.get_events(db=db, user=current_user, **filters)
+        cached = CachedResponse(
+            body=dump_json(EventPage, page),
+            etag=etag
+        )
+        await event_cache.store(token, cached, ttl=_cache_ttl(db))
+
+    if is_not_modified(request, cached.etag):
+        return not_modified(cached.etag)
+    return _cached_json(cached)
 
 @router.put(
     "/events/{event_id}",
@@ -113,13 +236,99 @@ async def delete_existing_event(
     )
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
-@router.get("/dashboard/stats")
-async def get_stats(
+@router.post(
+    "/events/{event_id}/materials",
+    response_model=EventMaterialRead,
+    status_code=201
+)
+async def upload_event_material(
+    event_id: int,
+    request: Request,
+    filename: str = Query(..., min_length=1, max_length=200),
+    title: Optional[str] = Query(None, max_length=200),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Envia o arquivo de um material do evento (slides, apostilas), com o
+    conteúdo direto no corpo da requisição (sem multipart) e o Content-Type
+    do arquivo. O corpo é gravado em disco em partes, até MATERIAL_MAX_BYTES.
+    Acessível apenas para o Criador do evento ou Administradores.
+    """
+    content_length = request.headers.get("content-length")
+    material = await material_service.upload_material(
+        db,
+        event_id=event_id,
+        user=current_user,
+        filename=filename,
+        title=title,
+        content_type=request.headers.get("content-type"),
+        content_length=int(content_length) if content_length and content_length.isdigit() else None,
+        chunks=request.stream()
+    )
+    return json_response(EventMaterialRead, material, status_code=201)
+
+@router.api_route(
+    "/events/{event_id}/materials/{material_id}/file",
+    methods=["GET", "HEAD"],
+    response_class=FileResponse
+)
+async def download_event_material(
+    event_id: int,
+    material_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Optional[User] = Depends(get_current_user_optional)
+):
+    """
+    Baixa o arquivo de um material, com a mesma visibilidade do evento.
+    Suporta Range (downloads retomáveis) e GET condicional: o ETag é o
+    SHA-256 do conteúdo, que nunca muda para um mesmo material.
+    """
+    material, is_public = await material_service.get_material_file(
+        db, event_id, material_id, current_user
+    )
+    headers = {
+        "ETag": f'"{material.content_sha256}"',
+        "Cache-Control": (
+            f"{'public' if is_public else 'private'}, max-age={settings.MATERIAL_CACHE_MAX_AGE_SECONDS}"
+        ),
+    }
+    if is_not_modified(request, headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return FileResponse(
+        material_service.material_store.path(material.content_sha256),
+        media_type=material.content_type,
+        filename=material.url_or_filename,
+        headers=headers
+    )
+
+@router.delete(
+    "/events/{event_id}/materials/{material_id}",
+    status_code=status.HTTP_204_NO_CONTENT
+)
+async def delete_event_material(
+    event_id: int,
+    material_id: int,
     db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Remove um material do evento (link ou arquivo).
+    Acessível apenas para o Criador do evento ou Administradores.
+    """
+    await material_service.delete_material(db, event_id, material_id, current_user)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+@router.get("/dashboard/stats", response_model=DashboardStats)
+async def get_stats(
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_organizer_user)
 ):
     """
-    Retorna estatísticas gerais para o organizador logado.
+    Retorna estatísticas do organizador logado: totais e quebras
+    por tipo de evento, mês e host.
     """
     stats = await event_service.get_dashboard_stats(db, current_user.id)
     return stats
\ No newline at end of file
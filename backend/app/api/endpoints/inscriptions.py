@@ -1,15 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select
-from typing import List
+from typing import List, Optional
 
 from app.db.base import get_db
 from app.db.models.user import User
-from app.db.models.inscription import Inscription
-from app.schemas.inscription import InscriptionCreate, InscriptionRead
-from app.schemas.user import UserRole
-from app.services import inscription_service
-from app.api.deps import get_current_user_optional, get_current_organizer_user
+from app.db.models.event import Event
+from app.schemas.inscription import (
+    InscriptionCreate, InscriptionRead, ExportFormat, InscriptionImportReport,
+    BulkCheckInRequest, BulkCheckInReport, TicketVerifyRequest, TicketVerification
+)
+from app.schemas.job import JobRead
+from app.core.tickets import verify_ticket_code
+from app.services import inscription_service, export_service, import_service, certificate_service, job_service
+from app.core.responses import json_response
+from app.api.deps import get_current_user, get_current_user_optional, get_current_organizer_user
 
 router = APIRouter()
 
@@ -43,7 +48,75 @@ async def list_inscriptions(
     Lista todos os inscritos de um evento (Apenas Organizadores/Admins).
     """
     inscriptions = await inscription_service.get_event_inscriptions(db, event_id)
-    return inscriptions
+    return json_response(List[InscriptionRead], inscriptions)
+
+@router.get("/events/{event_id}/inscriptions/export", responses={202: {"model": JobRead}})
+async def export_inscriptions(
+    event_id: int,
+    format: ExportFormat = ExportFormat.csv,
+    columns: Optional[str] = None,
+    background: bool = False,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_organizer_user)
+):
+    """
+    Exporta a lista de inscritos de um evento em CSV ou XLSX (Apenas Organizadores/Admins).
+    As linhas são transmitidas direto do banco, com memória constante.
+    `columns` escolhe as colunas, separadas por vírgula
+    (id, name, email, phone, user_id, registration_time, checked_in).
+    Com `background=true`, responde 202 com a tarefa; o arquivo fica em GET /jobs/{id}/result.
+    """
+    if not await db.get(Event, event_id):
+        raise HTTPException(status_code=404, detail="Evento não encontrado")
+
+    selected_columns = export_service.parse_export_columns(columns)
+
+    if background:
+        job = await job_service.enqueue_job(
+            db, "export_inscriptions",
+            {"event_id": event_id, "columns": selected_columns, "format": format.value},
+            created_by=current_user
+        )
+        return json_response(JobRead, job, status_code=status.HTTP_202_ACCEPTED)
+
+    filename = export_service.export_filename(event_id, format)
+    return StreamingResponse(
+        export_service.stream_inscriptions(event_id, selected_columns, format),
+        media_type=export_service.EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+@router.post(
+    "/events/{event_id}/inscriptions/import",
+    response_model=InscriptionImportReport,
+    responses={202: {"model": JobRead}}
+)
+async def import_inscriptions(
+    event_id: int,
+    file: UploadFile = File(...),
+    background: bool = False,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_organizer_user)
+):
+    """
+    Importa em lote uma lista de visitantes a partir de um CSV (Apenas Organizadores/Admins).
+    O arquivo deve ter cabeçalho com as colunas `nome`, `email` e, opcionalmente, `telefone`.
+    Retorna um relatório com o resultado de cada linha.
+    Com `background=true`, responde 202 com a tarefa; o relatório fica no `result` dela.
+    """
+    if not background:
+        return await import_service.import_guest_inscriptions(db, event_id, file.file)
+
+    if not await db.get(Event, event_id):
+        raise HTTPException(status_code=404, detail="Evento não encontrado")
+
+    input_file = await job_service.save_job_input(file, suffix=".csv")
+    job = await job_service.enqueue_job(
+        db, "import_inscriptions",
+        {"event_id": event_id, "input_file": input_file},
+        created_by=current_user
+    )
+    return json_response(JobRead, job, status_code=status.HTTP_202_ACCEPTED)
 
 @router.put("/inscriptions/{inscription_id}/checkin", response_model=InscriptionRead)
 async def check_in(
@@ -55,6 +128,92 @@ async def check_in(
     inscription = await inscription_service.check_in_participant(db, inscription_id)
     return inscription
 
+@router.post("/events/{event_id}/checkin", response_model=BulkCheckInReport)
+async def bulk_check_in(
+    event_id: int,
+    checkin_in: BulkCheckInRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_organizer_user)
+):
+    """
+    Check-in em lote na portaria (Apenas Organizadores/Admins).
+    Aceita as leituras dos scanners, inclusive lotes coletados offline com
+    o horário de cada leitura (`scanned_at`), e retorna o status de cada uma.
+    Reenviar o mesmo lote é seguro: quem já tem check-in não é contado de novo.
+    Cada leitura pode trazer o `inscription_id` ou o `code` do ingresso (QR code).
+    """
+    return await inscription_service.bulk_check_in(db, event_id, checkin_in.scans)
+
+@router.post("/tickets/verify", response_model=TicketVerification)
+async def verify_ticket(
+    ticket_in: TicketVerifyRequest,
+    current_user: User = Depends(get_current_organizer_user)
+):
+    """
+    Valida um código de ingresso apenas pela assinatura, sem consultar o banco
+    (Apenas Organizadores/Admins). Usado pelos dispositivos da portaria para
+    aceitar ou recusar na hora; o check-in em si é feito em POST /events/{id}/checkin.
+    """
+    ticket = verify_ticket_code(ticket_in.code)
+    if ticket is None:
+        return TicketVerification(valid=False, detail="Código de ingresso inválido.")
+
+    event_id, inscription_id = ticket
+    if ticket_in.event_id is not None and event_id != ticket_in.event_id:
+        return TicketVerification(
+            valid=False, event_id=event_id, inscription_id=inscription_id,
+            detail="Ingresso de outro evento."
+        )
+    return TicketVerification(valid=True, event_id=event_id, inscription_id=inscription_id)
+
+@router.get("/events/{event_id}/certificates", responses={202: {"model": JobRead}})
+async def download_certificates(
+    event_id: int,
+    background: bool = False,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_organizer_user)
+):
+    """
+    Baixa um ZIP com os certificados (PDF) de todos os participantes com
+    check-in do evento (Apenas Organizadores/Admins). Os PDFs são gerados em
+    paralelo, em processos separados, e o ZIP é transmitido conforme fica pronto.
+    Com `background=true`, responde 202 com a tarefa; o ZIP fica em GET /jobs/{id}/result.
+    """
+    event = await db.get(Event, event_id)
+    if not event:
+        raise HTTPException(status_code=404, detail="Evento não encontrado")
+    if not event.checked_in_count:
+        raise HTTPException(status_code=400, detail="Nenhum participante fez check-in neste evento.")
+
+    if background:
+        job = await job_service.enqueue_job(
+            db, "event_certificates", {"event_id": event_id}, created_by=current_user
+        )
+        return json_response(JobRead, job, status_code=status.HTTP_202_ACCEPTED)
+
+    return StreamingResponse(
+        certificate_service.stream_certificates_zip(event),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="certificados_evento_{event_id}.zip"'}
+    )
+
+@router.get("/inscriptions/{inscription_id}/certificate")
+async def download_certificate(
+    inscription_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Baixa o certificado (PDF) de uma inscrição com check-in.
+    O participante acessa o próprio certificado; organizadores e admins, qualquer um.
+    """
+    filename, document = await certificate_service.get_certificate(db, inscription_id, current_user)
+    return Response(
+        content=document,
+        media_type="application/pdf",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
 @router.delete("/inscriptions/{inscription_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def cancel_inscription(
     inscription_id: int,
@@ -65,24 +224,5 @@ async def cancel_inscription(
     Cancela uma inscrição.
     O usuário só pode cancelar sua própria inscrição (ou ser admin).
     """
-    # Busca a inscrição
-    result = await db.execute(select(Inscription).where(Inscription.id == inscription_id))
-    inscription = result.scalars().first()
-
-    if not inscription:
-        raise HTTPException(status_code=404, detail="Inscrição não encontrada.")
-
-    # Verifica permissão
-    if not current_user:
-         raise HTTPException(status_code=401, detail="Autenticação necessária para cancelar.")
-
-    # Regra: Só pode cancelar se for o dono ou admin
-    # Nota: Comparamos com UserRole.admin ou string "admin" dependendo da sua implementação de Enum
-    is_admin = current_user.role == UserRole.admin if hasattr(UserRole, 'admin') else current_user.role == "admin"
-    
-    if current_user.id != inscription.user_id and not is_admin:
-         raise HTTPException(status_code=403, detail="Sem permissão para cancelar esta inscrição.")
-
-    await db.delete(inscription)
-    await db.commit()
+    await inscription_service.cancel_inscription(db, inscription_id, current_user)
     return None
\ No newline at end of file
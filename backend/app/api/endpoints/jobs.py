@@ -0,0 +1,34 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import FileResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.base import get_db
+from app.db.models.user import User
+from app.schemas.job import JobRead
+from app.services import job_service
+from app.api.deps import get_current_user
+
+router = APIRouter()
+
+@router.get("/jobs/{job_id}", response_model=JobRead)
+async def get_job_status(
+    job_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Consulta uma tarefa em segundo plano (status, tentativas, resultado ou erro).
+    Apenas quem a criou ou um Admin.
+    """
+    return await job_service.get_job(db, job_id, current_user)
+
+@router.get("/jobs/{job_id}/result")
+async def download_job_result(
+    job_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Baixa o arquivo gerado por uma tarefa concluída (exportação, certificados)."""
+    job = await job_service.get_job(db, job_id, current_user)
+    result = job_service.get_job_result_file(job)
+    return FileResponse(result["path"], media_type=result["media_type"], filename=result["filename"])
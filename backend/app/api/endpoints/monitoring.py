@@ -0,0 +1,87 @@
+import secrets
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import PlainTextResponse
+
+from app.db.base import get_pool_stats
+from app.db.models.user import User, UserRole
+from app.db.replicas import replica_router
+from app.core.config import settings
+from app.core.metrics import render_gauges, render_metrics
+from app.core.security import get_hashing_stats
+from app.services.user_service import principal_cache
+from app.services.event_service import event_cache
+from app.services.job_service import job_worker
+from app.api.deps import get_current_admin_user, get_current_user_optional
+
+router = APIRouter()
+
+@router.get(
+    "/monitoring/stats",
+    dependencies=[Depends(get_current_admin_user)]
+)
+async def get_monitoring_stats():
+    """
+    Retorna estatísticas internas do worker que atendeu a requisição
+    (pool de conexões, hashing de senhas, cache de autenticação e
+    cache de respostas de eventos, tarefas em segundo plano e réplicas de leitura).
+    Acessível apenas para Administradores.
+    """
+    return {
+        "db_pool": get_pool_stats(),
+        "password_hashing": get_hashing_stats(),
+        "auth_cache": principal_cache.stats(),
+        "response_cache": event_cache.stats(),
+        "jobs": job_worker.stats(),
+        "read_replicas": replica_router.stats(),
+    }
+
+def _check_metrics_access(request: Request, current_user: Optional[User]):
+    """Fechado por padrão: token de métricas ou admin, a não ser com METRICS_PUBLIC."""
+    if settings.METRICS_PUBLIC:
+        return
+
+    if settings.METRICS_TOKEN:
+        expected = f"Bearer {settings.METRICS_TOKEN}".encode()
+        if secrets.compare_digest(request.headers.get("authorization", "").encode(), expected):
+            return
+
+    if current_user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Informe o token de métricas (METRICS_TOKEN) ou o de um administrador.",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    if current_user.role != UserRole.admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="O usuário não tem privilégios de administrador"
+        )
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def get_metrics(
+    request: Request,
+    current_user: Optional[User] = Depends(get_current_user_optional)
+):
+    """
+    Métricas do worker no formato de texto do Prometheus: latência e status
+    por rota, comandos SQL e tempo de SQL por requisição, espera no pool,
+    hashing de senhas e caches. Exige "Authorization: Bearer <METRICS_TOKEN>"
+    ou o token de um admin (METRICS_PUBLIC=true libera o acesso anônimo).
+    """
+    _check_metrics_access(request, current_user)
+
+    hashing = get_hashing_stats()
+    content = render_metrics(
+        render_gauges("db_pool", get_pool_stats(), "Estado do pool de conexões."),
+        render_gauges("password_hashing", hashing, "Pool de hashing de senhas."),
+        *(
+            render_gauges(f"password_{operation}", values, "Pool de hashing de senhas.")
+            for operation, values in hashing["operations"].items()
+        ),
+        render_gauges("auth_cache", principal_cache.stats(), "Cache de autenticação."),
+        render_gauges("response_cache", event_cache.stats(), "Cache de respostas de eventos."),
+        render_gauges("job_worker", job_worker.stats(), "Executor de tarefas em segundo plano."),
+        render_gauges("read_replicas", replica_router.stats(), "Roteamento de leituras para as réplicas."),
+    )
+    return PlainTextResponse(content, media_type="text/plain; version=0.0.4; charset=utf-8")
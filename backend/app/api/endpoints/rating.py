@@ -1,12 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select
-from typing import List
+from typing import List, Optional
 
 from app.db.base import get_db
-from app.db.models.rating import Rating  # Assumindo que você criará o model
+from app.db.replicas import get_read_db
 from app.db.models.user import User
-from app.schemas.rating import RatingCreate, RatingRead
+from app.schemas.rating import RatingCreate, RatingRead, RatingSummary, RatingPage
+from app.services import rating_service
+from app.core.responses import json_response
 from app.api.deps import get_current_user
 
 router = APIRouter()
@@ -20,31 +21,42 @@ async def create_rating(
     """
     Cria uma nova avaliação para um evento.
     """
-    # Verifica se o usuário tentando avaliar é o mesmo do token
-    if rating_in.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Você não pode avaliar em nome de outro usuário.")
-
-    new_rating = Rating(
-        event_id=rating_in.event_id,
-        user_id=rating_in.user_id,
-        rating=rating_in.rating,
-        comment=rating_in.comment
-    )
-    
-    db.add(new_rating)
-    await db.commit()
-    await db.refresh(new_rating)
-    return new_rating
+    return await rating_service.create_rating(db=db, rating_in=rating_in, current_user=current_user)
 
 @router.get("/event/{event_id}", response_model=List[RatingRead])
 async def get_event_ratings(
     event_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Lista todas as avaliações de um evento específico.
     """
-    # Exemplo de query direta (sem service, para ser mais rápido de implementar)
-    result = await db.execute(select(Rating).where(Rating.event_id == event_id))
-    ratings = result.scalars().all()
-    return ratings
\ No newline at end of file
+    ratings = await rating_service.get_event_ratings(db=db, event_id=event_id)
+    return json_response(List[RatingRead], ratings)
+
+@router.get("/event/{event_id}/summary", response_model=RatingSummary)
+async def get_rating_summary(
+    event_id: int,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Retorna a quantidade, a média e o histograma (1 a 5) das avaliações do evento.
+    """
+    return await rating_service.get_rating_summary(db=db, event_id=event_id)
+
+@router.get("/event/{event_id}/feed", response_model=RatingPage)
+async def get_rating_feed(
+    event_id: int,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    only_comments: bool = True,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Feed de comentários do evento, paginado por cursor (mais recentes primeiro).
+    Envie o `next_cursor` recebido para obter a próxima página.
+    """
+    page = await rating_service.get_rating_feed(
+        db=db, event_id=event_id, limit=limit, cursor=cursor, only_comments=only_comments
+    )
+    return json_response(RatingPage, page)
@@ -6,7 +6,9 @@ from typing import List
 from app.schemas.user import UserCreate, UserRead, UserUpdate, UserRole
 from app.schemas.inscription import InscriptionRead
 from app.services import user_service
+from app.core.responses import json_response
 from app.db.base import get_db 
+from app.db.replicas import get_read_db
 from app.db.models.user import User 
 from app.db.models.inscription import Inscription
 from app.api.deps import get_current_user, get_current_admin_user 
@@ -60,7 +62,7 @@ async def read_my_inscriptions(
     # Nota: Assume que o modelo Inscription tem o campo 'user_id'
     result = await db.execute(select(Inscription).where(Inscription.user_id == current_user.id))
     inscriptions = result.scalars().all()
-    return inscriptions
+    return json_response(List[InscriptionRead], inscriptions)
 
 @router.get(
     "/users/all",
@@ -68,14 +70,14 @@ async def read_my_inscriptions(
     dependencies=[Depends(get_current_organizer_user)]
 )
 async def read_all_users(
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Retorna uma lista de todos os usuários.
     (Acessível apenas para Organizadores e Admins)
     """
     users = await user_service.get_all_users(db)
-    return users
+    return json_response(List[UserRead], users)
 
 @router.put("/users/me", response_model=UserRead)
 async def update_user_me(
@@ -0,0 +1,139 @@
+"""
+Comandos administrativos da API.
+
+Uso (estando na pasta /backend):
+    python -m app.cli upgrade-schema
+    python -m app.cli schema-status
+    python -m app.cli recount-inscriptions [--event-id ID]
+    python -m app.cli ensure-search-index
+    python -m app.cli rebuild-stats
+    python -m app.cli prune-material-files [--older-than-minutes N]
+    python -m app.cli prune-jobs [--older-than-days N]
+"""
+import argparse
+import asyncio
+
+from app.db.base import SessionLocal, engine
+from app.db import migrations
+# Importa todos os modelos para que os relacionamentos sejam resolvidos
+from app.db.models import user
+from app.db.models import event
+from app.db.models import inscription
+from app.db.models import rating
+from app.db.models import stats
+from app.core.config import settings
+from app.services import (
+    inscription_service, job_service, material_service, rating_service, search_service, stats_service
+)
+
+async def upgrade_schema(args: argparse.Namespace):
+    applied = await migrations.upgrade_schema()
+    if applied:
+        print(f"Migrações aplicadas: {', '.join(map(str, applied))}. Schema na versão {migrations.HEAD}.")
+    else:
+        print(f"Schema já está atualizado (versão {migrations.HEAD}).")
+
+async def schema_status(args: argparse.Namespace):
+    status = await migrations.schema_status()
+    current = "sem controle de versão" if status.current is None else status.current
+    print(f"Versão do banco: {current}")
+    print(f"Versão do código: {status.head}")
+    for migration in migrations.MIGRATIONS:
+        if migration.revision in status.pending:
+            print(f"  pendente {migration.revision}: {migration.description}")
+
+async def recount_inscriptions(args: argparse.Namespace):
+    async with SessionLocal() as db:
+        updated = await inscription_service.recount_inscriptions(db, event_id=args.event_id)
+    print(f"Contadores recalculados para {updated} evento(s).")
+
+async def ensure_search_index(args: argparse.Namespace):
+    async with engine.begin() as conn:
+        await search_service.ensure_search_index(conn)
+    print("Índice de busca criado/reconstruído.")
+
+async def rebuild_stats(args: argparse.Namespace):
+    async with SessionLocal() as db:
+        await stats_service.rebuild_rollups(db)
+        await rating_service.rebuild_rating_stats(db)
+    print("Rollups de estatísticas e agregados de avaliações reconstruídos.")
+
+async def prune_material_files(args: argparse.Namespace):
+    async with SessionLocal() as db:
+        removed, freed = await material_service.prune_material_files(
+            db, older_than_seconds=args.older_than_minutes * 60
+        )
+    print(f"{removed} arquivo(s) de materiais sem uso removido(s), {freed / 1e6:.1f} MB liberados.")
+
+async def prune_jobs(args: argparse.Namespace):
+    async with SessionLocal() as db:
+        jobs, files = await job_service.prune_jobs(db, older_than_seconds=args.older_than_days * 86400)
+    print(f"{jobs} tarefa(s) finalizada(s) e {files} arquivo(s) de tarefas removido(s).")
+
+async def run(handler, args: argparse.Namespace):
+    try:
+        await handler(args)
+    finally:
+        # Fecha as conexões do pool (o aiosqlite, por exemplo, segura o processo aberto)
+        await engine.dispose()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="Comandos administrativos da API.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    upgrade = subparsers.add_parser(
+        "upgrade-schema",
+        help="Aplica as migrações pendentes do schema (banco vazio: cria todas as tabelas)."
+    )
+    upgrade.set_defaults(handler=upgrade_schema)
+
+    status = subparsers.add_parser(
+        "schema-status",
+        help="Mostra a versão do schema do banco e as migrações pendentes."
+    )
+    status.set_defaults(handler=schema_status)
+
+    recount = subparsers.add_parser(
+        "recount-inscriptions",
+        help="Recalcula os contadores de inscrições/check-ins dos eventos."
+    )
+    recount.add_argument("--event-id", type=int, default=None, help="Recalcula apenas um evento.")
+    recount.set_defaults(handler=recount_inscriptions)
+
+    search_index = subparsers.add_parser(
+        "ensure-search-index",
+        help="Cria (se preciso) e reconstrói o índice da busca textual de eventos."
+    )
+    search_index.set_defaults(handler=ensure_search_index)
+
+    rebuild = subparsers.add_parser(
+        "rebuild-stats",
+        help="Reconstrói os rollups do dashboard e os agregados de avaliações."
+    )
+    rebuild.set_defaults(handler=rebuild_stats)
+
+    prune = subparsers.add_parser(
+        "prune-material-files",
+        help="Apaga os arquivos de materiais que nenhum evento usa mais."
+    )
+    prune.add_argument(
+        "--older-than-minutes", type=float, default=60,
+        help="Só apaga arquivos sem uso há mais que isso (protege envios em andamento)."
+    )
+    prune.set_defaults(handler=prune_material_files)
+
+    prune_job_files = subparsers.add_parser(
+        "prune-jobs",
+        help="Apaga as tarefas finalizadas antigas e os arquivos que elas geraram ou receberam."
+    )
+    prune_job_files.add_argument(
+        "--older-than-days", type=float, default=settings.JOB_RETENTION_DAYS or 7,
+        help="Só apaga tarefas finalizadas (e arquivos) há mais que isso."
+    )
+    prune_job_files.set_defaults(handler=prune_jobs)
+
+    args = parser.parse_args(argv)
+    asyncio.run(run(args.handler, args))
+
+if __name__ == "__main__":
+    main()
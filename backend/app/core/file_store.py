@@ -0,0 +1,121 @@
+"""
+Armazenamento de arquivos endereçado pelo conteúdo.
+
+Cada arquivo é gravado com o nome igual ao SHA-256 do conteúdo
+(<pasta>/ab/abcdef...), então o mesmo arquivo enviado para vários eventos
+ocupa espaço uma vez só. O envio é gravado em partes em um arquivo
+temporário, calculando o hash no caminho, e só no fim renomeado para o nome
+final (operação atômica): nunca existe um arquivo pela metade com nome final.
+"""
+import hashlib
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterator, Iterable, Tuple
+from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+
+@dataclass
+class StoredFile:
+    sha256: str
+    size: int
+
+class ContentStore:
+    """Pasta de arquivos imutáveis, indexados pelo SHA-256."""
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+        self._temp_dir = self.root / "tmp"
+
+    def path(self, sha256: str) -> Path:
+        return self.root / sha256[:2] / sha256
+
+    async def save(self, chunks: AsyncIterator[bytes], max_bytes: int = 0) -> StoredFile:
+        """
+        Grava o conteúdo recebido em partes, sem mantê-lo em memória.
+        Passou de `max_bytes` (0 = sem limite): descarta o que foi gravado e
+        responde 413; conteúdo vazio, 400. Se o conteúdo já estava
+        armazenado, reaproveita o arquivo.
+        """
+        # Escrita e hash das partes rodam em threads, fora do event loop
+        await run_in_threadpool(self._temp_dir.mkdir, parents=True, exist_ok=True)
+        digest = hashlib.sha256()
+        size = 0
+
+        descriptor, temp_path = await run_in_threadpool(tempfile.mkstemp, dir=self._temp_dir)
+        try:
+            file = os.fdopen(descriptor, "wb")
+            try:
+                async for chunk in chunks:
+                    size += len(chunk)
+                    if max_bytes and size > max_bytes:
+                        raise HTTPException(
+                            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                            detail=f"O arquivo excede o limite de {max_bytes} bytes."
+                        )
+                    await run_in_threadpool(self._write_chunk, file, digest, chunk)
+            finally:
+                # Fechar e apagar ficam no event loop: são rápidos e rodam mesmo com a tarefa cancelada
+                file.close()
+
+            if size == 0:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Envie o conteúdo do arquivo no corpo da requisição."
+                )
+
+            sha256 = digest.hexdigest()
+            if await run_in_threadpool(self._move_into_place, temp_path, sha256):
+                temp_path = None
+        finally:
+            if temp_path is not None:
+                Path(temp_path).unlink(missing_ok=True)
+
+        return StoredFile(sha256=sha256, size=size)
+
+    @staticmethod
+    def _write_chunk(file, digest, chunk: bytes):
+        digest.update(chunk)
+        file.write(chunk)
+
+    def _move_into_place(self, temp_path: str, sha256: str) -> bool:
+        """Dá ao temporário o nome final; devolve False se o conteúdo já existia."""
+        target = self.path(sha256)
+        if target.exists():
+            # Renova a data do arquivo, que o protege da limpeza (remove_unreferenced)
+            os.utime(target)
+            return False
+        target.parent.mkdir(exist_ok=True)
+        os.replace(temp_path, target)
+        return True
+
+    def remove_unreferenced(self, referenced: Iterable[str], older_than_seconds: float) -> Tuple[int, int]:
+        """
+        Apaga os arquivos que nenhum registro usa mais (e os temporários de
+        envios interrompidos). Só considera arquivos mais antigos que
+        `older_than_seconds`, para não apagar o de um envio ainda sem registro
+        no banco. Retorna (arquivos apagados, bytes liberados).
+        """
+        referenced = set(referenced)
+        limit = time.time() - older_than_seconds
+        removed, freed = 0, 0
+
+        if not self.root.exists():
+            return removed, freed
+
+        for directory in self.root.iterdir():
+            if not directory.is_dir():
+                continue
+            for path in directory.iterdir():
+                if directory != self._temp_dir and path.name in referenced:
+                    continue
+                stat = path.stat()
+                if stat.st_mtime > limit:
+                    continue
+                path.unlink(missing_ok=True)
+                removed += 1
+                freed += stat.st_size
+
+        return removed, freed
@@ -0,0 +1,212 @@
+import logging
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _format_labels(names: tuple, values: tuple) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Counter:
+    """Contador monotônico com labels, no formato de texto do Prometheus."""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, *labels, amount: float = 1):
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        for labels, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}")
+        return lines
+
+class Histogram:
+    """Histograma com buckets fixos e labels, no formato de texto do Prometheus."""
+
+    def __init__(self, name: str, documentation: str, buckets: tuple, labelnames: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = buckets
+        self.labelnames = labelnames
+        # labels -> [contagem por bucket..., soma, total]
+        self._values: dict[tuple, list] = {}
+
+    def observe(self, value: float, *labels):
+        series = self._values.get(labels)
+        if series is None:
+            series = self._values[labels] = [0] * len(self.buckets) + [0.0, 0]
+        index = bisect_left(self.buckets, value)
+        if index < len(self.buckets):
+            series[index] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for labels, series in sorted(self._values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                bucket_labels = _format_labels(self.labelnames + ("le",), labels + (_format_value(bound),))
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f"{self.name}_bucket{_format_labels(self.labelnames + ('le',), labels + ('+Inf',))} {series[-1]}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(series[-2])}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {series[-1]}")
+        return lines
+
+# Métricas do worker (cada processo do uvicorn tem as suas)
+http_requests = Counter(
+    "http_requests_total", "Requisições atendidas.", ("method", "route", "status")
+)
+http_request_duration = Histogram(
+    "http_request_duration_seconds", "Latência das requisições (até o fim do corpo).",
+    LATENCY_BUCKETS, ("method", "route")
+)
+http_exceptions = Counter(
+    "http_request_exceptions_total", "Requisições encerradas por exceção não tratada.", ("method", "route")
+)
+db_statements_per_request = Histogram(
+    "http_request_db_statements", "Comandos SQL executados por requisição.",
+    STATEMENT_BUCKETS, ("method", "route")
+)
+db_seconds_per_request = Histogram(
+    "http_request_db_seconds", "Tempo em SQL por requisição.", LATENCY_BUCKETS, ("method", "route")
+)
+db_statements = Counter("db_statements_total", "Comandos SQL executados.")
+db_statement_duration = Histogram(
+    "db_statement_duration_seconds", "Duração de cada comando SQL.", LATENCY_BUCKETS
+)
+db_errors = Counter("db_errors_total", "Comandos SQL que falharam.")
+db_pool_wait = Histogram(
+    "db_pool_wait_seconds", "Espera por uma conexão do pool.", LATENCY_BUCKETS
+)
+db_query_budget_exceeded = Counter(
+    "http_request_query_budget_exceeded_total",
+    "Requisições acima do orçamento de comandos SQL.", ("method", "route")
+)
+jobs_finished = Counter(
+    "jobs_total", "Execuções de tarefas em segundo plano, por resultado.", ("job_type", "outcome")
+)
+job_duration = Histogram(
+    "job_duration_seconds", "Duração de cada execução de tarefa.",
+    LATENCY_BUCKETS + (30.0, 60.0, 300.0), ("job_type",)
+)
+
+METRICS = [
+    http_requests, http_request_duration, http_exceptions,
+    db_statements_per_request, db_seconds_per_request, db_query_budget_exceeded,
+    db_statements, db_statement_duration, db_errors, db_pool_wait,
+    jobs_finished, job_duration,
+]
+
+@dataclass
+class RequestDbStats:
+    statements: int = 0
+    seconds: float = 0.0
+
+# SQL da requisição atual; o objeto é compartilhado com as greenlets do SQLAlchemy
+_request_db_stats: ContextVar[Optional[RequestDbStats]] = ContextVar("request_db_stats", default=None)
+
+def record_statement(seconds: float):
+    """Chamado pelos eventos do engine (app/db/base.py) a cada comando SQL."""
+    db_statements.inc()
+    db_statement_duration.observe(seconds)
+    stats = _request_db_stats.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.seconds += seconds
+
+def _route_label(scope: dict) -> str:
+    # Usa o template da rota (/events/{event_id}) para não explodir a cardinalidade
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI que mede cada requisição HTTP até o envio do último
+    pedaço do corpo (inclui respostas em streaming), junto com a quantidade
+    e o tempo dos comandos SQL executados durante ela.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        stats = RequestDbStats()
+        token = _request_db_stats.set(stats)
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        method = scope["method"]
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception:
+            http_exceptions.inc(method, _route_label(scope))
+            raise
+        finally:
+            _request_db_stats.reset(token)
+            elapsed = time.perf_counter() - started
+            route = _route_label(scope)
+
+            http_requests.inc(method, route, status_code)
+            http_request_duration.observe(elapsed, method, route)
+            db_statements_per_request.observe(stats.statements, method, route)
+            db_seconds_per_request.observe(stats.seconds, method, route)
+
+            budget = settings.QUERY_BUDGET_PER_REQUEST
+            if budget and stats.statements > budget:
+                db_query_budget_exceeded.inc(method, route)
+                logger.warning(
+                    "Requisição %s %s executou %d comandos SQL (orçamento: %d, %.1f ms em SQL, %.1f ms no total)",
+                    method, scope["path"], stats.statements, budget,
+                    stats.seconds * 1000, elapsed * 1000
+                )
+
+def render_gauges(prefix: str, values: dict, documentation: str) -> list[str]:
+    """Exporta como gauges os valores numéricos de um dicionário de estatísticas."""
+    lines = []
+    for key, value in values.items():
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            continue
+        name = f"{prefix}_{key}"
+        lines += [f"# HELP {name} {documentation}", f"# TYPE {name} gauge", f"{name} {_format_value(value)}"]
+    return lines
+
+def render_metrics(*extra: list[str]) -> str:
+    """Todas as métricas no formato de texto do Prometheus (versão 0.0.4)."""
+    lines = []
+    for metric in METRICS:
+        lines += metric.render()
+    for block in extra:
+        lines += block
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,218 @@
+"""
+Gerador mínimo de PDFs de uma página com texto (sem dependências externas).
+
+Usado pelos certificados: o template é "compilado" uma única vez por
+processo (objetos fixos do PDF, fontes, moldura e linhas de texto já
+analisadas) e cada certificado só monta o conteúdo variável e a tabela xref.
+Este módulo não importa nada do app: ele roda nos processos do pool de
+certificados, que devem subir rápido.
+"""
+import unicodedata
+import zlib
+from dataclasses import dataclass, replace
+from string import Formatter
+from typing import Dict, List, Optional, Tuple
+
+# Larguras (em 1/1000 de ponto por unidade de tamanho) dos caracteres 32..126
+# das fontes padrão do PDF, conforme as métricas AFM da Adobe.
+_HELVETICA_WIDTHS = (
+    278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+    1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+    333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+    556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+)
+_HELVETICA_BOLD_WIDTHS = (
+    278, 333, 474, 556, 556, 889, 722, 238, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 333, 333, 584, 584, 584, 611,
+    975, 722, 722, 722, 722, 667, 611, 778, 722, 278, 556, 722, 611, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 333, 278, 333, 584, 556,
+    333, 556, 611, 556, 611, 556, 333, 611, 611, 278, 278, 556, 278, 889, 611, 611,
+    611, 611, 389, 556, 333, 611, 556, 778, 556, 556, 500, 389, 280, 389, 584,
+)
+
+# Nome no template -> (recurso na página, fonte base, larguras)
+FONTS = {
+    "regular": ("F1", "Helvetica", _HELVETICA_WIDTHS),
+    "bold": ("F2", "Helvetica-Bold", _HELVETICA_BOLD_WIDTHS),
+}
+_DEFAULT_WIDTH = 556
+
+def _char_widths(widths: tuple) -> Dict[str, int]:
+    """
+    Tabela caractere -> largura para tudo que o WinAnsiEncoding representa.
+    Letras acentuadas têm a largura da letra base (á = a, Ç = C) nessas fontes.
+    """
+    table = {}
+    for code in range(32, 256):
+        try:
+            char = bytes([code]).decode("cp1252")
+        except UnicodeDecodeError:
+            continue
+        base = unicodedata.normalize("NFD", char)[0]
+        if 32 <= ord(base) <= 126:
+            table[char] = widths[ord(base) - 32]
+        else:
+            table[char] = _DEFAULT_WIDTH
+    return table
+
+def _escape(text: str) -> bytes:
+    # O WinAnsiEncoding é o cp1252; o que não couber vira "?"
+    encoded = text.encode("cp1252", errors="replace")
+    return encoded.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+
+@dataclass(frozen=True)
+class _Line:
+    text: str
+    font: str
+    size: float
+    y: float
+    fields: Tuple[str, ...]
+    static: Optional[bytes]
+
+class CompiledTemplate:
+    """
+    Template de uma página já preparado para renderizar muitos documentos.
+
+    `spec` é um dicionário simples (serializável, para ir aos processos):
+        {
+            "page": [842, 595],              # largura e altura, em pontos
+            "margin": 36,                    # moldura (0 = sem moldura)
+            "lines": [
+                {"text": "Certificamos que {name}", "font": "bold", "size": 24, "y": 300},
+                ...
+            ],
+        }
+    Cada linha é centralizada na horizontal; `{campo}` é substituído pelos
+    valores passados a render(). Linhas longas demais são reduzidas para
+    caber entre as margens.
+    """
+
+    def __init__(self, spec: dict):
+        self.width, self.height = (float(value) for value in spec.get("page", (842, 595)))
+        self.margin = float(spec.get("margin", 36))
+        self._widths = {name: _char_widths(widths) for name, (_, _, widths) in FONTS.items()}
+
+        lines = []
+        for line in spec["lines"]:
+            font = line.get("font", "regular")
+            if font not in FONTS:
+                raise ValueError(f"Fonte desconhecida no template: {font}")
+            fields = tuple(name for _, name, _, _ in Formatter().parse(line["text"]) if name)
+            line = _Line(
+                text=line["text"],
+                font=font,
+                size=float(line.get("size", 12)),
+                y=float(line["y"]),
+                fields=fields,
+                static=None,
+            )
+            if not fields:
+                # Linha sem campos: os operadores são gerados uma vez só
+                line = replace(line, static=self._text_ops(line, line.text))
+            lines.append(line)
+        self._lines = lines
+
+        # Moldura dupla (desenho fixo de todos os documentos)
+        static_ops = []
+        if self.margin:
+            m = self.margin
+            static_ops.append(
+                f"q 0.15 0.25 0.45 RG 3 w {m:.2f} {m:.2f} {self.width - 2 * m:.2f} "
+                f"{self.height - 2 * m:.2f} re S 1 w {m + 8:.2f} {m + 8:.2f} "
+                f"{self.width - 2 * m - 16:.2f} {self.height - 2 * m - 16:.2f} re S Q\n".encode()
+            )
+        self._static_ops = b"".join(static_ops)
+
+        # Objetos fixos: 1 catálogo, 2 árvore de páginas, 3 página, 4.. fontes;
+        # o conteúdo (variável) é sempre o último objeto.
+        font_objects = [
+            f"<< /Type /Font /Subtype /Type1 /BaseFont /{base} /Encoding /WinAnsiEncoding >>"
+            for _, base, _ in FONTS.values()
+        ]
+        self._content_object = 4 + len(font_objects)
+        font_resources = " ".join(
+            f"/{resource} {4 + index} 0 R" for index, (resource, _, _) in enumerate(FONTS.values())
+        )
+        objects = [
+            "<< /Type /Catalog /Pages 2 0 R >>",
+            "<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {self.width:.2f} {self.height:.2f}] "
+            f"/Resources << /Font << {font_resources} >> >> /Contents {self._content_object} 0 R >>",
+            *font_objects,
+        ]
+
+        header = b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n"
+        self._offsets = []
+        parts = [header]
+        position = len(header)
+        for number, body in enumerate(objects, start=1):
+            chunk = f"{number} 0 obj\n{body}\nendobj\n".encode()
+            self._offsets.append(position)
+            parts.append(chunk)
+            position += len(chunk)
+        self._prefix = b"".join(parts)
+
+    @property
+    def fields(self) -> set:
+        """Campos usados pelo template."""
+        return {field for line in self._lines for field in line.fields}
+
+    def text_width(self, text: str, font: str, size: float) -> float:
+        widths = self._widths[font]
+        return sum(widths.get(char, _DEFAULT_WIDTH) for char in text) * size / 1000
+
+    def _text_ops(self, line: _Line, text: str) -> bytes:
+        size = line.size
+        available = self.width - 2 * (self.margin + 24)
+        width = self.text_width(text, line.font, size)
+        if width > available > 0:
+            size = size * available / width
+            width = available
+        x = (self.width - width) / 2
+        resource = FONTS[line.font][0]
+        return (
+            f"BT /{resource} {size:.2f} Tf {x:.2f} {line.y:.2f} Td (".encode()
+            + _escape(text)
+            + b") Tj ET\n"
+        )
+
+    def render(self, values: dict) -> bytes:
+        """Gera o PDF com os campos preenchidos."""
+        ops = [self._static_ops, b"0.1 0.1 0.1 rg\n"]
+        for line in self._lines:
+            if line.static is not None:
+                ops.append(line.static)
+            else:
+                ops.append(self._text_ops(line, line.text.format_map(values)))
+        stream = zlib.compress(b"".join(ops))
+
+        content = (
+            f"{self._content_object} 0 obj\n<< /Length {len(stream)} /Filter /FlateDecode >>\nstream\n".encode()
+            + stream
+            + b"\nendstream\nendobj\n"
+        )
+        xref_position = len(self._prefix) + len(content)
+        offsets = self._offsets + [len(self._prefix)]
+
+        xref = [f"xref\n0 {len(offsets) + 1}\n0000000000 65535 f \n"]
+        xref += [f"{offset:010d} 00000 n \n" for offset in offsets]
+        trailer = f"trailer\n<< /Size {len(offsets) + 1} /Root 1 0 R >>\nstartxref\n{xref_position}\n%%EOF\n"
+        return self._prefix + content + "".join(xref).encode() + trailer.encode()
+
+# Template compilado do processo atual (preenchido pelo initializer do pool)
+_worker_template: Optional[CompiledTemplate] = None
+
+def init_worker(spec: dict):
+    """Initializer do pool: compila o template uma vez por processo."""
+    global _worker_template
+    _worker_template = CompiledTemplate(spec)
+
+def render_batch(context: dict, rows: List[dict]) -> List[bytes]:
+    """
+    Renderiza um lote de documentos no processo do pool. `context` tem os
+    campos comuns a todos (ex.: dados do evento); cada linha, os próprios.
+    """
+    template = _worker_template
+    return [template.render({**context, **row}) for row in rows]
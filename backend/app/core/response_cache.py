@@ -0,0 +1,283 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+from urllib.parse import urlparse
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class CachedResponse:
+    """Corpo JSON já serializado e os validadores HTTP da resposta."""
+    body: bytes
+    etag: str
+    last_modified: Optional[datetime] = None
+
+    def encode(self) -> bytes:
+        last_modified = self.last_modified.isoformat() if self.last_modified else ""
+        return f"{self.etag}\n{last_modified}\n".encode() + self.body
+
+    @classmethod
+    def decode(cls, raw: bytes) -> "CachedResponse":
+        etag, last_modified, body = raw.split(b"\n", 2)
+        return cls(
+            body=body,
+            etag=etag.decode(),
+            last_modified=datetime.fromisoformat(last_modified.decode()) if last_modified else None
+        )
+
+class MemoryCacheBackend:
+    """
+    Backend em memória (LRU com TTL). Cada worker do uvicorn tem o seu:
+    a invalidação só alcança o próprio worker e os demais dependem do TTL.
+    """
+    name = "memory"
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._entries = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._generations: dict[str, int] = {}
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return self._entries.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: float):
+        self._entries.set(key, value, ttl)
+
+    async def get_generation(self, namespace: str) -> int:
+        return self._generations.get(namespace, 0)
+
+    async def bump_generation(self, namespace: str):
+        self._generations[namespace] = self._generations.get(namespace, 0) + 1
+        # As chaves das gerações antigas nunca mais serão lidas
+        self._entries.clear()
+
+    async def close(self):
+        pass
+
+    def stats(self) -> dict:
+        return {"size": self._entries.stats()["size"], "maxsize": self._entries.maxsize}
+
+class RedisError(Exception):
+    pass
+
+class RedisCacheBackend:
+    """
+    Backend compartilhado entre workers, falando o protocolo do Redis (RESP)
+    diretamente sobre asyncio, sem dependências extras. Funciona com Redis,
+    Valkey, KeyDB ou qualquer servidor compatível com GET/SET PX/INCR.
+    """
+    name = "redis"
+
+    def __init__(self, url: str, pool_size: int = 10, timeout: float = 0.5):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = parsed.password
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.timeout = timeout
+        self._idle: list[tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+        self._slots = asyncio.Semaphore(pool_size)
+        self.connections_opened = 0
+
+    @staticmethod
+    def _encode(*args) -> bytes:
+        parts = [f"*{len(args)}\r\n".encode()]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode()
+            parts.append(f"${len(data)}\r\n".encode() + data + b"\r\n")
+        return b"".join(parts)
+
+    async def _read_reply(self, reader: asyncio.StreamReader):
+        line = await reader.readline()
+        if not line.endswith(b"\r\n"):
+            raise ConnectionError("Conexão com o cache encerrada.")
+        kind, payload = line[:1], line[1:-2]
+        if kind == b"+":
+            return payload.decode()
+        if kind == b"-":
+            raise RedisError(payload.decode())
+        if kind == b":":
+            return int(payload)
+        if kind == b"$":
+            size = int(payload)
+            if size < 0:
+                return None
+            return (await reader.readexactly(size + 2))[:-2]
+        if kind == b"*":
+            size = int(payload)
+            if size < 0:
+                return None
+            return [await self._read_reply(reader) for _ in range(size)]
+        raise RedisError(f"Resposta inesperada do cache: {line!r}")
+
+    async def _connect(self):
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        self.connections_opened += 1
+        setup = []
+        if self.password:
+            setup.append(("AUTH", self.password))
+        if self.db:
+            setup.append(("SELECT", self.db))
+        for command in setup:
+            writer.write(self._encode(*command))
+            await writer.drain()
+            await self._read_reply(reader)
+        return reader, writer
+
+    async def execute(self, *args):
+        async with self._slots:
+            connection = self._idle.pop() if self._idle else None
+            try:
+                async with asyncio.timeout(self.timeout):
+                    if connection is None:
+                        connection = await self._connect()
+                    reader, writer = connection
+                    writer.write(self._encode(*args))
+                    await writer.drain()
+                    reply = await self._read_reply(reader)
+            except BaseException:
+                # Conexão em estado desconhecido (timeout no meio da resposta, etc.)
+                if connection is not None:
+                    connection[1].close()
+                raise
+            self._idle.append(connection)
+            return reply
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.execute("GET", key)
+
+    async def set(self, key: str, value: bytes, ttl: float):
+        await self.execute("SET", key, value, "PX", max(int(ttl * 1000), 1))
+
+    async def get_generation(self, namespace: str) -> int:
+        value = await self.execute("GET", f"generation:{namespace}")
+        return int(value) if value is not None else 0
+
+    async def bump_generation(self, namespace: str):
+        await self.execute("INCR", f"generation:{namespace}")
+
+    async def close(self):
+        while self._idle:
+            _, writer = self._idle.pop()
+            writer.close()
+
+    def stats(self) -> dict:
+        return {
+            "url": f"redis://{self.host}:{self.port}/{self.db}",
+            "idle_connections": len(self._idle),
+            "connections_opened": self.connections_opened,
+        }
+
+class ResponseCache:
+    """
+    Cache de respostas de leitura, com invalidação por geração: a chave
+    inclui a geração atual do namespace, e invalidar apenas a incrementa.
+
+    Falhas do backend nunca derrubam a requisição: contam como erro e a
+    resposta é montada a partir do banco, como em um miss.
+    """
+
+    def __init__(self, namespace: str, backend, ttl: float):
+        self.namespace = namespace
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.invalidations = 0
+        self.errors = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None and self.ttl > 0
+
+    async def lookup(self, key: str) -> tuple[Optional[CachedResponse], Optional[str]]:
+        """
+        Retorna (resposta em cache ou None, token para o store).
+        O token fixa a geração lida: se houver uma invalidação antes do
+        store, a resposta montada com dados antigos nunca será lida.
+        """
+        if not self.enabled:
+            return None, None
+
+        try:
+            generation = await self.backend.get_generation(self.namespace)
+            token = f"{self.namespace}:{generation}:{key}"
+            raw = await self.backend.get(token)
+        except Exception:
+            self.errors += 1
+            logger.warning("Falha ao ler o cache de respostas", exc_info=True)
+            return None, None
+
+        if raw is None:
+            self.misses += 1
+            return None, token
+
+        self.hits += 1
+        return CachedResponse.decode(raw), token
+
+    async def store(self, token: Optional[str], response: CachedResponse, ttl: Optional[float] = None):
+        """Guarda a resposta pelo TTL do cache ou, se informado, por `ttl` segundos (0 = não guarda)."""
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if token is None or ttl <= 0:
+            return
+        try:
+            await self.backend.set(token, response.encode(), ttl)
+            self.stores += 1
+        except Exception:
+            self.errors += 1
+            logger.warning("Falha ao gravar no cache de respostas", exc_info=True)
+
+    async def invalidate(self):
+        if not self.enabled:
+            return
+        try:
+            await self.backend.bump_generation(self.namespace)
+            self.invalidations += 1
+        except Exception:
+            self.errors += 1
+            logger.warning("Falha ao invalidar o cache de respostas", exc_info=True)
+
+    async def close(self):
+        if self.backend is not None:
+            await self.backend.close()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.backend.name if self.backend is not None else None,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "stores": self.stores,
+            "invalidations": self.invalidations,
+            "errors": self.errors,
+            **(self.backend.stats() if self.backend is not None else {}),
+        }
+
+def create_response_cache(namespace: str) -> ResponseCache:
+    """Monta o cache com o backend escolhido nas configurações."""
+    kind = settings.RESPONSE_CACHE_BACKEND.lower()
+
+    if kind == "memory":
+        backend = MemoryCacheBackend(
+            maxsize=settings.RESPONSE_CACHE_MAX_SIZE,
+            ttl=settings.RESPONSE_CACHE_TTL_SECONDS
+        )
+    elif kind == "redis":
+        backend = RedisCacheBackend(
+            settings.RESPONSE_CACHE_URL,
+            pool_size=settings.RESPONSE_CACHE_POOL_SIZE,
+            timeout=settings.RESPONSE_CACHE_TIMEOUT
+        )
+    elif kind == "none":
+        backend = None
+    else:
+        raise ValueError(f"RESPONSE_CACHE_BACKEND inválido: {settings.RESPONSE_CACHE_BACKEND}")
+
+    return ResponseCache(namespace, backend, ttl=settings.RESPONSE_CACHE_TTL_SECONDS)
@@ -0,0 +1,62 @@
+import typing
+from functools import lru_cache
+from typing import Any, List
+from fastapi import Response, status
+from pydantic import BaseModel, ConfigDict, EmailStr, TypeAdapter, create_model
+
+@lru_cache(maxsize=None)
+def _output_type(annotation: Any) -> Any:
+    """
+    Versão "de saída" de um tipo: igual ao original, mas com EmailStr
+    trocado por str. Os e-mails vêm do banco e já foram validados na
+    escrita; revalidá-los (email_validator, em Python) domina o tempo de
+    serialização das listas de inscrições e usuários.
+    """
+    if annotation is EmailStr:
+        return str
+
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        fields = {
+            name: (
+                _output_type(field.annotation),
+                ... if field.is_required() else field.get_default(call_default_factory=True)
+            )
+            for name, field in annotation.model_fields.items()
+        }
+        return create_model(
+            annotation.__name__,
+            __config__=ConfigDict(from_attributes=True),
+            **fields
+        )
+
+    origin = typing.get_origin(annotation)
+    args = typing.get_args(annotation)
+    if origin is list and args:
+        return List[_output_type(args[0])]
+    if origin is typing.Union:
+        return typing.Union[tuple(_output_type(arg) for arg in args)]
+    return annotation
+
+@lru_cache(maxsize=None)
+def _adapter(schema: Any) -> TypeAdapter:
+    return TypeAdapter(_output_type(schema))
+
+def dump_json(schema: Any, value: Any) -> bytes:
+    """
+    Valida o valor (lendo os atributos dos objetos ORM) e serializa direto
+    para JSON em bytes, no pydantic-core (Rust), sem passar pelo
+    jsonable_encoder e pelo json da biblioteca padrão.
+    """
+    adapter = _adapter(schema)
+    return adapter.dump_json(adapter.validate_python(value, from_attributes=True))
+
+def json_response(schema: Any, value: Any, status_code: int = status.HTTP_200_OK) -> Response:
+    """
+    Resposta JSON serializada por dump_json. Use em listagens longas,
+    mantendo o response_model da rota para a documentação (OpenAPI).
+    """
+    return Response(
+        content=dump_json(schema, value),
+        media_type="application/json",
+        status_code=status_code
+    )
@@ -1,18 +1,105 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
 from passlib.context import CryptContext
 from datetime import datetime, timedelta, timezone
 from typing import Optional
+from fastapi import HTTPException, status
 from jose import JWTError, jwt
 from app.core.config import settings
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
+# O bcrypt é propositalmente lento (~200ms) e libera o GIL, então roda em um
+# pool de threads dedicado para não travar o event loop do worker.
+_hashing_pool: Optional[ThreadPoolExecutor] = None
+_hashing_in_flight = 0
+_hashing_metrics = {
+    operation: {
+        "count": 0,
+        "rejected": 0,
+        "run_seconds_total": 0.0,
+        "run_seconds_max": 0.0,
+        "wait_seconds_total": 0.0,
+        "wait_seconds_max": 0.0,
+    }
+    for operation in ("hash", "verify")
+}
+
+def _get_hashing_pool() -> ThreadPoolExecutor:
+    """Pool de threads do bcrypt, criado no primeiro uso (e recriado após um shutdown)."""
+    global _hashing_pool
+    if _hashing_pool is None:
+        _hashing_pool = ThreadPoolExecutor(
+            max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt"
+        )
+    return _hashing_pool
+
+def _record(metrics: dict, name: str, seconds: float):
+    metrics[f"{name}_seconds_total"] += seconds
+    metrics[f"{name}_seconds_max"] = max(metrics[f"{name}_seconds_max"], seconds)
+
+async def _run_in_hashing_pool(operation: str, func, *args):
+    """
+    Executa uma operação de hash no pool, recusando com 503 quando a fila
+    (operações em execução + aguardando) atinge o limite configurado.
+    Registra separadamente o tempo de espera na fila e o tempo de execução.
+    """
+    global _hashing_in_flight
+    metrics = _hashing_metrics[operation]
+
+    if _hashing_in_flight >= settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_MAX_QUEUE:
+        metrics["rejected"] += 1
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Servidor ocupado. Tente novamente em instantes.",
+            headers={"Retry-After": "1"},
+        )
+
+    def timed():
+        started = time.perf_counter()
+        try:
+            return func(*args), started
+        finally:
+            _record(metrics, "run", time.perf_counter() - started)
+
+    _hashing_in_flight += 1
+    submitted = time.perf_counter()
+    try:
+        loop = asyncio.get_running_loop()
+        result, started = await loop.run_in_executor(_get_hashing_pool(), timed)
+        _record(metrics, "wait", started - submitted)
+        metrics["count"] += 1
+        return result
+    finally:
+        _hashing_in_flight -= 1
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verifica se uma senha plana corresponde a um hash."""
-    return pwd_context.verify(plain_password, hashed_password)
+    return await _run_in_hashing_pool(
+        "verify", pwd_context.verify, plain_password, hashed_password
+    )
 
-def get_password_hash(password: str) -> str:
+async def get_password_hash(password: str) -> str:
     """Gera o hash de uma senha plana."""
-    return pwd_context.hash(password)
+    return await _run_in_hashing_pool("hash", pwd_context.hash, password)
+
+def get_hashing_stats() -> dict:
+    """Retorna as métricas de tempo e ocupação do pool de hashing."""
+    return {
+        "workers": settings.PASSWORD_HASH_WORKERS,
+        "max_queue": settings.PASSWORD_HASH_MAX_QUEUE,
+        "in_flight": _hashing_in_flight,
+        "operations": {
+            operation: dict(values) for operation, values in _hashing_metrics.items()
+        },
+    }
+
+def shutdown_hashing_pool():
+    global _hashing_pool
+    if _hashing_pool is not None:
+        _hashing_pool.shutdown(wait=False, cancel_futures=True)
+        _hashing_pool = None
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """
@@ -0,0 +1,50 @@
+import base64
+import binascii
+import hashlib
+import hmac
+import struct
+from typing import Optional, Tuple
+
+from app.core.config import settings
+
+# Código do ingresso: versão (1 byte) + id do evento (4) + id da inscrição (4)
+# + HMAC-SHA256 truncado (10 bytes = 80 bits), em base32 sem padding.
+# Base32 usa só A-Z e 2-7, que cabem no modo alfanumérico (mais denso) do QR code.
+_VERSION = 1
+_PAYLOAD = struct.Struct(">BII")
+_MAC_SIZE = 10
+
+def _key() -> bytes:
+    # Chave derivada: o SECRET_KEY não é usado diretamente fora dos JWTs
+    return hmac.new(settings.SECRET_KEY.encode(), b"ticket-code-v1", hashlib.sha256).digest()
+
+def _mac(payload: bytes) -> bytes:
+    return hmac.new(_key(), payload, hashlib.sha256).digest()[:_MAC_SIZE]
+
+def issue_ticket_code(event_id: int, inscription_id: int) -> str:
+    """Gera o código assinado do ingresso de uma inscrição (payload do QR code)."""
+    payload = _PAYLOAD.pack(_VERSION, event_id, inscription_id)
+    return base64.b32encode(payload + _mac(payload)).decode().rstrip("=")
+
+def verify_ticket_code(code: str) -> Optional[Tuple[int, int]]:
+    """
+    Valida um código apenas pela assinatura (sem acessar o banco).
+    Retorna (event_id, inscription_id), ou None se o código for inválido.
+    """
+    normalized = code.strip().upper()
+    try:
+        raw = base64.b32decode(normalized + "=" * (-len(normalized) % 8))
+    except (binascii.Error, ValueError):
+        return None
+
+    if len(raw) != _PAYLOAD.size + _MAC_SIZE:
+        return None
+
+    payload, mac = raw[:_PAYLOAD.size], raw[_PAYLOAD.size:]
+    if not hmac.compare_digest(mac, _mac(payload)):
+        return None
+
+    version, event_id, inscription_id = _PAYLOAD.unpack(payload)
+    if version != _VERSION:
+        return None
+    return event_id, inscription_id
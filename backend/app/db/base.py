@@ -1,28 +1,136 @@
+import time
+from sqlalchemy import event, exc
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker, DeclarativeBase
+from sqlalchemy.orm import Session, sessionmaker, DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.core.config import settings
+from app.core.metrics import db_errors, db_pool_wait, record_statement
 from typing import AsyncIterator
 
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=True,  
-    future=True
-)
+class MonitoredQueuePool(AsyncAdaptedQueuePool):
+    """
+    Pool de conexões que mede quanto tempo cada checkout espera por uma
+    conexão (incluindo abertura de novas conexões e o pre-ping).
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            self.checkouts += 1
+            self.wait_seconds_total += elapsed
+            self.wait_seconds_max = max(self.wait_seconds_max, elapsed)
+            db_pool_wait.observe(elapsed)
+
+    def recreate(self):
+        # Mantém as estatísticas quando o pool é recriado (ex.: engine.dispose())
+        pool = super().recreate()
+        pool.checkouts = self.checkouts
+        pool.timeouts = self.timeouts
+        pool.wait_seconds_total = self.wait_seconds_total
+        pool.wait_seconds_max = self.wait_seconds_max
+        return pool
+
+def _engine_options(database_url: str) -> dict:
+    """Monta as opções do engine a partir das configurações."""
+    url = make_url(database_url)
+    options = {"echo": settings.SQL_ECHO, "future": True}
+
+    # SQLite em memória usa um pool estático, sem as opções de dimensionamento
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        return options
+
+    options.update(
+        poolclass=MonitoredQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+
+    if url.get_driver_name() == "asyncpg":
+        # 0 desativa o cache de prepared statements (necessário atrás do PgBouncer)
+        options["connect_args"] = {
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        }
+
+    return options
+
+def _instrument(engine):
+    """Instrumentação: quantidade e duração dos comandos SQL (globais e por requisição)."""
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        record_statement(time.perf_counter() - conn.info["query_started"].pop())
+
+    @event.listens_for(engine.sync_engine, "handle_error")
+    def _handle_error(exception_context):
+        db_errors.inc()
+        started = exception_context.connection.info.get("query_started") if exception_context.connection else None
+        if started:
+            started.pop()
+
+def create_engine(database_url: str):
+    """Cria um engine (primário ou réplica) com o pool e a instrumentação do projeto."""
+    new_engine = create_async_engine(database_url, **_engine_options(database_url))
+    _instrument(new_engine)
+    return new_engine
+
+engine = create_engine(settings.DATABASE_URL)
 
 class Base(DeclarativeBase):
     pass
 
+class PrimarySession(Session):
+    """Sessão (síncrona, por baixo da AsyncSession) do primário; alvo dos eventos do read-your-writes."""
+
 SessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False,
     bind=engine,
     class_=AsyncSession,
+    sync_session_class=PrimarySession,
     expire_on_commit=False,
 )
 
-async def create_tables():
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+def get_pool_stats(pool_engine=None) -> dict:
+    """Retorna a ocupação do pool de conexões (do primário, por padrão) e as estatísticas de espera."""
+    pool = (pool_engine or engine).pool
+    stats = {"pool": type(pool).__name__, "status": pool.status()}
+
+    if isinstance(pool, MonitoredQueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            checkouts=pool.checkouts,
+            timeouts=pool.timeouts,
+            wait_seconds_total=pool.wait_seconds_total,
+            wait_seconds_max=pool.wait_seconds_max,
+        )
+
+    return stats
 
 async def get_db() -> AsyncIterator[AsyncSession]:
     """
@@ -32,4 +140,4 @@ async def get_db() -> AsyncIterator[AsyncSession]:
         try:
             yield session
         finally:
-            await session.close()
\ No newline at end of file
+            await session.close()
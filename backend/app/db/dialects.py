@@ -0,0 +1,15 @@
+from sqlalchemy import insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+def upsert_insert(db: AsyncSession, model):
+    """
+    INSERT do dialeto em uso, com suporte a ON CONFLICT
+    (on_conflict_do_nothing / on_conflict_do_update).
+    """
+    dialect = db.bind.dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(model)
+    if dialect == "sqlite":
+        return sqlite.insert(model)
+    raise NotImplementedError(f"ON CONFLICT não suportado no banco {dialect}")
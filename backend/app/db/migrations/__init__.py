@@ -0,0 +1,152 @@
+"""
+Migrações versionadas do schema.
+
+Cada migração é um módulo vNNNN_<nome>.py com `revision`, `description` e
+`async def upgrade(conn)`, listado em MIGRATIONS. As versões aplicadas ficam
+na tabela schema_version: ao subir, o worker só confere a versão (uma
+consulta) e não executa DDL nenhum quando o schema já está atualizado.
+
+Um banco vazio é criado direto dos modelos e marcado com a última versão,
+então as migrações só rodam em bancos existentes e devem tolerar o que já
+estiver lá (ver ops.py).
+"""
+import logging
+from dataclasses import dataclass
+from typing import List, Optional
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, func, insert, select
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.core.config import settings
+from app.db.base import Base, engine
+# Registra todos os modelos no metadata usado para criar um banco novo
+from app.db.models import user, event, inscription, rating, stats, job  # noqa: F401
+from app.db.migrations import ops, v0001_baseline, v0002_legacy_columns, v0003_material_files
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS = [
+    v0001_baseline,
+    v0002_legacy_columns,
+    v0003_material_files,
+]
+HEAD = MIGRATIONS[-1].revision
+
+# Chave do advisory lock do PostgreSQL que serializa as migrações entre workers
+_MIGRATION_LOCK_KEY = 7_294_031
+
+schema_metadata = MetaData()
+
+schema_version = Table(
+    "schema_version",
+    schema_metadata,
+    Column("version", Integer, primary_key=True),
+    Column("description", String(200), nullable=False),
+    Column("applied_at", DateTime(timezone=True), nullable=False, server_default=func.now()),
+)
+
+@dataclass
+class SchemaStatus:
+    # None: banco anterior às migrações (ou vazio), sem a tabela schema_version
+    current: Optional[int]
+    head: int
+    pending: List[int]
+
+    @property
+    def up_to_date(self) -> bool:
+        return self.current is not None and self.current >= self.head
+
+async def current_revision(conn: AsyncConnection) -> Optional[int]:
+    """
+    Versão aplicada do schema, com uma única consulta. None se a tabela
+    schema_version não existe. Use uma conexão própria: no PostgreSQL, o
+    erro da consulta invalida a transação em andamento.
+    """
+    try:
+        return await conn.scalar(select(func.coalesce(func.max(schema_version.c.version), 0)))
+    except DBAPIError:
+        await conn.rollback()
+        return None
+
+async def schema_status() -> SchemaStatus:
+    async with engine.connect() as conn:
+        current = await current_revision(conn)
+    return SchemaStatus(
+        current=current,
+        head=HEAD,
+        pending=[migration.revision for migration in MIGRATIONS if migration.revision > (current or 0)],
+    )
+
+async def _record(conn: AsyncConnection, migration):
+    await conn.execute(insert(schema_version).values(
+        version=migration.revision, description=migration.description
+    ))
+
+async def upgrade_schema() -> List[int]:
+    """
+    Aplica as migrações pendentes, cada uma na própria transação junto com o
+    registro da versão. No PostgreSQL, um advisory lock garante que só um
+    worker (ou o CLI) migre por vez; os demais esperam e encontram o schema
+    já atualizado. Retorna as versões aplicadas.
+    """
+    applied = []
+    async with engine.connect() as conn:
+        postgresql = conn.dialect.name == "postgresql"
+        if postgresql:
+            await conn.execute(select(func.pg_advisory_lock(_MIGRATION_LOCK_KEY)))
+            await conn.commit()
+
+        try:
+            if not await ops.has_table(conn, "schema_version"):
+                legacy = await ops.has_table(conn, "events")
+                await conn.run_sync(schema_metadata.create_all)
+                if not legacy:
+                    # Banco vazio: cria tudo a partir dos modelos, já na última versão
+                    await conn.run_sync(Base.metadata.create_all)
+                    for migration in MIGRATIONS:
+                        await _record(conn, migration)
+                    await conn.commit()
+                    logger.info("Schema criado na versão %s", HEAD)
+                    return [migration.revision for migration in MIGRATIONS]
+                await conn.commit()
+
+            current = await current_revision(conn)
+            for migration in MIGRATIONS:
+                if migration.revision <= current:
+                    continue
+                logger.info("Aplicando a migração %s: %s", migration.revision, migration.description)
+                await migration.upgrade(conn)
+                await _record(conn, migration)
+                await conn.commit()
+                applied.append(migration.revision)
+        finally:
+            if postgresql:
+                await conn.rollback()
+                await conn.execute(select(func.pg_advisory_unlock(_MIGRATION_LOCK_KEY)))
+                await conn.commit()
+
+    return applied
+
+async def ensure_schema() -> int:
+    """
+    Chamado na subida de cada worker. Com o schema atualizado, custa uma
+    consulta e nenhum DDL; com migrações pendentes, aplica-as
+    (DB_MIGRATE_ON_STARTUP) ou impede o worker de subir. Retorna a versão.
+    """
+    async with engine.connect() as conn:
+        current = await current_revision(conn)
+
+    if current is not None and current >= HEAD:
+        if current > HEAD:
+            # Rollback do código durante um deploy: as migrações só acrescentam, segue em frente
+            logger.warning("Schema na versão %s, mais nova que a deste código (%s)", current, HEAD)
+        return current
+
+    if not settings.DB_MIGRATE_ON_STARTUP:
+        raise RuntimeError(
+            f"O schema do banco está na versão {current or 0}, mas o código espera a {HEAD}. "
+            "Aplique as migrações com: python -m app.cli upgrade-schema"
+        )
+
+    await upgrade_schema()
+    return HEAD
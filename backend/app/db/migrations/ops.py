@@ -0,0 +1,56 @@
+"""
+Operações de apoio às migrações.
+
+Todas toleram o que já existir no banco (coluna, índice, restrição): bancos
+antigos podem ter recebido parte das alterações à mão, pelos comandos SQL
+que antes ficavam no HOW_TO_EXECUTE.md.
+"""
+from typing import Dict, Iterable, Set, Union
+from sqlalchemy import inspect, text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.db.base import Base
+
+async def has_table(conn: AsyncConnection, table: str) -> bool:
+    return await conn.run_sync(lambda sync_conn: inspect(sync_conn).has_table(table))
+
+async def column_names(conn: AsyncConnection, table: str) -> Set[str]:
+    columns = await conn.run_sync(lambda sync_conn: inspect(sync_conn).get_columns(table))
+    return {column["name"] for column in columns}
+
+async def index_names(conn: AsyncConnection, table: str) -> Set[str]:
+    """Nomes dos índices e das restrições UNIQUE da tabela."""
+    def names(sync_conn):
+        inspector = inspect(sync_conn)
+        return (
+            {index["name"] for index in inspector.get_indexes(table)}
+            | {constraint["name"] for constraint in inspector.get_unique_constraints(table)}
+        )
+    return await conn.run_sync(names)
+
+async def add_column(conn: AsyncConnection, table: str, column: str, ddl: Union[str, Dict[str, str]]) -> bool:
+    """
+    ALTER TABLE ... ADD COLUMN, se a coluna ainda não existir. `ddl` é o tipo
+    e as opções da coluna, ou um dicionário dialeto -> DDL quando diferem.
+    Retorna se a coluna foi criada.
+    """
+    if column in await column_names(conn, table):
+        return False
+    if isinstance(ddl, dict):
+        ddl = ddl[conn.dialect.name]
+    await conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+    return True
+
+async def create_indexes(conn: AsyncConnection, table: str, names: Iterable[str]):
+    """
+    Cria os índices declarados nos modelos (pelo nome), se ainda não existirem.
+    Índices restritos a um dialeto (ddl_if) são ignorados nos demais.
+    """
+    wanted = set(names)
+    indexes = [index for index in Base.metadata.tables[table].indexes if index.name in wanted]
+    missing = wanted - {index.name for index in indexes}
+    if missing:
+        raise ValueError(f"Índices não declarados nos modelos: {', '.join(sorted(missing))}")
+
+    for index in indexes:
+        await conn.run_sync(lambda sync_conn: index.create(sync_conn, checkfirst=True))
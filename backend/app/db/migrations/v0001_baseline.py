@@ -0,0 +1,16 @@
+"""
+Linha de base: cria as tabelas que ainda não existirem no banco.
+
+Bancos anteriores às migrações foram criados pelo antigo create_tables() a
+cada subida; aqui eles ganham as tabelas de funcionalidades posteriores
+(rollups, agregados de avaliações, tarefas). Tabelas existentes não mudam.
+"""
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.db.base import Base
+
+revision = 1
+description = "Tabelas base"
+
+async def upgrade(conn: AsyncConnection):
+    await conn.run_sync(Base.metadata.create_all)
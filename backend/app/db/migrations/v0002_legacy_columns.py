@@ -0,0 +1,99 @@
+"""
+Colunas, índices e restrições adicionados às tabelas depois de criadas
+(antes aplicados à mão com os comandos SQL do HOW_TO_EXECUTE.md).
+
+Os contadores dos eventos, os rollups do dashboard e os agregados de
+avaliações são preenchidos aqui mesmo: o worker volta a atender logo após
+a migração, e a reserva de vagas depende dos contadores corretos.
+"""
+from sqlalchemy import func, select, text, update
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from app.db.migrations import ops
+from app.db.models.event import Event
+from app.db.models.inscription import Inscription
+from app.services import rating_service, stats_service
+from app.services.search_service import ensure_search_index
+
+revision = 2
+description = "Contadores, versão e check-in; índices de paginação, conflitos, busca e avaliações"
+
+async def upgrade(conn: AsyncConnection):
+    # Contadores desnormalizados e validadores do GET condicional
+    await ops.add_column(conn, "events", "inscriptions_count", "INTEGER NOT NULL DEFAULT 0")
+    await ops.add_column(conn, "events", "checked_in_count", "INTEGER NOT NULL DEFAULT 0")
+    await ops.add_column(conn, "events", "version", "INTEGER NOT NULL DEFAULT 1")
+    added = await ops.add_column(conn, "events", "updated_at", {
+        "postgresql": "TIMESTAMPTZ NOT NULL DEFAULT now()",
+        # O SQLite não aceita default não constante em ADD COLUMN
+        "sqlite": "DATETIME NOT NULL DEFAULT '1970-01-01 00:00:00'",
+    })
+    if added and conn.dialect.name == "sqlite":
+        await conn.execute(text("UPDATE events SET updated_at = CURRENT_TIMESTAMP"))
+
+    # Horário do check-in (check-in em lote da portaria)
+    await ops.add_column(conn, "inscriptions", "checked_in_at", {
+        "postgresql": "TIMESTAMPTZ",
+        "sqlite": "DATETIME",
+    })
+
+    # Paginação por cursor e detecção de conflitos de horário (local/host)
+    if conn.dialect.name == "postgresql":
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS btree_gist"))
+    await ops.create_indexes(conn, "events", [
+        "ix_events_start_time_id",
+        "ix_events_public_start_time_id",
+        "ix_events_type_start_time_id",
+        "ix_events_public_type_start_time_id",
+        "ix_events_location_period",
+        "ix_events_host_period",
+        "ix_events_location_start_time",
+        "ix_events_host_start_time",
+    ])
+
+    # Falha se já existirem e-mails de visitantes duplicados (ignorando maiúsculas) em um mesmo evento
+    await ops.create_indexes(conn, "inscriptions", ["uq_event_guest_email"])
+
+    # Busca textual (extensões e índices GIN no PostgreSQL; FTS5 no SQLite)
+    await ensure_search_index(conn)
+
+    # Uma avaliação por usuário em cada evento: mantém só a mais recente
+    if "uq_rating_event_user" not in await ops.index_names(conn, "ratings"):
+        await conn.execute(text(
+            "DELETE FROM ratings WHERE id NOT IN "
+            "(SELECT max(id) FROM ratings GROUP BY event_id, user_id)"
+        ))
+        if conn.dialect.name == "postgresql":
+            await conn.execute(text(
+                "ALTER TABLE ratings ADD CONSTRAINT uq_rating_event_user UNIQUE (event_id, user_id)"
+            ))
+        else:
+            # O SQLite não adiciona restrições a tabelas existentes; o índice único equivale
+            await conn.execute(text(
+                "CREATE UNIQUE INDEX uq_rating_event_user ON ratings (event_id, user_id)"
+            ))
+    await ops.create_indexes(conn, "ratings", ["ix_ratings_event_created_at_id"])
+
+    await _fill_counters(conn)
+
+    # Os rebuilds fazem commit da sessão: com savepoints, tudo fica na transação da migração
+    db = AsyncSession(bind=conn, join_transaction_mode="create_savepoint")
+    try:
+        await stats_service.rebuild_rollups(db)
+        await rating_service.rebuild_rating_stats(db)
+    finally:
+        await db.close()
+
+async def _fill_counters(conn: AsyncConnection):
+    """Recalcula inscriptions_count e checked_in_count a partir das inscrições."""
+    total = (
+        select(func.count(Inscription.id))
+        .where(Inscription.event_id == Event.id)
+        .scalar_subquery()
+    )
+    checked_in = (
+        select(func.count(Inscription.id))
+        .where(Inscription.event_id == Event.id, Inscription.checked_in == True)
+        .scalar_subquery()
+    )
+    await conn.execute(update(Event).values(inscriptions_count=total, checked_in_count=checked_in))
@@ -0,0 +1,15 @@
+"""
+Arquivos dos materiais dos eventos: hash do conteúdo, tamanho e tipo.
+"""
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.db.migrations import ops
+
+revision = 3
+description = "Arquivos dos materiais dos eventos"
+
+async def upgrade(conn: AsyncConnection):
+    await ops.add_column(conn, "event_materials", "content_sha256", "VARCHAR(64)")
+    await ops.add_column(conn, "event_materials", "size_bytes", "BIGINT")
+    await ops.add_column(conn, "event_materials", "content_type", "VARCHAR(100)")
+    await ops.create_indexes(conn, "event_materials", ["ix_event_materials_content_sha256"])
@@ -1,5 +1,7 @@
 import enum
-from sqlalchemy import Column, Integer, String, Enum, DateTime, Boolean, ForeignKey, Text
+from datetime import datetime, timezone
+from sqlalchemy import Column, Integer, BigInteger, String, Enum, DateTime, Boolean, ForeignKey, Text, Index, DDL, func, literal_column
+from sqlalchemy.event import listen
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 
@@ -26,6 +28,22 @@ class Event(Base):
 
     is_public = Column(Boolean, default=True) 
 
+    # Contadores mantidos pelo inscription_service, evitando carregar
+    # todas as inscrições apenas para contá-las.
+    inscriptions_count = Column(Integer, nullable=False, default=0, server_default="0")
+    checked_in_count = Column(Integer, nullable=False, default=0, server_default="0")
+
+    # Validadores do GET condicional (ETag/Last-Modified): qualquer UPDATE na
+    # linha do evento (edição, contadores, materiais) incrementa a versão.
+    version = Column(
+        Integer, nullable=False, default=1, server_default="1",
+        onupdate=literal_column("version") + 1
+    )
+    updated_at = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now(),
+        default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc)
+    )
+
     creator_id = Column(Integer, ForeignKey("users.id"))
     creator = relationship("User")
 
@@ -33,9 +51,125 @@ class Event(Base):
 
     inscriptions = relationship("Inscription", back_populates="event", cascade="all, delete-orphan")
 
-    @property
-    def inscriptions_count(self):
-        return len(self.inscriptions)
+    # Índices da paginação por cursor em (start_time, id), com e sem os filtros da listagem
+    __table_args__ = (
+        Index("ix_events_start_time_id", "start_time", "id"),
+        Index("ix_events_public_start_time_id", "is_public", "start_time", "id"),
+        Index("ix_events_type_start_time_id", "event_type", "start_time", "id"),
+        Index("ix_events_public_type_start_time_id", "is_public", "event_type", "start_time", "id"),
+    )
+
+def event_period(start, end):
+    """Intervalo [start, end) do PostgreSQL, usado na detecção de conflitos."""
+    return func.tstzrange(start, end, literal_column("'[)'"))
+
+def _is_postgresql(ddl, target, bind, dialect, **kw):
+    return dialect.name == "postgresql"
+
+def _is_not_postgresql(ddl, target, bind, dialect, **kw):
+    return dialect.name != "postgresql"
+
+# Índices da detecção de conflitos (mesmo local OU mesmo host com horário sobreposto).
+# No PostgreSQL: GiST sobre (local/host, intervalo), que responde ao operador &&.
+# Nos demais bancos (ex.: SQLite local): B-tree em (local/host, início, fim).
+Index(
+    "ix_events_location_period",
+    Event.location,
+    event_period(Event.start_time, Event.end_time),
+    postgresql_using="gist"
+).ddl_if(callable_=_is_postgresql)
+Index(
+    "ix_events_host_period",
+    Event.host,
+    event_period(Event.start_time, Event.end_time),
+    postgresql_using="gist"
+).ddl_if(callable_=_is_postgresql)
+Index(
+    "ix_events_location_start_time", Event.location, Event.start_time, Event.end_time
+).ddl_if(callable_=_is_not_postgresql)
+Index(
+    "ix_events_host_start_time", Event.host, Event.start_time, Event.end_time
+).ddl_if(callable_=_is_not_postgresql)
+
+# O GiST com colunas escalares (location/host) depende da extensão btree_gist
+listen(
+    Event.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS btree_gist").execute_if(dialect="postgresql")
+)
+
+# Busca textual (RF29).
+# No PostgreSQL: índice GIN sobre um tsvector ponderado (título > host/local > descrição),
+# sem acentos, mais um índice de trigramas no título para a busca aproximada.
+# No SQLite (execução local): tabela virtual FTS5 mantida por triggers.
+POSTGRESQL_SEARCH_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS unaccent",
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    # unaccent() não é IMMUTABLE e por isso não pode ser usada em índices diretamente
+    "CREATE OR REPLACE FUNCTION immutable_unaccent(text) RETURNS text AS "
+    "$$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$ "
+    "LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT",
+]
+
+SQLITE_SEARCH_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS events_fts USING fts5("
+    "title, description, host, location, content='events', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS events_fts_ai AFTER INSERT ON events BEGIN "
+    "INSERT INTO events_fts(rowid, title, description, host, location) "
+    "VALUES (new.id, new.title, new.description, new.host, new.location); END",
+    "CREATE TRIGGER IF NOT EXISTS events_fts_ad AFTER DELETE ON events BEGIN "
+    "INSERT INTO events_fts(events_fts, rowid, title, description, host, location) "
+    "VALUES ('delete', old.id, old.title, old.description, old.host, old.location); END",
+    "CREATE TRIGGER IF NOT EXISTS events_fts_au AFTER UPDATE OF title, description, host, location ON events BEGIN "
+    "INSERT INTO events_fts(events_fts, rowid, title, description, host, location) "
+    "VALUES ('delete', old.id, old.title, old.description, old.host, old.location); "
+    "INSERT INTO events_fts(rowid, title, description, host, location) "
+    "VALUES (new.id, new.title, new.description, new.host, new.location); END",
+]
+
+def unaccented(expression):
+    return func.immutable_unaccent(func.lower(expression))
+
+def event_search_vector():
+    """tsvector ponderado dos campos pesquisáveis (mesma expressão do índice)."""
+    def weighted(column, weight):
+        return func.setweight(
+            func.to_tsvector(
+                literal_column("'portuguese'"),
+                func.immutable_unaccent(func.coalesce(column, literal_column("''")))
+            ),
+            literal_column(f"'{weight}'")
+        )
+
+    return (
+        weighted(Event.title, "A")
+        .op("||")(weighted(Event.host, "B"))
+        .op("||")(weighted(Event.location, "B"))
+        .op("||")(weighted(Event.description, "C"))
+    )
+
+for statement in POSTGRESQL_SEARCH_DDL:
+    listen(Event.__table__, "before_create", DDL(statement).execute_if(dialect="postgresql"))
+
+for statement in SQLITE_SEARCH_DDL:
+    listen(Event.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+
+SEARCH_INDEXES = [
+    Index(
+        "ix_events_search",
+        event_search_vector().label("search_vector"),
+        postgresql_using="gin",
+        # A expressão começa por funções, então a tabela é informada explicitamente
+        _table=Event.__table__
+    ).ddl_if(callable_=_is_postgresql),
+    Index(
+        "ix_events_title_trgm",
+        unaccented(Event.title).label("title_unaccented"),
+        postgresql_using="gin",
+        postgresql_ops={"title_unaccented": "gin_trgm_ops"}
+    ).ddl_if(callable_=_is_postgresql),
+]
 
 class EventMaterial(Base):
     __tablename__ = "event_materials"
@@ -45,4 +179,16 @@ class EventMaterial(Base):
     url_or_filename = Column(String(500), nullable=False)
     event_id = Column(Integer, ForeignKey("events.id"))
 
-    event = relationship("Event", back_populates="materials")
\ No newline at end of file
+    # Arquivo enviado (nulos quando o material é só um link): o conteúdo fica
+    # no armazenamento endereçado pelo SHA-256 (app/core/file_store.py)
+    content_sha256 = Column(String(64), nullable=True, index=True)
+    size_bytes = Column(BigInteger, nullable=True)
+    content_type = Column(String(100), nullable=True)
+
+    event = relationship("Event", back_populates="materials")
+
+    @property
+    def download_url(self):
+        if self.content_sha256 is None or self.id is None:
+            return None
+        return f"/events/{self.event_id}/materials/{self.id}/file"
\ No newline at end of file
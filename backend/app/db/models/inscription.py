@@ -1,7 +1,8 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime, UniqueConstraint
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.base import Base
+from app.core.tickets import issue_ticket_code
 
 class Inscription(Base):
     __tablename__ = "inscriptions"
@@ -18,6 +19,8 @@ class Inscription(Base):
 
     registration_time = Column(DateTime(timezone=True), server_default=func.now())
     checked_in = Column(Boolean, default=False) # RF21
+    # Momento da leitura na portaria (para lotes enviados depois, o horário do scanner)
+    checked_in_at = Column(DateTime(timezone=True), nullable=True)
 
     event = relationship("Event", back_populates="inscriptions")
     user = relationship("User", back_populates="inscriptions")
@@ -36,4 +39,19 @@ class Inscription(Base):
     def user_email(self):
         if self.user:
             return self.user.email
-        return self.guest_email
\ No newline at end of file
+        return self.guest_email
+
+    @property
+    def ticket_code(self):
+        # Código assinado do ingresso (QR code), verificável sem acessar o banco
+        if self.id is None or self.event_id is None:
+            return None
+        return issue_ticket_code(self.event_id, self.id)
+
+# Um mesmo e-mail de visitante (sem diferenciar maiúsculas) só pode se inscrever uma vez por evento
+Index(
+    "uq_event_guest_email",
+    Inscription.event_id,
+    func.lower(Inscription.guest_email),
+    unique=True
+)
@@ -0,0 +1,49 @@
+import enum
+from datetime import datetime, timezone
+from sqlalchemy import Column, Integer, String, Enum, DateTime, ForeignKey, Text, JSON, Index
+from app.db.base import Base
+
+class JobStatus(str, enum.Enum):
+    pending = "pending"
+    running = "running"
+    succeeded = "succeeded"
+    failed = "failed"
+
+def _utcnow():
+    return datetime.now(timezone.utc)
+
+class Job(Base):
+    """
+    Tarefa em segundo plano (exportações, certificados, importações).
+    A tabela é a própria fila: os workers reservam as tarefas pendentes com
+    um UPDATE condicional e mantêm `heartbeat_at` atualizado enquanto as
+    executam, o que permite retomar as tarefas de um processo que caiu.
+    """
+    __tablename__ = "jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    job_type = Column(String(50), nullable=False)
+    status = Column(Enum(JobStatus), nullable=False, default=JobStatus.pending)
+
+    payload = Column(JSON, nullable=False, default=dict)
+    result = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    max_attempts = Column(Integer, nullable=False, default=3, server_default="3")
+    # Próxima execução possível (adiada a cada nova tentativa, com backoff)
+    run_at = Column(DateTime(timezone=True), nullable=False, default=_utcnow)
+
+    # Worker que está executando a tarefa e último sinal de vida dele
+    locked_by = Column(String(100), nullable=True)
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)
+
+    created_by_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=False, default=_utcnow)
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # Busca das próximas tarefas e das tarefas abandonadas
+        Index("ix_jobs_status_run_at", "status", "run_at"),
+    )
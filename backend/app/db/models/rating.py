@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -18,4 +18,27 @@ class Rating(Base):
 
     # Relacionamentos (Opcional, se você quiser acessar user.ratings ou event.ratings)
     # user = relationship("User", back_populates="ratings")
-    # event = relationship("Event", back_populates="ratings")
\ No newline at end of file
+    # event = relationship("Event", back_populates="ratings")
+
+    __table_args__ = (
+        # Uma avaliação por usuário em cada evento, para a média ser honesta
+        UniqueConstraint("event_id", "user_id", name="uq_rating_event_user"),
+        # Listagem e feed paginado das avaliações de um evento (mais recentes primeiro)
+        Index("ix_ratings_event_created_at_id", "event_id", "created_at", "id"),
+    )
+
+class EventRatingStats(Base):
+    """
+    Agregado das avaliações de um evento (quantidade, soma e histograma 1–5),
+    atualizado a cada nova avaliação pelo rating_service.
+    """
+    __tablename__ = "event_rating_stats"
+
+    event_id = Column(Integer, ForeignKey("events.id", ondelete="CASCADE"), primary_key=True)
+    ratings_count = Column(Integer, nullable=False, default=0, server_default="0")
+    ratings_sum = Column(Integer, nullable=False, default=0, server_default="0")
+    count_1 = Column(Integer, nullable=False, default=0, server_default="0")
+    count_2 = Column(Integer, nullable=False, default=0, server_default="0")
+    count_3 = Column(Integer, nullable=False, default=0, server_default="0")
+    count_4 = Column(Integer, nullable=False, default=0, server_default="0")
+    count_5 = Column(Integer, nullable=False, default=0, server_default="0")
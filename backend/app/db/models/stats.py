@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, String, Enum, ForeignKey
+from app.db.base import Base
+from app.db.models.event import EventType
+
+class EventStatsRollup(Base):
+    """
+    Totais pré-agregados do dashboard (RF26), por organizador × tipo × mês × host.
+    Mantidos incrementalmente pelo stats_service a cada escrita em eventos e
+    inscrições; podem ser reconstruídos com `python -m app.cli rebuild-stats`.
+    """
+    __tablename__ = "event_stats_rollups"
+
+    creator_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    event_type = Column(Enum(EventType), primary_key=True)
+    month = Column(String(7), primary_key=True)  # "AAAA-MM" (UTC) do início do evento
+    host = Column(String(100), primary_key=True, default="")  # "" quando o evento não tem host
+
+    events_count = Column(Integer, nullable=False, default=0, server_default="0")
+    inscriptions_count = Column(Integer, nullable=False, default=0, server_default="0")
+    checked_in_count = Column(Integer, nullable=False, default=0, server_default="0")
@@ -0,0 +1,267 @@
+import asyncio
+import itertools
+import logging
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from http.cookies import SimpleCookie
+from typing import AsyncIterator, List, Optional
+from sqlalchemy import event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.db.base import PrimarySession, SessionLocal, create_engine
+
+logger = logging.getLogger(__name__)
+
+# Cookie que mantém as leituras do cliente no primário logo após uma escrita
+# (vale entre workers e instâncias; o valor é o instante, em epoch, até quando)
+STICKY_COOKIE = "read_primary_until"
+
+# Atraso de replicação de uma réplica PostgreSQL (0 quando já aplicou tudo o que recebeu)
+_POSTGRESQL_LAG = text(
+    "SELECT CASE WHEN NOT pg_is_in_recovery() "
+    "OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+@dataclass
+class _Replica:
+    name: str
+    engine: AsyncEngine
+    session_factory: sessionmaker
+    healthy: bool = False
+    lag_seconds: Optional[float] = None
+    last_error: Optional[str] = None
+    reads: int = 0
+
+@dataclass
+class RequestRouting:
+    """Estado de roteamento da requisição atual (preenchido pelo middleware)."""
+    sticky_key: Optional[str] = None
+    # Cliente escreveu há pouco (cookie ou registro local): lê do primário
+    force_primary: bool = False
+    # Esta requisição fez commit de alguma escrita
+    wrote: bool = False
+
+_request_routing: ContextVar[Optional[RequestRouting]] = ContextVar("request_routing", default=None)
+
+class ReplicaRouter:
+    """
+    Distribui as sessões somente leitura entre as réplicas saudáveis, em
+    rodízio. As réplicas são verificadas periodicamente (conexão e atraso de
+    replicação) e saem do rodízio ao falhar; sem réplica saudável, as leituras
+    vão para o primário. Um cliente que acabou de escrever lê do primário por
+    DB_READ_YOUR_WRITES_SECONDS, para enxergar a própria escrita.
+    """
+
+    def __init__(self, urls: List[str]):
+        self.replicas: List[_Replica] = []
+        for url in urls:
+            replica_engine = create_engine(url)
+            self.replicas.append(_Replica(
+                name=make_url(url).render_as_string(hide_password=True),
+                engine=replica_engine,
+                session_factory=sessionmaker(
+                    autocommit=False,
+                    autoflush=False,
+                    bind=replica_engine,
+                    class_=AsyncSession,
+                    expire_on_commit=False,
+                ),
+            ))
+            self._watch_errors(self.replicas[-1])
+
+        self._rotation = itertools.count()
+        self._sticky = TTLCache(maxsize=10000, ttl=settings.DB_READ_YOUR_WRITES_SECONDS)
+        self._health_task: Optional[asyncio.Task] = None
+        self.primary_reads = 0
+        self.sticky_reads = 0
+
+    def _watch_errors(self, replica: _Replica):
+        # Queda de conexão no meio do caminho tira a réplica do rodízio na hora
+        @event.listens_for(replica.engine.sync_engine, "handle_error")
+        def _handle_error(exception_context):
+            if exception_context.is_disconnect or isinstance(exception_context.original_exception, OSError):
+                if replica.healthy:
+                    logger.warning("Réplica %s fora do rodízio: %s", replica.name, exception_context.original_exception)
+                replica.healthy = False
+                replica.last_error = str(exception_context.original_exception)
+
+    async def start(self):
+        """Faz a primeira verificação e agenda as seguintes (chamado no lifespan)."""
+        if not self.replicas or self._health_task is not None:
+            return
+        await self.check_replicas()
+        self._health_task = asyncio.create_task(self._health_loop(), name="replica-health")
+
+    async def stop(self):
+        if self._health_task is not None:
+            self._health_task.cancel()
+            await asyncio.gather(self._health_task, return_exceptions=True)
+            self._health_task = None
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+    async def _health_loop(self):
+        while True:
+            await asyncio.sleep(settings.DB_REPLICA_HEALTH_CHECK_SECONDS)
+            try:
+                await self.check_replicas()
+            except Exception:
+                logger.exception("Falha ao verificar as réplicas de leitura")
+
+    async def check_replicas(self):
+        await asyncio.gather(*(self._check(replica) for replica in self.replicas))
+
+    async def _check(self, replica: _Replica):
+        was_healthy = replica.healthy
+        try:
+            async with replica.engine.connect() as conn:
+                if replica.engine.dialect.name == "postgresql":
+                    lag = await asyncio.wait_for(conn.scalar(_POSTGRESQL_LAG), settings.DB_REPLICA_HEALTH_CHECK_SECONDS)
+                else:
+                    await asyncio.wait_for(conn.execute(text("SELECT 1")), settings.DB_REPLICA_HEALTH_CHECK_SECONDS)
+                    lag = 0
+        except Exception as error:
+            replica.healthy = False
+            replica.lag_seconds = None
+            replica.last_error = f"{type(error).__name__}: {error}"
+        else:
+            replica.lag_seconds = float(lag or 0)
+            max_lag = settings.DB_REPLICA_MAX_LAG_SECONDS
+            replica.healthy = not max_lag or replica.lag_seconds <= max_lag
+            replica.last_error = None if replica.healthy else f"Atraso de replicação de {replica.lag_seconds:.1f}s"
+
+        if replica.healthy != was_healthy:
+            logger.warning(
+                "Réplica %s %s", replica.name,
+                "de volta ao rodízio" if replica.healthy else f"fora do rodízio: {replica.last_error}"
+            )
+
+    def mark_write(self, routing: RequestRouting):
+        """Registra que o cliente da requisição acabou de escrever."""
+        routing.wrote = True
+        routing.force_primary = True
+        if routing.sticky_key:
+            self._sticky.set(routing.sticky_key, True)
+
+    def is_sticky(self) -> bool:
+        """O cliente da requisição atual escreveu há pouco (suas leituras vão ao primário)?"""
+        routing = _request_routing.get()
+        if routing is None:
+            return False
+        if not routing.force_primary and routing.sticky_key and self._sticky.get(routing.sticky_key):
+            routing.force_primary = True
+        return routing.force_primary
+
+    def read_session_factory(self) -> sessionmaker:
+        """Escolhe onde a leitura da requisição atual será feita."""
+        if self.is_sticky():
+            self.sticky_reads += 1
+            return SessionLocal
+
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            self.primary_reads += 1
+            return SessionLocal
+
+        replica = healthy[next(self._rotation) % len(healthy)]
+        replica.reads += 1
+        return replica.session_factory
+
+    def stats(self) -> dict:
+        return {
+            "replicas": len(self.replicas),
+            "healthy": sum(replica.healthy for replica in self.replicas),
+            "replica_reads": sum(replica.reads for replica in self.replicas),
+            "primary_reads": self.primary_reads,
+            "sticky_reads": self.sticky_reads,
+            "details": [
+                {
+                    "name": replica.name,
+                    "healthy": replica.healthy,
+                    "lag_seconds": replica.lag_seconds,
+                    "reads": replica.reads,
+                    "last_error": replica.last_error,
+                }
+                for replica in self.replicas
+            ],
+        }
+
+replica_router = ReplicaRouter(
+    [url.strip() for url in settings.DATABASE_REPLICA_URLS.split(",") if url.strip()]
+)
+
+# Commits com escrita nas sessões do primário ativam o read-your-writes da requisição
+@event.listens_for(PrimarySession, "do_orm_execute")
+def _track_orm_write(orm_execute_state):
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info["wrote"] = True
+
+@event.listens_for(PrimarySession, "after_flush")
+def _track_flush(session, flush_context):
+    session.info["wrote"] = True
+
+@event.listens_for(PrimarySession, "after_commit")
+def _track_commit(session):
+    if session.info.pop("wrote", False):
+        routing = _request_routing.get()
+        if routing is not None:
+            replica_router.mark_write(routing)
+
+def is_primary_session(session: AsyncSession) -> bool:
+    """A sessão lê do primário (e não de uma réplica, possivelmente atrasada)?"""
+    return isinstance(session.sync_session, PrimarySession)
+
+async def get_read_db() -> AsyncIterator[AsyncSession]:
+    """
+    Dependência para as leituras: sessão em uma réplica saudável (ou no
+    primário, sem réplicas ou logo após uma escrita do mesmo cliente).
+    Use só em rotas que não escrevem.
+    """
+    async with replica_router.read_session_factory()() as session:
+        yield session
+
+class ReadRoutingMiddleware:
+    """
+    Middleware ASGI do read-your-writes: identifica o cliente (token ou
+    cookie) e, se a requisição escreveu, devolve o cookie que mantém as
+    próximas leituras dele no primário (inclusive em outros workers).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not replica_router.replicas:
+            return await self.app(scope, receive, send)
+
+        headers = dict(scope["headers"])
+        routing = RequestRouting(sticky_key=headers.get(b"authorization", b"").decode("latin-1") or None)
+
+        cookie = SimpleCookie(headers.get(b"cookie", b"").decode("latin-1"))
+        if STICKY_COOKIE in cookie:
+            try:
+                routing.force_primary = float(cookie[STICKY_COOKIE].value) > time.time()
+            except ValueError:
+                pass
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and routing.wrote:
+                window = settings.DB_READ_YOUR_WRITES_SECONDS
+                value = (
+                    f"{STICKY_COOKIE}={time.time() + window:.0f}; Max-Age={window:.0f}; "
+                    "Path=/; HttpOnly; SameSite=Lax"
+                )
+                message["headers"] = list(message.get("headers", [])) + [(b"set-cookie", value.encode("latin-1"))]
+            await send(message)
+
+        token = _request_routing.set(routing)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_routing.reset(token)
@@ -1,12 +1,21 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
-from app.db.base import create_tables
-# Importe TODOS os modelos aqui para que o create_tables os reconheça
+from app.db.base import engine
+from app.db.migrations import ensure_schema
+from app.db.replicas import ReadRoutingMiddleware, replica_router
+from app.core.security import shutdown_hashing_pool
+from app.core.metrics import MetricsMiddleware
+from app.services.certificate_service import shutdown_certificate_pool
+from app.services.job_service import job_worker
+from app.services.event_service import event_cache
+# Importe TODOS os modelos aqui para que os relacionamentos sejam resolvidos
 from app.db.models import user
 from app.db.models import event
 from app.db.models import inscription
 from app.db.models import rating  # <--- ADICIONE ESTA LINHA
+from app.db.models import stats
+from app.db.models import job
 from app.api.api import api_router 
 
 origins = [
@@ -18,17 +27,33 @@ origins = [
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     print("Servidor iniciando...")
-    # Cria as tabelas baseadas nos modelos importados acima
-    await create_tables()
-    print("Tabelas criadas com sucesso (se não existiam).")
+    # Confere a versão do schema (sem DDL quando atualizado) e aplica migrações pendentes
+    version = await ensure_schema()
+    print(f"Schema do banco na versão {version}.")
+    # Executor das tarefas em segundo plano (exportações, certificados, importações)
+    await job_worker.start()
+    # Verificação de saúde das réplicas de leitura (se configuradas)
+    await replica_router.start()
     yield
     print("Servidor finalizando...")
+    await job_worker.stop()
+    await replica_router.stop()
+    shutdown_hashing_pool()
+    shutdown_certificate_pool()
+    await event_cache.close()
+    await engine.dispose()
 
 app = FastAPI(
     title="Gerenciador de Eventos",
     lifespan=lifespan
 )
 
+# Latência, status e SQL por requisição, expostos em GET /metrics
+app.add_middleware(MetricsMiddleware)
+
+# Read-your-writes: após uma escrita, as leituras do cliente vão ao primário
+app.add_middleware(ReadRoutingMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
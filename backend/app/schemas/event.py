@@ -1,5 +1,6 @@
-from pydantic import BaseModel
-from datetime import datetime
+import enum
+from pydantic import BaseModel, model_validator
+from datetime import datetime, timezone
 from typing import Optional, List
 from app.db.models.event import EventType
 
@@ -12,6 +13,10 @@ class EventMaterialCreate(EventMaterialBase):
 
 class EventMaterialRead(EventMaterialBase):
     id: int
+    # Preenchidos quando o material é um arquivo enviado (e não um link)
+    size_bytes: Optional[int] = None
+    content_type: Optional[str] = None
+    download_url: Optional[str] = None
     class Config:
         from_attributes = True
 
@@ -29,6 +34,17 @@ class EventBase(BaseModel):
 class EventCreate(EventBase):
     materials: List[EventMaterialCreate] = []
 
+    @model_validator(mode="after")
+    def require_valid_period(self):
+        # Horários sem fuso são tratados como UTC (mesma regra do serviço)
+        start, end = (
+            value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+            for value in (self.start_time, self.end_time)
+        )
+        if end <= start:
+            raise ValueError("O horário de término deve ser posterior ao de início.")
+        return self
+
 class EventUpdate(BaseModel):
     title: Optional[str] = None
     description: Optional[str] = None
@@ -45,6 +61,27 @@ class EventRead(EventBase):
     creator_id: int
     materials: List[EventMaterialRead] = []
     inscriptions_count: int = 0  
+    checked_in_count: int = 0
+    version: int = 1
+    updated_at: Optional[datetime] = None
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class EventSort(str, enum.Enum):
+    start_time_desc = "start_time_desc"
+    start_time_asc = "start_time_asc"
+
+class EventPage(BaseModel):
+    items: List[EventRead]
+    next_cursor: Optional[str] = None
+
+class EventConflict(BaseModel):
+    id: int
+    title: str
+    start_time: datetime
+    end_time: datetime
+    location: Optional[str] = None
+    host: Optional[str] = None
+    same_location: bool
+    same_host: bool
@@ -1,5 +1,6 @@
-from pydantic import BaseModel, EmailStr
-from typing import Optional
+import enum
+from pydantic import BaseModel, EmailStr, Field, model_validator
+from typing import Optional, List
 from datetime import datetime
 
 class InscriptionBase(BaseModel):
@@ -16,9 +17,79 @@ class InscriptionRead(InscriptionBase):
     user_id: Optional[int] = None
     registration_time: datetime
     checked_in: bool
+    checked_in_at: Optional[datetime] = None
     
     user_name: Optional[str] = None 
     user_email: Optional[str] = None
+    ticket_code: Optional[str] = None
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class ExportFormat(str, enum.Enum):
+    csv = "csv"
+    xlsx = "xlsx"
+
+class ImportRowStatus(str, enum.Enum):
+    created = "created"
+    duplicate = "duplicate"
+    invalid = "invalid"
+    no_vacancy = "no_vacancy"
+
+class InscriptionImportRow(BaseModel):
+    row: int
+    email: Optional[str] = None
+    status: ImportRowStatus
+    detail: Optional[str] = None
+
+class InscriptionImportReport(BaseModel):
+    created: int
+    skipped: int
+    rows: List[InscriptionImportRow]
+
+# Check-in em lote (portaria): leituras feitas na hora ou guardadas offline pelo scanner
+class CheckInScan(BaseModel):
+    inscription_id: Optional[int] = None
+    # Código do ingresso lido do QR code (alternativa ao inscription_id)
+    code: Optional[str] = None
+    scanned_at: Optional[datetime] = None
+
+    @model_validator(mode="after")
+    def require_reference(self):
+        if self.inscription_id is None and not self.code:
+            raise ValueError("Informe inscription_id ou code.")
+        return self
+
+class BulkCheckInRequest(BaseModel):
+    scans: List[CheckInScan] = Field(..., min_length=1, max_length=5000)
+
+class CheckInStatus(str, enum.Enum):
+    checked_in = "checked_in"
+    already_checked_in = "already_checked_in"
+    duplicate = "duplicate"
+    not_found = "not_found"
+    wrong_event = "wrong_event"
+    invalid_code = "invalid_code"
+
+class BulkCheckInItem(BaseModel):
+    inscription_id: Optional[int] = None
+    code: Optional[str] = None
+    status: CheckInStatus
+    checked_in_at: Optional[datetime] = None
+
+class BulkCheckInReport(BaseModel):
+    checked_in: int
+    already_checked_in: int
+    rejected: int
+    items: List[BulkCheckInItem]
+
+class TicketVerifyRequest(BaseModel):
+    code: str
+    # Se informado, o ingresso também precisa ser deste evento
+    event_id: Optional[int] = None
+
+class TicketVerification(BaseModel):
+    valid: bool
+    event_id: Optional[int] = None
+    inscription_id: Optional[int] = None
+    detail: Optional[str] = None
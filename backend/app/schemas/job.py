@@ -0,0 +1,21 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Any, Optional
+from app.db.models.job import JobStatus
+
+class JobRead(BaseModel):
+    id: int
+    job_type: str
+    status: JobStatus
+    attempts: int
+    max_attempts: int
+    run_at: datetime
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    # Resultado da tarefa; quando ela gera um arquivo, baixe em GET /jobs/{id}/result
+    result: Optional[Any] = None
+    error: Optional[str] = None
+
+    class Config:
+        from_attributes = True
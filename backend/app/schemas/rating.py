@@ -1,12 +1,12 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
 from datetime import datetime
 
 # O que o front envia para criar
 class RatingCreate(BaseModel):
     event_id: int
     user_id: int
-    rating: int
+    rating: int = Field(..., ge=1, le=5)
     comment: Optional[str] = None
 
 # O que o back devolve para o front
@@ -15,4 +15,16 @@ class RatingRead(RatingCreate):
     created_at: datetime
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+# Resumo das avaliações de um evento
+class RatingSummary(BaseModel):
+    event_id: int
+    count: int
+    average: Optional[float] = None
+    histogram: Dict[int, int]
+
+# Página do feed de comentários
+class RatingPage(BaseModel):
+    items: List[RatingRead]
+    next_cursor: Optional[str] = None
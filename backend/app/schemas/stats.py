@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+class StatsBreakdown(BaseModel):
+    key: Optional[str] = None
+    events: int
+    inscriptions: int
+    checked_in: int
+
+class DashboardStats(BaseModel):
+    total_events: int
+    total_inscriptions: int
+    total_checked_in: int
+    by_type: List[StatsBreakdown] = []
+    by_month: List[StatsBreakdown] = []
+    by_host: List[StatsBreakdown] = []
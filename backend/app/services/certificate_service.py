@@ -0,0 +1,243 @@
+import asyncio
+import json
+import multiprocessing
+import os
+import re
+import unicodedata
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import AsyncIterator, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.orm import selectinload
+from sqlalchemy import func
+from fastapi import HTTPException, status
+
+from app.core import pdf
+from app.core.config import settings
+from app.core.tickets import issue_ticket_code
+from app.core.xlsx import ChunkSink
+from app.db.base import SessionLocal
+from app.db.models.event import Event, EventType
+from app.db.models.inscription import Inscription
+from app.db.models.job import Job
+from app.db.models.user import User, UserRole
+from app.services.job_service import job_handler, write_job_file
+
+# Certificados por tarefa enviada ao pool (amortiza a troca de dados entre processos)
+CERTIFICATE_BATCH_SIZE = 100
+
+# Template padrão: A4 paisagem (842 x 595 pontos)
+DEFAULT_TEMPLATE = {
+    "page": [842, 595],
+    "margin": 36,
+    "lines": [
+        {"text": "CERTIFICADO", "font": "bold", "size": 40, "y": 470},
+        {"text": "Certificamos que", "size": 16, "y": 405},
+        {"text": "{name}", "font": "bold", "size": 28, "y": 360},
+        {"text": "participou do evento", "size": 16, "y": 318},
+        {"text": "{event_title}", "font": "bold", "size": 20, "y": 285},
+        {"text": "{event_type} realizada em {event_date}, com carga horária de {event_hours}.", "size": 14, "y": 250},
+        {"text": "Local: {location}  |  Responsável: {host}", "size": 12, "y": 222},
+        {"text": "Emitido em {issued_on}", "size": 11, "y": 120},
+        {"text": "Código de verificação: {code}", "size": 10, "y": 100},
+    ],
+}
+
+# Campos disponíveis para os templates
+TEMPLATE_FIELDS = {
+    "name", "event_title", "event_type", "event_date", "event_hours",
+    "location", "host", "issued_on", "code",
+}
+
+EVENT_TYPE_LABELS = {
+    EventType.oficina: "Oficina",
+    EventType.palestra: "Palestra",
+    EventType.reuniao_interna: "Reunião interna",
+}
+
+@lru_cache(maxsize=1)
+def certificate_template() -> dict:
+    """
+    Template em uso (o do CERTIFICATE_TEMPLATE_PATH ou o padrão), validado
+    uma vez: compila no processo principal para falhar cedo se estiver errado.
+    """
+    spec = DEFAULT_TEMPLATE
+    if settings.CERTIFICATE_TEMPLATE_PATH:
+        with open(settings.CERTIFICATE_TEMPLATE_PATH, encoding="utf-8") as file:
+            spec = json.load(file)
+
+    unknown = pdf.CompiledTemplate(spec).fields - TEMPLATE_FIELDS
+    if unknown:
+        raise ValueError(f"Campos desconhecidos no template de certificado: {', '.join(sorted(unknown))}")
+    return spec
+
+_certificate_pool: Optional[ProcessPoolExecutor] = None
+
+def _get_pool() -> ProcessPoolExecutor:
+    """
+    Pool de processos da renderização, criado no primeiro uso. Cada processo
+    compila o template uma vez (initializer) e o reaproveita em todos os lotes.
+    Usa "spawn" para não herdar o event loop, as threads e as conexões do worker.
+    """
+    global _certificate_pool
+    if _certificate_pool is None:
+        _certificate_pool = ProcessPoolExecutor(
+            max_workers=settings.CERTIFICATE_WORKERS or os.cpu_count() or 1,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=pdf.init_worker,
+            initargs=(certificate_template(),),
+        )
+    return _certificate_pool
+
+def shutdown_certificate_pool():
+    global _certificate_pool
+    if _certificate_pool is not None:
+        _certificate_pool.shutdown(wait=False, cancel_futures=True)
+        _certificate_pool = None
+
+def _format_hours(event: Event) -> str:
+    hours = (event.end_time - event.start_time).total_seconds() / 3600
+    text = f"{hours:.1f}".rstrip("0").rstrip(".").replace(".", ",")
+    return f"{text} hora" if hours == 1 else f"{text} horas"
+
+def _event_context(event: Event) -> dict:
+    """Campos comuns a todos os certificados de um evento."""
+    return {
+        "event_title": event.title,
+        "event_type": EVENT_TYPE_LABELS.get(event.event_type, str(event.event_type)),
+        "event_date": event.start_time.strftime("%d/%m/%Y"),
+        "event_hours": _format_hours(event),
+        "location": event.location or "-",
+        "host": event.host or "-",
+        "issued_on": datetime.now(timezone.utc).strftime("%d/%m/%Y"),
+    }
+
+def _certificate_row(event_id: int, inscription_id: int, name: Optional[str]) -> dict:
+    # O código do ingresso (HMAC) também serve para verificar o certificado
+    return {"name": name or "", "code": issue_ticket_code(event_id, inscription_id)}
+
+def _certificate_filename(inscription_id: int, name: Optional[str]) -> str:
+    ascii_name = unicodedata.normalize("NFKD", name or "").encode("ascii", "ignore").decode()
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", ascii_name).strip("_").lower()[:60]
+    return f"certificado_{inscription_id}_{slug}.pdf" if slug else f"certificado_{inscription_id}.pdf"
+
+async def _render(context: dict, rows: list) -> list:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_pool(), pdf.render_batch, context, rows)
+
+async def get_certificate(
+    db: AsyncSession, inscription_id: int, current_user: User
+) -> Tuple[str, bytes]:
+    """
+    Gera o certificado de uma inscrição com check-in.
+    O participante só acessa o próprio certificado; organizadores e admins, qualquer um.
+    """
+    result = await db.execute(
+        select(Inscription)
+        .options(selectinload(Inscription.event), selectinload(Inscription.user))
+        .where(Inscription.id == inscription_id)
+    )
+    inscription = result.scalars().first()
+
+    if not inscription:
+        raise HTTPException(status_code=404, detail="Inscrição não encontrada.")
+
+    if (
+        current_user.id != inscription.user_id
+        and current_user.role not in (UserRole.organizer, UserRole.admin)
+    ):
+        raise HTTPException(status_code=403, detail="Sem permissão para acessar este certificado.")
+
+    if not inscription.checked_in:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="O certificado só é emitido após o check-in."
+        )
+
+    row = _certificate_row(inscription.event_id, inscription.id, inscription.user_name)
+    [document] = await _render(_event_context(inscription.event), [row])
+    return _certificate_filename(inscription.id, inscription.user_name), document
+
+def stream_certificates_zip(event: Event) -> AsyncIterator[bytes]:
+    """
+    Gera em fluxo um ZIP com os certificados de todos os participantes com
+    check-in do evento. Os dados do evento são lidos já aqui, pois a sessão
+    da requisição é encerrada antes de a resposta começar a ser transmitida.
+    """
+    return _stream_certificates_zip(event.id, _event_context(event))
+
+async def _stream_certificates_zip(event_id: int, context: dict) -> AsyncIterator[bytes]:
+    """
+    Os lotes são renderizados em paralelo no pool, com no máximo dois lotes
+    por processo em andamento (memória limitada), e entram no ZIP na ordem
+    das inscrições conforme ficam prontos. Os PDFs já vêm comprimidos dos
+    processos, então o ZIP apenas os armazena.
+    """
+    max_in_flight = 2 * (settings.CERTIFICATE_WORKERS or os.cpu_count() or 1)
+
+    query = (
+        select(Inscription.id, func.coalesce(User.name, Inscription.guest_name))
+        .select_from(Inscription)
+        .outerjoin(User, Inscription.user_id == User.id)
+        .where(Inscription.event_id == event_id, Inscription.checked_in.is_(True))
+        .order_by(Inscription.id)
+        .execution_options(yield_per=CERTIFICATE_BATCH_SIZE)
+    )
+
+    sink = ChunkSink()
+    archive = zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_STORED)
+    pending: deque = deque()
+
+    def write_batch(names: list, documents: list) -> bytes:
+        for filename, document in zip(names, documents):
+            archive.writestr(filename, document)
+        return sink.drain()
+
+    try:
+        async with SessionLocal() as db:
+            result = await db.stream(query)
+            async for partition in result.partitions():
+                rows = [_certificate_row(event_id, inscription_id, name) for inscription_id, name in partition]
+                names = [_certificate_filename(inscription_id, name) for inscription_id, name in partition]
+                pending.append((names, asyncio.ensure_future(_render(context, rows))))
+
+                while len(pending) >= max_in_flight:
+                    names, task = pending.popleft()
+                    yield write_batch(names, await task)
+
+        while pending:
+            names, task = pending.popleft()
+            yield write_batch(names, await task)
+
+        archive.close()
+        yield sink.drain()
+    finally:
+        # Cliente desconectou no meio: descarta os lotes que ainda não começaram
+        for _, task in pending:
+            task.cancel()
+
+@job_handler("event_certificates")
+async def run_certificates_job(payload: dict, job: Job) -> dict:
+    """
+    Tarefa em segundo plano: grava o ZIP de certificados do evento em um
+    arquivo. Uma por vez em cada worker, já que a renderização usa o pool todo.
+    """
+    async with SessionLocal() as db:
+        event = await db.get(Event, payload["event_id"])
+    if not event:
+        raise HTTPException(status_code=404, detail="Evento não encontrado")
+
+    name = f"job-{job.id}.zip"
+    size = await write_job_file(name, stream_certificates_zip(event))
+
+    return {
+        "file": name,
+        "filename": f"certificados_evento_{event.id}.zip",
+        "media_type": "application/zip",
+        "size": size,
+        "certificates": event.checked_in_count,
+    }
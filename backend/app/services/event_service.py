@@ -1,55 +1,114 @@
-from datetime import datetime
+from datetime import datetime, timezone
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy.sql import or_, and_, func
+from sqlalchemy.sql import or_, and_, func, tuple_, union, literal_column
 from fastapi import HTTPException, status
-from app.db.models.event import Event, EventMaterial, EventType
+from app.db.models.event import Event, EventMaterial, EventType, event_period
 from app.db.models.user import User
-from app.schemas.event import EventCreate, EventUpdate
+from app.schemas.event import EventCreate, EventUpdate, EventSort
+from app.core.conditional import make_etag
+from app.core.pagination import encode_cursor, decode_cursor
+from app.core.response_cache import create_response_cache
 from sqlalchemy.orm import joinedload, selectinload
 from typing import List, Optional
 from app.db.models.user import UserRole
 from app.db.models.inscription import Inscription
+from app.services import stats_service
 
-async def check_conflict(
-    db: AsyncSession, 
-    start: datetime, 
-    end: datetime, 
-    location: str, 
-    host: str,
-    event_id_to_ignore: int = None
-):
+# Respostas prontas de GET /events e GET /events/{id}, invalidadas a cada
+# escrita em eventos ou inscrições (os contadores fazem parte da resposta)
+event_cache = create_response_cache("events")
+
+def visibility_class(user: Optional[User]) -> str:
+    """Classe de visibilidade usada na chave do cache (mesma regra dos filtros)."""
+    if user and user.role in [UserRole.admin, UserRole.organizer]:
+        return "all"
+    return "public"
+
+def check_period(start: datetime, end: datetime):
+    """
+    Recusa intervalos em que o término não é posterior ao início (o
+    tstzrange do PostgreSQL falha com término antes do início). Horários
+    sem fuso (como o SQLite os devolve) são tratados como UTC.
     """
-    Verifica se há um evento conflitante (mesmo local E horário 
+    start, end = (
+        value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+        for value in (start, end)
+    )
+    if end <= start:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="O horário de término deve ser posterior ao de início."
+        )
+
+async def find_conflicts(
+    db: AsyncSession,
+    start: datetime,
+    end: datetime,
+    location: Optional[str],
+    host: Optional[str],
+    event_id_to_ignore: Optional[int] = None
+) -> List[Event]:
+    """
+    Retorna todos os eventos conflitantes (mesmo local E horário 
     OU mesmo host E horário).
+    O OR é dividido em uma UNION de duas consultas, cada uma atendida
+    pelo seu índice (GiST sobre o intervalo no PostgreSQL).
     """
+    check_period(start, end)
 
-    time_overlap = and_(
-        Event.start_time < end,
-        Event.end_time > start
-    )
+    if db.bind.dialect.name == "postgresql":
+        time_overlap = event_period(Event.start_time, Event.end_time).op("&&")(
+            func.tstzrange(start, end, literal_column("'[)'"))
+        )
+    else:
+        time_overlap = and_(
+            Event.start_time < end,
+            Event.end_time > start
+        )
 
-    location_or_host_overlap = or_(
-        Event.location == location,
-        Event.host == host
-    )
+    branches = []
+    if location:
+        branches.append(select(Event.id).where(Event.location == location, time_overlap))
+    if host:
+        branches.append(select(Event.id).where(Event.host == host, time_overlap))
 
-    query = select(Event).where(
-        time_overlap,
-        location_or_host_overlap
-    )
+    if not branches:
+        return []
 
+    query = (
+        select(Event)
+        .where(Event.id.in_(union(*branches)))
+        .order_by(Event.start_time, Event.id)
+    )
 
     if event_id_to_ignore:
         query = query.where(Event.id != event_id_to_ignore)
 
     result = await db.execute(query)
-    conflicting_event = result.scalars().first()
+    return result.scalars().all()
+
+async def check_conflict(
+    db: AsyncSession, 
+    start: datetime, 
+    end: datetime, 
+    location: str, 
+    host: str,
+    event_id_to_ignore: int = None
+):
+    """
+    Impede a criação/edição de um evento que conflite com outros,
+    listando todos os eventos conflitantes na mensagem de erro.
+    """
+    conflicting_events = await find_conflicts(
+        db, start, end, location, host, event_id_to_ignore
+    )
 
-    if conflicting_event:
+    if conflicting_events:
+        titles = ", ".join(event.title for event in conflicting_events)
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT, 
-            detail=f"Conflito de horário/local/host com o evento: {conflicting_event.title}"
+            detail=f"Conflito de horário/local/host com o(s) evento(s): {titles}"
         )
 
 async def create_event(
@@ -78,47 +137,151 @@ async def create_event(
     )
 
     db.add(new_event)
+    await db.flush()
+    await stats_service.add_events(db, Event.id == new_event.id)
     await db.commit()
+    await event_cache.invalidate()
     
     query = (
         select(Event)
         .where(Event.id == new_event.id)
-        .options(joinedload(Event.materials),
-                 selectinload(Event.inscriptions))
+        .options(joinedload(Event.materials))
     )
     result = await db.execute(query)
     created_event = result.scalars().first()
 
     return created_event
 
-async def get_events(
-    db: AsyncSession,
+def _event_filters(
     user: Optional[User],
     event_type: Optional[EventType] = None,
     title: Optional[str] = None
-) -> List[Event]:
-    """
-    Busca todos os eventos com filtros, aplicando regras de visibilidade.
-    """
-    query = select(Event).options(
-        joinedload(Event.materials), 
-        selectinload(Event.inscriptions)
-    )
+) -> list:
+    """Filtros da listagem, incluindo as regras de visibilidade."""
+    filters = []
 
     if not user or user.role == UserRole.participant:
-        query = query.where(Event.is_public == True)
+        filters.append(Event.is_public == True)
 
     if event_type:
-        query = query.where(Event.event_type == event_type)
+        filters.append(Event.event_type == event_type)
 
     if title:
-        query = query.where(Event.title.ilike(f"%{title}%")) 
+        filters.append(Event.title.ilike(f"%{title}%"))
+
+    return filters
 
-    query = query.order_by(Event.start_time.desc())
+def _page_query(
+    query,
+    user: Optional[User],
+    event_type: Optional[EventType],
+    title: Optional[str],
+    limit: int,
+    cursor: Optional[str],
+    sort: EventSort
+):
+    """
+    Aplica filtros, cursor (keyset sobre (start_time, id)), ordenação e
+    limite à consulta. Busca um item a mais apenas para saber se existe
+    uma próxima página.
+    """
+    query = query.where(*_event_filters(user, event_type, title))
+
+    sort_key = tuple_(Event.start_time, Event.id)
+    descending = sort == EventSort.start_time_desc
+
+    if cursor:
+        start_time, event_id = decode_cursor(cursor, size=2)
+        try:
+            last_key = tuple_(datetime.fromisoformat(start_time), int(event_id))
+        except (TypeError, ValueError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cursor de paginação inválido."
+            )
+        query = query.where(sort_key < last_key if descending else sort_key > last_key)
+
+    if descending:
+        query = query.order_by(Event.start_time.desc(), Event.id.desc())
+    else:
+        query = query.order_by(Event.start_time.asc(), Event.id.asc())
 
+    return query.limit(limit + 1)
+
+async def get_events(
+    db: AsyncSession,
+    user: Optional[User],
+    event_type: Optional[EventType] = None,
+    title: Optional[str] = None,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    sort: EventSort = EventSort.start_time_desc
+) -> dict:
+    """
+    Busca uma página de eventos com filtros, aplicando regras de visibilidade.
+    A paginação é por cursor (keyset) sobre (start_time, id).
+    """
+    query = _page_query(
+        select(Event).options(selectinload(Event.materials)),
+        user, event_type, title, limit, cursor, sort
+    )
     result = await db.execute(query)
-    return result.scalars().unique().all()
+    events = result.scalars().all()
+
+    next_cursor = None
+    if len(events) > limit:
+        events = events[:limit]
+        last = events[-1]
+        next_cursor = encode_cursor(last.start_time, last.id)
 
+    return {"items": events, "next_cursor": next_cursor}
+
+
+async def get_events_etag(
+    db: AsyncSession,
+    user: Optional[User],
+    event_type: Optional[EventType] = None,
+    title: Optional[str] = None,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    sort: EventSort = EventSort.start_time_desc
+) -> str:
+    """
+    Validador da listagem, calculado só sobre a janela da página (mesmo
+    keyset e limite da consulta da página, pelos índices de paginação):
+    ids e versões dos eventos dela. A versão muda a cada edição, alteração
+    de contadores ou de materiais; criações e remoções mudam os ids.
+    O custo não cresce com a tabela.
+    """
+    query = _page_query(
+        select(Event.id, Event.version),
+        user, event_type, title, limit, cursor, sort
+    )
+    result = await db.execute(query)
+    return make_etag(
+        *(value for row in result.all() for value in row),
+        event_type.value if event_type else None, title, limit, cursor, sort.value
+    )
+
+async def get_event_validators(
+    db: AsyncSession, event_id: int, user: Optional[User]
+) -> Optional[tuple]:
+    """
+    Retorna (ETag, Last-Modified) de um evento visível ao usuário, lendo
+    apenas a versão e a data de alteração. None se não existir/não for visível.
+    """
+    result = await db.execute(
+        select(Event.version, Event.updated_at, Event.is_public).where(Event.id == event_id)
+    )
+    row = result.first()
+
+    if not row:
+        return None
+
+    if not row.is_public and (not user or user.role not in [UserRole.admin, UserRole.organizer]):
+        return None
+
+    return make_etag(event_id, row.version), row.updated_at
 
 async def get_event_by_id(
     db: AsyncSession, event_id: int, user: Optional[User]
@@ -129,10 +292,7 @@ async def get_event_by_id(
     query = (
         select(Event)
         .where(Event.id == event_id)
-        .options(
-            joinedload(Event.materials),
-            selectinload(Event.inscriptions)
-        )
+        .options(joinedload(Event.materials))
     )
 
     result = await db.execute(query)
@@ -162,7 +322,8 @@ async def update_event(
     """
     Atualiza um evento.
     """
-    db_event = await db.get(Event, event_id)
+    # Bloqueia a linha do evento antes de mexer nos rollups (mesma ordem das inscrições)
+    db_event = await db.get(Event, event_id, with_for_update=True)
     
     if not db_event:
         raise HTTPException(status_code=404, detail="Evento não encontrado")
@@ -181,18 +342,25 @@ async def update_event(
         event_id_to_ignore=event_id
     )
 
+    # Mudanças na chave dos rollups (tipo, mês, host) movem o evento de linha
+    moves_rollup = any(key in update_data for key in ("event_type", "start_time", "host"))
+    if moves_rollup:
+        await stats_service.remove_events(db, Event.id == event_id)
+
     for key, value in update_data.items():
         setattr(db_event, key, value)
+
+    if moves_rollup:
+        await db.flush()
+        await stats_service.add_events(db, Event.id == event_id)
         
     await db.commit()
+    await event_cache.invalidate()
 
     query = (
         select(Event)
         .where(Event.id == event_id)
-        .options(
-            joinedload(Event.materials),
-            selectinload(Event.inscriptions)
-        )
+        .options(joinedload(Event.materials))
     )
     result = await db.execute(query)
     return result.scalars().first()
@@ -203,35 +371,23 @@ async def delete_event(
     """
     Deleta um evento.
     """
-    db_event = await db.get(Event, event_id)
+    db_event = await db.get(Event, event_id, with_for_update=True)
     
     if not db_event:
         raise HTTPException(status_code=404, detail="Evento não encontrado")
         
     if db_event.creator_id != user.id and user.role != UserRole.admin:
         raise HTTPException(status_code=403, detail="Sem permissão para deletar")
-        
+
+    await stats_service.remove_events(db, Event.id == event_id)
     await db.delete(db_event)
     await db.commit()
+    await event_cache.invalidate()
     return
 
 async def get_dashboard_stats(db: AsyncSession, user_id: int):
     """
-    Retorna estatísticas gerais para o dashboard do organizador (RF26).
+    Retorna estatísticas para o dashboard do organizador (RF26),
+    lidas dos rollups mantidos pelo stats_service.
     """
-    query_events = select(func.count(Event.id)).where(Event.creator_id == user_id)
-    result_events = await db.execute(query_events)
-    total_events = result_events.scalar() or 0
-
-    query_inscriptions = (
-        select(func.count(Inscription.id))
-        .join(Event)
-        .where(Event.creator_id == user_id)
-    )
-    result_inscriptions = await db.execute(query_inscriptions)
-    total_inscriptions = result_inscriptions.scalar() or 0
-
-    return {
-        "total_events": total_events,
-        "total_inscriptions": total_inscriptions
-    }
\ No newline at end of file
+    return await stats_service.get_dashboard_stats(db, user_id)
@@ -0,0 +1,131 @@
+import csv
+import io
+from typing import AsyncIterator, List, Optional
+from sqlalchemy.future import select
+from sqlalchemy import func
+from fastapi import HTTPException, status
+
+from app.db.base import SessionLocal
+from app.db.models.inscription import Inscription
+from app.db.models.job import Job
+from app.db.models.user import User
+from app.core.xlsx import XlsxStreamWriter
+from app.schemas.inscription import ExportFormat
+from app.services.job_service import job_handler, write_job_file
+
+# Quantidade de linhas buscadas por vez no cursor do banco
+EXPORT_BATCH_SIZE = 1000
+
+# Colunas disponíveis na exportação de inscritos (RF19/RF28)
+INSCRIPTION_EXPORT_COLUMNS = {
+    "id": Inscription.id,
+    "name": func.coalesce(User.name, Inscription.guest_name),
+    "email": func.coalesce(User.email, Inscription.guest_email),
+    "phone": func.coalesce(User.phone, Inscription.guest_phone),
+    "user_id": Inscription.user_id,
+    "registration_time": Inscription.registration_time,
+    "checked_in": Inscription.checked_in,
+}
+
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.csv: "text/csv; charset=utf-8",
+    ExportFormat.xlsx: "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+# Início de célula que o Excel/LibreOffice interpretam como fórmula
+CSV_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+def _csv_safe(value):
+    """Neutraliza textos que virariam fórmula ao abrir o CSV numa planilha."""
+    if isinstance(value, str) and value.startswith(CSV_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+def export_filename(event_id: int, format: ExportFormat) -> str:
+    return f"inscritos_evento_{event_id}.{format.value}"
+
+def parse_export_columns(columns: Optional[str]) -> List[str]:
+    """
+    Converte o parâmetro `columns` (separado por vírgulas) na lista de
+    colunas da exportação. Sem parâmetro, exporta todas as colunas.
+    """
+    if not columns:
+        return list(INSCRIPTION_EXPORT_COLUMNS)
+
+    selected = [column.strip() for column in columns.split(",") if column.strip()]
+    invalid = [column for column in selected if column not in INSCRIPTION_EXPORT_COLUMNS]
+
+    if not selected or invalid:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=(
+                f"Colunas inválidas: {', '.join(invalid) or '(nenhuma)'}. "
+                f"Disponíveis: {', '.join(INSCRIPTION_EXPORT_COLUMNS)}."
+            )
+        )
+    return selected
+
+async def _iter_inscription_batches(event_id: int, columns: List[str]) -> AsyncIterator[list]:
+    """
+    Percorre os inscritos de um evento com um cursor no servidor, em lotes.
+    Usa uma sessão própria, que vive enquanto a resposta é transmitida.
+    """
+    query = (
+        select(*(INSCRIPTION_EXPORT_COLUMNS[column] for column in columns))
+        .select_from(Inscription)
+        .outerjoin(User, Inscription.user_id == User.id)
+        .where(Inscription.event_id == event_id)
+        .order_by(Inscription.id)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+
+    async with SessionLocal() as db:
+        result = await db.stream(query)
+        async for partition in result.partitions():
+            yield partition
+
+async def stream_inscriptions_csv(event_id: int, columns: List[str]) -> AsyncIterator[bytes]:
+    """Gera o CSV dos inscritos em fluxo (com BOM, para o Excel reconhecer o UTF-8)."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    buffer.write("\ufeff")
+    writer.writerow(columns)
+    yield buffer.getvalue().encode()
+
+    async for rows in _iter_inscription_batches(event_id, columns):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([_csv_safe(value) for value in row] for row in rows)
+        yield buffer.getvalue().encode()
+
+async def stream_inscriptions_xlsx(event_id: int, columns: List[str]) -> AsyncIterator[bytes]:
+    """Gera a planilha XLSX dos inscritos em fluxo."""
+    writer = XlsxStreamWriter("Inscritos")
+    yield writer.start() + writer.write_row(columns)
+
+    async for rows in _iter_inscription_batches(event_id, columns):
+        yield writer.write_rows(rows)
+
+    yield writer.close()
+
+def stream_inscriptions(event_id: int, columns: List[str], format: ExportFormat) -> AsyncIterator[bytes]:
+    if format == ExportFormat.xlsx:
+        return stream_inscriptions_xlsx(event_id, columns)
+    return stream_inscriptions_csv(event_id, columns)
+
+@job_handler("export_inscriptions", concurrency=2)
+async def run_export_job(payload: dict, job: Job) -> dict:
+    """Tarefa em segundo plano: grava a exportação em um arquivo para download posterior."""
+    format = ExportFormat(payload["format"])
+    name = f"job-{job.id}.{format.value}"
+    size = await write_job_file(
+        name, stream_inscriptions(payload["event_id"], payload["columns"], format)
+    )
+
+    return {
+        "file": name,
+        "filename": export_filename(payload["event_id"], format),
+        "media_type": EXPORT_MEDIA_TYPES[format],
+        "size": size,
+    }
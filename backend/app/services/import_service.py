@@ -0,0 +1,231 @@
+import csv
+import io
+from typing import BinaryIO, List, Tuple
+from email_validator import validate_email, EmailNotValidError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy import func, update
+from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+
+from app.db.base import SessionLocal
+from app.db.dialects import upsert_insert
+from app.db.models.inscription import Inscription
+from app.db.models.event import Event
+from app.db.models.job import Job
+from app.schemas.inscription import ImportRowStatus, InscriptionImportRow, InscriptionImportReport
+from app.services import stats_service
+from app.services.event_service import event_cache
+from app.services.job_service import job_handler, job_input_path
+
+IMPORT_MAX_ROWS = 20000
+IMPORT_BATCH_SIZE = 500
+
+# Nomes de coluna aceitos no cabeçalho do CSV
+_HEADER_ALIASES = {
+    "name": {"name", "nome"},
+    "email": {"email", "e-mail"},
+    "phone": {"phone", "telefone", "celular"},
+}
+
+def _read_guest_rows(file: BinaryIO) -> List[dict]:
+    """
+    Lê o CSV enviado (separado por vírgula, ponto e vírgula ou tab),
+    devolvendo as linhas com as chaves name, email e phone.
+    """
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    try:
+        sample = text.read(4096)
+        text.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+        except csv.Error:
+            dialect = csv.excel
+
+        reader = csv.reader(text, dialect)
+        header = [column.strip().lower() for column in next(reader, [])]
+
+        positions = {}
+        for key, aliases in _HEADER_ALIASES.items():
+            for index, column in enumerate(header):
+                if column in aliases:
+                    positions[key] = index
+                    break
+
+        if "name" not in positions or "email" not in positions:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="O CSV deve ter um cabeçalho com as colunas 'nome' e 'email' (e, opcionalmente, 'telefone')."
+            )
+
+        rows = []
+        for values in reader:
+            if not any(value.strip() for value in values):
+                continue
+            if len(rows) >= IMPORT_MAX_ROWS:
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail=f"O arquivo excede o limite de {IMPORT_MAX_ROWS} linhas."
+                )
+            rows.append({
+                key: values[index].strip() if index < len(values) else ""
+                for key, index in positions.items()
+            })
+        return rows
+    except UnicodeDecodeError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="O arquivo deve estar codificado em UTF-8."
+        )
+    finally:
+        text.detach()
+
+def _parse_guest_file(file: BinaryIO) -> Tuple[List[InscriptionImportRow], list]:
+    """
+    Lê o CSV e valida nomes e e-mails, descartando os repetidos no arquivo.
+    Devolve o relatório das linhas recusadas e as candidatas (linha, dados, e-mail).
+    """
+    rows = _read_guest_rows(file)
+    report: List[InscriptionImportRow] = []
+    candidates = []
+    seen_emails = set()
+
+    # Linha 1 é o cabeçalho
+    for line, row in enumerate(rows, start=2):
+        email = row["email"]
+        if not row["name"]:
+            report.append(InscriptionImportRow(
+                row=line, email=email or None, status=ImportRowStatus.invalid,
+                detail="Nome não informado."
+            ))
+            continue
+        try:
+            email = validate_email(email, check_deliverability=False).normalized.lower()
+        except EmailNotValidError:
+            report.append(InscriptionImportRow(
+                row=line, email=email or None, status=ImportRowStatus.invalid,
+                detail="E-mail inválido."
+            ))
+            continue
+        if email in seen_emails:
+            report.append(InscriptionImportRow(
+                row=line, email=email, status=ImportRowStatus.duplicate,
+                detail="E-mail repetido no arquivo."
+            ))
+            continue
+        seen_emails.add(email)
+        candidates.append((line, row, email))
+    return report, candidates
+
+async def import_guest_inscriptions(
+    db: AsyncSession, event_id: int, file: BinaryIO
+) -> dict:
+    """
+    Importa uma lista de visitantes (CSV) como inscrições de um evento.
+    Valida os e-mails, remove duplicados (no arquivo e já inscritos),
+    respeita max_vacancies e insere em lotes, em uma única transação.
+    Retorna um relatório por linha.
+    """
+    # Leitura e validação de até IMPORT_MAX_ROWS linhas: numa thread, fora do event loop
+    report, candidates = await run_in_threadpool(_parse_guest_file, file)
+
+    # Bloqueia a linha do evento até o fim da transação: inscrições
+    # simultâneas esperam, e as vagas disponíveis não mudam durante a importação
+    result = await db.execute(
+        select(Event.max_vacancies, Event.inscriptions_count)
+        .where(Event.id == event_id)
+        .with_for_update()
+    )
+    event = result.first()
+    if not event:
+        raise HTTPException(status_code=404, detail="Evento não encontrado")
+
+    already_inscribed = set()
+    emails = [email for _, _, email in candidates]
+    for start in range(0, len(emails), IMPORT_BATCH_SIZE):
+        result = await db.execute(
+            select(func.lower(Inscription.guest_email)).where(
+                Inscription.event_id == event_id,
+                func.lower(Inscription.guest_email).in_(emails[start:start + IMPORT_BATCH_SIZE])
+            )
+        )
+        already_inscribed.update(result.scalars().all())
+
+    to_insert = []
+    for line, row, email in candidates:
+        if email in already_inscribed:
+            report.append(InscriptionImportRow(
+                row=line, email=email, status=ImportRowStatus.duplicate,
+                detail="Este e-mail já está inscrito."
+            ))
+        else:
+            to_insert.append((line, row, email))
+
+    if event.max_vacancies and event.max_vacancies > 0:
+        available = max(event.max_vacancies - event.inscriptions_count, 0)
+        for line, _, email in to_insert[available:]:
+            report.append(InscriptionImportRow(
+                row=line, email=email, status=ImportRowStatus.no_vacancy,
+                detail="Vagas esgotadas para este evento."
+            ))
+        to_insert = to_insert[:available]
+
+    inserted = set()
+    # Ignora violações dos índices únicos (inscrições simultâneas do mesmo e-mail)
+    statement = (
+        upsert_insert(db, Inscription)
+        .on_conflict_do_nothing()
+        .returning(Inscription.guest_email)
+    )
+    for start in range(0, len(to_insert), IMPORT_BATCH_SIZE):
+        batch = [
+            {
+                "event_id": event_id,
+                "guest_name": row["name"],
+                "guest_email": email,
+                "guest_phone": row.get("phone") or None,
+                "checked_in": False,
+            }
+            for _, row, email in to_insert[start:start + IMPORT_BATCH_SIZE]
+        ]
+        result = await db.execute(statement, batch)
+        inserted.update(result.scalars().all())
+
+    for line, _, email in to_insert:
+        if email in inserted:
+            report.append(InscriptionImportRow(row=line, email=email, status=ImportRowStatus.created))
+        else:
+            report.append(InscriptionImportRow(
+                row=line, email=email, status=ImportRowStatus.duplicate,
+                detail="Este e-mail já está inscrito."
+            ))
+
+    if inserted:
+        await db.execute(
+            update(Event)
+            .where(Event.id == event_id)
+            .values(inscriptions_count=Event.inscriptions_count + len(inserted))
+            .execution_options(synchronize_session=False)
+        )
+        await stats_service.add_inscriptions(db, event_id, inscriptions=len(inserted))
+    await db.commit()
+    if inserted:
+        await event_cache.invalidate()
+
+    report.sort(key=lambda item: item.row)
+    return {
+        "created": len(inserted),
+        "skipped": len(report) - len(inserted),
+        "rows": report,
+    }
+
+@job_handler("import_inscriptions")
+async def run_import_job(payload: dict, job: Job) -> dict:
+    """
+    Tarefa em segundo plano: importa o CSV salvo no envio. Repetir a tarefa
+    é seguro, pois quem já está inscrito é apenas reportado como duplicado.
+    """
+    async with SessionLocal() as db:
+        with open(job_input_path(payload["input_file"]), "rb") as file:
+            report = await import_guest_inscriptions(db, payload["event_id"], file)
+    return InscriptionImportReport.model_validate(report).model_dump(mode="json")
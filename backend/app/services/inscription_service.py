@@ -1,13 +1,19 @@
+from datetime import datetime, timezone
+from typing import List
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy.orm import selectinload, joinedload
-from sqlalchemy import func
+from sqlalchemy.orm import joinedload
+from sqlalchemy import case, func, literal, update, or_
+from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException, status
 
 from app.db.models.inscription import Inscription
 from app.db.models.event import Event
-from app.db.models.user import User
-from app.schemas.inscription import InscriptionCreate
+from app.db.models.user import User, UserRole
+from app.schemas.inscription import InscriptionCreate, CheckInScan, CheckInStatus
+from app.core.tickets import verify_ticket_code
+from app.services import stats_service
+from app.services.event_service import event_cache
 
 async def create_inscription(
     db: AsyncSession, 
@@ -17,22 +23,11 @@ async def create_inscription(
 ) -> Inscription:
     """
     Realiza a inscrição em um evento, checando vagas e duplicidade.
+    A vaga é reservada com um UPDATE condicional no contador do evento,
+    na mesma transação do INSERT: o bloqueio da linha do evento impede
+    que inscrições simultâneas ultrapassem max_vacancies. Inscrições
+    duplicadas são barradas pelos índices únicos da tabela.
     """
-    query = select(Event).where(Event.id == event_id).options(selectinload(Event.inscriptions))
-    result = await db.execute(query)
-    event = result.scalars().first()
-
-    if not event:
-        raise HTTPException(status_code=404, detail="Evento não encontrado")
-
-    current_count = len(event.inscriptions)
-    
-    if event.max_vacancies > 0 and current_count >= event.max_vacancies:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST, 
-            detail="Vagas esgotadas para este evento."
-        )
-
     user_id = None
     email_to_check = None
 
@@ -43,10 +38,6 @@ async def create_inscription(
     if current_user:
         user_id = current_user.id
         email_to_check = current_user.email
-        
-        final_guest_name = None
-        final_guest_email = None
-        final_guest_phone = None
     else:
         if not inscription_in.guest_email or not inscription_in.guest_name:
             raise HTTPException(
@@ -59,18 +50,45 @@ async def create_inscription(
         final_guest_email = inscription_in.guest_email
         final_guest_phone = inscription_in.guest_phone
 
-    existing_query = select(Inscription).where(
-        Inscription.event_id == event_id
+    if user_id:
+        # Um visitante pode ter se inscrito antes com o e-mail deste usuário
+        # (consulta servida pelo índice uq_event_guest_email)
+        existing_query = (
+            select(Inscription.id)
+            .where(
+                Inscription.event_id == event_id,
+                func.lower(Inscription.guest_email) == email_to_check.lower()
+            )
+            .limit(1)
+        )
+        result = await db.execute(existing_query)
+        if result.first():
+            raise HTTPException(status_code=400, detail="Este e-mail já está inscrito.")
+
+    reserved = await db.execute(
+        update(Event)
+        .where(
+            Event.id == event_id,
+            or_(
+                Event.max_vacancies == None,
+                Event.max_vacancies <= 0,
+                Event.inscriptions_count < Event.max_vacancies
+            )
+        )
+        .values(inscriptions_count=Event.inscriptions_count + 1)
+        .execution_options(synchronize_session=False)
     )
-    
-    result = await db.execute(existing_query)
-    inscriptions = result.scalars().all()
-    
-    for insc in inscriptions:
-        if user_id and insc.user_id == user_id:
-             raise HTTPException(status_code=400, detail="Você já está inscrito neste evento.")
-        if insc.guest_email == email_to_check:
-             raise HTTPException(status_code=400, detail="Este e-mail já está inscrito.")
+
+    if reserved.rowcount == 0:
+        await db.rollback()
+        if not await db.get(Event, event_id):
+            raise HTTPException(status_code=404, detail="Evento não encontrado")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, 
+            detail="Vagas esgotadas para este evento."
+        )
+
+    await stats_service.add_inscriptions(db, event_id, inscriptions=1)
 
     new_inscription = Inscription(
         event_id=event_id,
@@ -80,8 +98,18 @@ async def create_inscription(
         guest_phone=final_guest_phone
     )
 
+    # A duplicidade é garantida pelos índices únicos (uq_event_user e
+    # uq_event_guest_email); o rollback também desfaz a reserva da vaga.
     db.add(new_inscription)
-    await db.commit()
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        if user_id:
+            raise HTTPException(status_code=400, detail="Você já está inscrito neste evento.")
+        raise HTTPException(status_code=400, detail="Este e-mail já está inscrito.")
+    await event_cache.invalidate()
+
     query = (
         select(Inscription)
         .where(Inscription.id == new_inscription.id)
@@ -102,6 +130,51 @@ async def get_event_inscriptions(db: AsyncSession, event_id: int):
     result = await db.execute(query)
     return result.scalars().all()
 
+CHECK_IN_BATCH_SIZE = 500
+
+async def _mark_checked_in(db: AsyncSession, event_id: int, scans: dict) -> List[int]:
+    """
+    Marca o check-in das inscrições {id: horário} do evento com UPDATEs
+    em conjunto, apenas nas que ainda não tinham check-in (repetir a leitura
+    não conta duas vezes, mesmo com scanners simultâneos). Atualiza o
+    contador do evento e os rollups. Retorna os ids efetivamente marcados.
+    """
+    ids = list(scans)
+    marked = []
+    for start in range(0, len(ids), CHECK_IN_BATCH_SIZE):
+        chunk = ids[start:start + CHECK_IN_BATCH_SIZE]
+        result = await db.execute(
+            update(Inscription)
+            .where(
+                Inscription.event_id == event_id,
+                Inscription.id.in_(chunk),
+                or_(Inscription.checked_in == False, Inscription.checked_in == None)
+            )
+            .values(
+                checked_in=True,
+                checked_in_at=case(
+                    {
+                        inscription_id: literal(scans[inscription_id], Inscription.checked_in_at.type)
+                        for inscription_id in chunk
+                    },
+                    value=Inscription.id
+                )
+            )
+            .returning(Inscription.id)
+            .execution_options(synchronize_session=False)
+        )
+        marked += result.scalars().all()
+
+    if marked:
+        await db.execute(
+            update(Event)
+            .where(Event.id == event_id)
+            .values(checked_in_count=Event.checked_in_count + len(marked))
+            .execution_options(synchronize_session=False)
+        )
+        await stats_service.add_inscriptions(db, event_id, checked_in=len(marked))
+    return marked
+
 async def check_in_participant(db: AsyncSession, inscription_id: int):
     """Marca a presença (check-in) de um inscrito."""
     query = (
@@ -117,10 +190,173 @@ async def check_in_participant(db: AsyncSession, inscription_id: int):
             status_code=status.HTTP_404_NOT_FOUND, 
             detail="Inscrição não encontrada"
         )
-        
-    inscription.checked_in = True
+
+    if not inscription.checked_in:
+        marked = await _mark_checked_in(
+            db, inscription.event_id, {inscription.id: datetime.now(timezone.utc)}
+        )
+        await db.commit()
+        if marked:
+            await event_cache.invalidate()
+
+        result = await db.execute(query.execution_options(populate_existing=True))
+        inscription = result.scalars().first()
     
-    db.add(inscription)
+    return inscription
+
+def _scan_time(scan: CheckInScan, now: datetime) -> datetime:
+    # Horários sem fuso são tratados como UTC; horários no futuro viram "agora"
+    scanned_at = scan.scanned_at or now
+    if scanned_at.tzinfo is None:
+        scanned_at = scanned_at.replace(tzinfo=timezone.utc)
+    return min(scanned_at, now)
+
+async def bulk_check_in(db: AsyncSession, event_id: int, scans: List[CheckInScan]) -> dict:
+    """
+    Check-in em lote para a portaria: aplica todas as leituras de uma vez
+    e devolve o status de cada uma. É idempotente (reenviar um lote, por
+    exemplo depois de um scanner ficar offline, não conta ninguém duas
+    vezes) e guarda o horário da leitura informado pelo scanner.
+    Códigos de ingresso são validados pela assinatura, sem consultar o banco.
+    """
+    if not await db.get(Event, event_id):
+        raise HTTPException(status_code=404, detail="Evento não encontrado")
+
+    now = datetime.now(timezone.utc)
+    pending = {}
+    statuses = []
+    for scan in scans:
+        inscription_id = scan.inscription_id
+
+        if scan.code:
+            ticket = verify_ticket_code(scan.code)
+            if ticket is None or (inscription_id is not None and ticket[1] != inscription_id):
+                statuses.append((scan, inscription_id, CheckInStatus.invalid_code))
+                continue
+            inscription_id = ticket[1]
+            if ticket[0] != event_id:
+                statuses.append((scan, inscription_id, CheckInStatus.wrong_event))
+                continue
+
+        if inscription_id in pending:
+            statuses.append((scan, inscription_id, CheckInStatus.duplicate))
+            # Leituras repetidas no mesmo lote ficam com o primeiro horário
+            pending[inscription_id] = min(pending[inscription_id], _scan_time(scan, now))
+        else:
+            statuses.append((scan, inscription_id, None))
+            pending[inscription_id] = _scan_time(scan, now)
+
+    marked = set(await _mark_checked_in(db, event_id, pending))
+
+    # Classifica as leituras que não foram marcadas agora
+    others = [inscription_id for inscription_id in pending if inscription_id not in marked]
+    existing = {}
+    for start in range(0, len(others), CHECK_IN_BATCH_SIZE):
+        result = await db.execute(
+            select(Inscription.id, Inscription.event_id, Inscription.checked_in_at)
+            .where(Inscription.id.in_(others[start:start + CHECK_IN_BATCH_SIZE]))
+        )
+        existing.update({row.id: row for row in result})
+
     await db.commit()
-    
-    return inscription
\ No newline at end of file
+    if marked:
+        await event_cache.invalidate()
+
+    items = []
+    for scan, inscription_id, item_status in statuses:
+        checked_in_at = None
+        if item_status is None:
+            row = existing.get(inscription_id)
+            if inscription_id in marked:
+                item_status, checked_in_at = CheckInStatus.checked_in, pending[inscription_id]
+            elif row is None:
+                item_status = CheckInStatus.not_found
+            elif row.event_id != event_id:
+                item_status = CheckInStatus.wrong_event
+            else:
+                item_status, checked_in_at = CheckInStatus.already_checked_in, row.checked_in_at
+        items.append({
+            "inscription_id": inscription_id,
+            "code": scan.code,
+            "status": item_status,
+            "checked_in_at": checked_in_at
+        })
+
+    return {
+        "checked_in": len(marked),
+        "already_checked_in": sum(item["status"] == CheckInStatus.already_checked_in for item in items),
+        "rejected": sum(
+            item["status"] in (CheckInStatus.not_found, CheckInStatus.wrong_event, CheckInStatus.invalid_code)
+            for item in items
+        ),
+        "items": items,
+    }
+
+async def cancel_inscription(
+    db: AsyncSession, inscription_id: int, current_user: User | None
+):
+    """
+    Cancela uma inscrição, liberando a vaga no evento.
+    O usuário só pode cancelar sua própria inscrição (ou ser admin).
+    """
+    inscription = await db.get(Inscription, inscription_id)
+
+    if not inscription:
+        raise HTTPException(status_code=404, detail="Inscrição não encontrada.")
+
+    if not current_user:
+        raise HTTPException(status_code=401, detail="Autenticação necessária para cancelar.")
+
+    if current_user.id != inscription.user_id and current_user.role != UserRole.admin:
+        raise HTTPException(status_code=403, detail="Sem permissão para cancelar esta inscrição.")
+
+    await db.execute(
+        update(Event)
+        .where(Event.id == inscription.event_id)
+        .values(
+            inscriptions_count=Event.inscriptions_count - 1,
+            checked_in_count=Event.checked_in_count - (1 if inscription.checked_in else 0)
+        )
+    )
+    await stats_service.add_inscriptions(
+        db,
+        inscription.event_id,
+        inscriptions=-1,
+        checked_in=-1 if inscription.checked_in else 0
+    )
+    await db.delete(inscription)
+    await db.commit()
+    await event_cache.invalidate()
+
+async def recount_inscriptions(db: AsyncSession, event_id: int | None = None) -> int:
+    """
+    Recalcula os contadores de inscrições e check-ins a partir da tabela
+    de inscrições. Usado para popular bancos existentes ou corrigir desvios.
+    Os rollups de estatísticas são reconstruídos em seguida.
+    Retorna o número de eventos atualizados.
+    """
+    total = (
+        select(func.count(Inscription.id))
+        .where(Inscription.event_id == Event.id)
+        .scalar_subquery()
+    )
+    checked_in = (
+        select(func.count(Inscription.id))
+        .where(Inscription.event_id == Event.id, Inscription.checked_in == True)
+        .scalar_subquery()
+    )
+
+    query = update(Event).values(inscriptions_count=total, checked_in_count=checked_in)
+
+    if event_id is not None:
+        query = query.where(Event.id == event_id)
+
+    result = await db.execute(query.execution_options(synchronize_session=False))
+    await db.commit()
+    await event_cache.invalidate()
+
+    creator_id = None
+    if event_id is not None:
+        creator_id = await db.scalar(select(Event.creator_id).where(Event.id == event_id))
+    await stats_service.rebuild_rollups(db, creator_id=creator_id)
+    return result.rowcount
\ No newline at end of file
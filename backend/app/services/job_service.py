@@ -0,0 +1,457 @@
+import asyncio
+import logging
+import os
+import socket
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy import delete, update
+from fastapi import HTTPException, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.metrics import job_duration, jobs_finished
+from app.db.base import SessionLocal
+from app.db.models.job import Job, JobStatus
+from app.db.models.user import User, UserRole
+
+logger = logging.getLogger(__name__)
+
+# Tamanho dos blocos copiados dos uploads para a pasta das tarefas
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+JobHandler = Callable[[dict, Job], Awaitable[Optional[dict]]]
+
+@dataclass
+class JobType:
+    handler: JobHandler
+    # Execuções simultâneas deste tipo em cada worker do uvicorn
+    concurrency: int
+    max_attempts: int
+
+JOB_TYPES: Dict[str, JobType] = {}
+
+def job_handler(job_type: str, concurrency: int = 1, max_attempts: int = 3):
+    """
+    Registra a função que executa um tipo de tarefa:
+
+        @job_handler("export_inscriptions", concurrency=2)
+        async def run_export(payload: dict, job: Job) -> dict:
+            ...
+
+    O retorno (um dicionário serializável em JSON) vira o `result` da tarefa.
+    Exceções fazem a tarefa ser tentada de novo, com backoff exponencial, até
+    `max_attempts`; HTTPException é tratada como erro definitivo (dados inválidos).
+    """
+    def decorator(handler: JobHandler) -> JobHandler:
+        JOB_TYPES[job_type] = JobType(handler, concurrency, max_attempts)
+        return handler
+    return decorator
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+def job_file_path(name: str) -> Path:
+    """Caminho de um arquivo na pasta das tarefas (criada se preciso)."""
+    directory = Path(settings.JOB_FILES_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    return directory / name
+
+def job_input_path(name: str) -> Path:
+    """
+    Caminho de um arquivo recebido para a tarefa (ex.: CSV importado).
+    A tarefa roda na instância que a reservar, não necessariamente na que
+    recebeu o envio: sem o arquivo aqui, JOB_FILES_DIR não está compartilhada
+    e a tarefa falha de vez, com o motivo em `error`.
+    """
+    path = job_file_path(name)
+    if not path.is_file():
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=(
+                f"Arquivo de entrada {name} não encontrado em JOB_FILES_DIR no servidor "
+                f"{socket.gethostname()}. Com mais de uma instância, JOB_FILES_DIR precisa "
+                "ser uma pasta compartilhada entre todas."
+            )
+        )
+    return path
+
+async def write_job_file(name: str, chunks: AsyncIterator[bytes]) -> int:
+    """
+    Grava as partes em um arquivo da pasta das tarefas e devolve o tamanho.
+    A abertura e as escritas rodam em threads, fora do event loop.
+    """
+    size = 0
+    file = await run_in_threadpool(open, job_file_path(name), "wb")
+    try:
+        async for chunk in chunks:
+            await run_in_threadpool(file.write, chunk)
+            size += len(chunk)
+    finally:
+        file.close()
+    return size
+
+async def _upload_chunks(upload: UploadFile) -> AsyncIterator[bytes]:
+    while chunk := await upload.read(UPLOAD_CHUNK_SIZE):
+        yield chunk
+
+async def save_job_input(upload: UploadFile, suffix: str = "") -> str:
+    """Copia um arquivo enviado para a pasta das tarefas e devolve o nome gravado."""
+    name = f"input-{uuid.uuid4().hex}{suffix}"
+    await write_job_file(name, _upload_chunks(upload))
+    return name
+
+def _remove_job_input(job: Job):
+    # Entradas (ex.: CSV importado) só são necessárias até a última tentativa
+    name = (job.payload or {}).get("input_file")
+    if name:
+        job_file_path(name).unlink(missing_ok=True)
+
+async def enqueue_job(
+    db: AsyncSession,
+    job_type: str,
+    payload: dict,
+    created_by: Optional[User] = None,
+    delay_seconds: float = 0
+) -> Job:
+    """Enfileira uma tarefa e acorda o worker deste processo."""
+    if job_type not in JOB_TYPES:
+        raise ValueError(f"Tipo de tarefa desconhecido: {job_type}")
+
+    job = Job(
+        job_type=job_type,
+        status=JobStatus.pending,
+        payload=payload,
+        max_attempts=JOB_TYPES[job_type].max_attempts,
+        run_at=_utcnow() + timedelta(seconds=delay_seconds),
+        created_by_id=created_by.id if created_by else None,
+    )
+    db.add(job)
+    await db.commit()
+    job_worker.wake()
+    return job
+
+async def get_job(db: AsyncSession, job_id: int, current_user: User) -> Job:
+    """Busca uma tarefa. Só quem a criou (ou um admin) pode consultá-la."""
+    job = await db.get(Job, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Tarefa não encontrada.")
+    if current_user.id != job.created_by_id and current_user.role != UserRole.admin:
+        raise HTTPException(status_code=403, detail="Sem permissão para acessar esta tarefa.")
+    return job
+
+def get_job_result_file(job: Job) -> dict:
+    """Arquivo gerado por uma tarefa concluída: {"path", "filename", "media_type"}."""
+    if job.status != JobStatus.succeeded:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A tarefa ainda não foi concluída." if job.status in (JobStatus.pending, JobStatus.running)
+            else "A tarefa falhou e não gerou arquivo."
+        )
+
+    result = job.result or {}
+    if not result.get("file"):
+        raise HTTPException(status_code=404, detail="Esta tarefa não gerou arquivo.")
+    path = job_file_path(result["file"])
+    if not path.is_file():
+        logger.error("Arquivo da tarefa %s ausente em %s: %s", job.id, settings.JOB_FILES_DIR, result["file"])
+        raise HTTPException(
+            status_code=404,
+            detail="Arquivo da tarefa não encontrado (removido pela retenção ou gerado em outra instância)."
+        )
+    return {"path": path, "filename": result.get("filename", path.name), "media_type": result.get("media_type")}
+
+def _job_files(payload: Optional[dict], result: Optional[dict]) -> List[str]:
+    names = [(payload or {}).get("input_file"), (result or {}).get("file")]
+    return [name for name in names if name]
+
+async def prune_jobs(db: AsyncSession, older_than_seconds: float) -> Tuple[int, int]:
+    """
+    Apaga as tarefas concluídas ou falhas há mais que `older_than_seconds` e
+    os arquivos da pasta das tarefas que nenhuma tarefa restante usa e são
+    mais antigos que isso (inclui entradas de envios sem tarefa).
+    Retorna (tarefas apagadas, arquivos apagados).
+    """
+    cutoff = _utcnow() - timedelta(seconds=older_than_seconds)
+    deleted = await db.execute(
+        delete(Job).where(
+            Job.status.in_([JobStatus.succeeded, JobStatus.failed]),
+            Job.finished_at < cutoff
+        )
+    )
+    await db.commit()
+
+    result = await db.execute(select(Job.payload, Job.result))
+    referenced = {name for payload, job_result in result.all() for name in _job_files(payload, job_result)}
+
+    removed = 0
+    directory = Path(settings.JOB_FILES_DIR)
+    if directory.is_dir():
+        limit = cutoff.timestamp()
+        for path in directory.iterdir():
+            if not path.is_file() or path.name in referenced or path.stat().st_mtime > limit:
+                continue
+            path.unlink(missing_ok=True)
+            removed += 1
+    return deleted.rowcount, removed
+
+class JobWorker:
+    """
+    Executor das tarefas, rodando no event loop de cada worker do uvicorn
+    (iniciado no lifespan). Reserva tarefas pendentes respeitando o limite de
+    concorrência de cada tipo, mantém o heartbeat das que está executando e
+    devolve à fila as tarefas de workers que pararam de dar sinal de vida.
+    """
+
+    def __init__(self):
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._running: Dict[int, asyncio.Task] = {}
+        self._running_by_type: Dict[str, int] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._loop_task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._completed = 0
+        self._failed = 0
+        self._retried = 0
+
+    def wake(self):
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def start(self):
+        if not settings.JOB_WORKER_ENABLED or self._loop_task is not None:
+            return
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        self._loop_task = asyncio.create_task(self._run(), name="job-worker")
+
+    async def stop(self):
+        """
+        Para de reservar tarefas e interrompe as em execução, devolvendo-as
+        à fila (sem contar a tentativa) para outro worker continuar.
+        """
+        if self._loop_task is None:
+            return
+        self._stopping = True
+        self.wake()
+        await self._loop_task
+        self._loop_task = None
+
+        interrupted = list(self._running)
+        for task in self._running.values():
+            task.cancel()
+        await asyncio.gather(*self._running.values(), return_exceptions=True)
+
+        if interrupted:
+            async with SessionLocal() as db:
+                await db.execute(
+                    update(Job)
+                    .where(Job.id.in_(interrupted), Job.locked_by == self.worker_id, Job.status == JobStatus.running)
+                    .values(status=JobStatus.pending, locked_by=None, attempts=Job.attempts - 1, run_at=_utcnow())
+                )
+                await db.commit()
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self._loop_task is not None,
+            "worker_id": self.worker_id,
+            "running": len(self._running),
+            "running_by_type": dict(self._running_by_type),
+            "completed": self._completed,
+            "failed": self._failed,
+            "retried": self._retried,
+        }
+
+    async def _run(self):
+        last_heartbeat = 0.0
+        last_prune = 0.0
+        while not self._stopping:
+            claimed = []
+            try:
+                if time.monotonic() - last_heartbeat >= settings.JOB_HEARTBEAT_SECONDS:
+                    await self._heartbeat()
+                    await self._recover_stale_jobs()
+                    last_heartbeat = time.monotonic()
+                if settings.JOB_RETENTION_DAYS > 0 and time.monotonic() - last_prune >= settings.JOB_PRUNE_INTERVAL_SECONDS:
+                    last_prune = time.monotonic()
+                    await self._prune()
+                claimed = await self._claim()
+            except Exception:
+                logger.exception("Falha no loop das tarefas em segundo plano")
+
+            for job in claimed:
+                self._running_by_type[job.job_type] = self._running_by_type.get(job.job_type, 0) + 1
+                self._running[job.id] = asyncio.create_task(self._execute(job), name=f"job-{job.id}")
+
+            if claimed:
+                continue
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=settings.JOB_POLL_INTERVAL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _claim(self) -> List[Job]:
+        """
+        Reserva as próximas tarefas com vaga no limite do tipo. O UPDATE
+        condicional (status ainda "pending") garante que cada tarefa fica com
+        um único worker, mesmo com vários processos consultando a tabela.
+        """
+        free = {
+            job_type: definition.concurrency - self._running_by_type.get(job_type, 0)
+            for job_type, definition in JOB_TYPES.items()
+        }
+        free = {job_type: slots for job_type, slots in free.items() if slots > 0}
+        if not free:
+            return []
+
+        now = _utcnow()
+        async with SessionLocal() as db:
+            candidates = await db.execute(
+                select(Job.id, Job.job_type)
+                .where(Job.status == JobStatus.pending, Job.run_at <= now, Job.job_type.in_(free))
+                .order_by(Job.run_at, Job.id)
+                .limit(sum(free.values()))
+            )
+
+            claimed_ids = []
+            for job_id, job_type in candidates.all():
+                if free[job_type] <= 0:
+                    continue
+                result = await db.execute(
+                    update(Job)
+                    .where(Job.id == job_id, Job.status == JobStatus.pending)
+                    .values(
+                        status=JobStatus.running,
+                        locked_by=self.worker_id,
+                        attempts=Job.attempts + 1,
+                        started_at=now,
+                        heartbeat_at=now,
+                    )
+                )
+                if result.rowcount == 1:
+                    free[job_type] -= 1
+                    claimed_ids.append(job_id)
+            await db.commit()
+
+            if not claimed_ids:
+                return []
+            result = await db.execute(select(Job).where(Job.id.in_(claimed_ids)).order_by(Job.id))
+            return list(result.scalars().all())
+
+    async def _execute(self, job: Job):
+        definition = JOB_TYPES[job.job_type]
+        started = time.perf_counter()
+        try:
+            result = await definition.handler(job.payload or {}, job)
+        except asyncio.CancelledError:
+            raise
+        except HTTPException as error:
+            await self._fail(job, str(error.detail))
+        except Exception as error:
+            logger.exception("Tarefa %s (%s) falhou na tentativa %d", job.id, job.job_type, job.attempts)
+            if job.attempts < job.max_attempts:
+                await self._retry(job, f"{type(error).__name__}: {error}")
+            else:
+                await self._fail(job, f"{type(error).__name__}: {error}")
+        else:
+            await self._finish(job, JobStatus.succeeded, result=result, error=None)
+            self._completed += 1
+            jobs_finished.inc(job.job_type, "succeeded")
+        finally:
+            job_duration.observe(time.perf_counter() - started, job.job_type)
+            self._running.pop(job.id, None)
+            self._running_by_type[job.job_type] -= 1
+            self.wake()
+
+    async def _finish(self, job: Job, status_: JobStatus, **values):
+        async with SessionLocal() as db:
+            await db.execute(
+                update(Job)
+                # Se a tarefa foi retomada por outro worker, o resultado deste é descartado
+                .where(Job.id == job.id, Job.locked_by == self.worker_id)
+                .values(status=status_, locked_by=None, finished_at=_utcnow(), **values)
+            )
+            await db.commit()
+        _remove_job_input(job)
+
+    async def _fail(self, job: Job, error: str):
+        await self._finish(job, JobStatus.failed, error=error)
+        self._failed += 1
+        jobs_finished.inc(job.job_type, "failed")
+
+    async def _retry(self, job: Job, error: str):
+        # Backoff exponencial: base, 2x base, 4x base... até o máximo
+        delay = min(
+            settings.JOB_RETRY_BACKOFF_SECONDS * 2 ** (job.attempts - 1),
+            settings.JOB_RETRY_BACKOFF_MAX_SECONDS
+        )
+        async with SessionLocal() as db:
+            await db.execute(
+                update(Job)
+                .where(Job.id == job.id, Job.locked_by == self.worker_id)
+                .values(
+                    status=JobStatus.pending,
+                    locked_by=None,
+                    error=error,
+                    run_at=_utcnow() + timedelta(seconds=delay),
+                )
+            )
+            await db.commit()
+        self._retried += 1
+        jobs_finished.inc(job.job_type, "retried")
+
+    async def _prune(self):
+        async with SessionLocal() as db:
+            jobs, files = await prune_jobs(db, settings.JOB_RETENTION_DAYS * 86400)
+        if jobs or files:
+            logger.info("Retenção das tarefas: %d tarefa(s) e %d arquivo(s) apagados", jobs, files)
+
+    async def _heartbeat(self):
+        if not self._running:
+            return
+        async with SessionLocal() as db:
+            await db.execute(
+                update(Job)
+                .where(Job.id.in_(list(self._running)), Job.locked_by == self.worker_id)
+                .values(heartbeat_at=_utcnow())
+            )
+            await db.commit()
+
+    async def _recover_stale_jobs(self):
+        """
+        Devolve à fila as tarefas "running" cujo worker parou de dar sinal
+        de vida (processo reiniciado ou derrubado); as que já esgotaram as
+        tentativas são marcadas como falhas.
+        """
+        stale = (
+            (Job.status == JobStatus.running)
+            & (Job.heartbeat_at < _utcnow() - timedelta(seconds=settings.JOB_STALE_SECONDS))
+        )
+        async with SessionLocal() as db:
+            requeued = await db.execute(
+                update(Job)
+                .where(stale, Job.attempts < Job.max_attempts)
+                .values(status=JobStatus.pending, locked_by=None, run_at=_utcnow(),
+                        error="Tarefa interrompida (worker parou de responder); executando de novo.")
+            )
+            failed = await db.execute(
+                update(Job)
+                .where(stale, Job.attempts >= Job.max_attempts)
+                .values(status=JobStatus.failed, locked_by=None, finished_at=_utcnow(),
+                        error="Tarefa interrompida (worker parou de responder) na última tentativa.")
+            )
+            await db.commit()
+
+        if requeued.rowcount or failed.rowcount:
+            logger.warning(
+                "Tarefas abandonadas: %d devolvidas à fila, %d marcadas como falhas",
+                requeued.rowcount, failed.rowcount
+            )
+
+job_worker = JobWorker()
@@ -0,0 +1,182 @@
+import logging
+import re
+from pathlib import PurePosixPath
+from typing import AsyncIterator, Optional, Tuple
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+from app.core.file_store import ContentStore
+from app.db.models.event import Event, EventMaterial
+from app.db.models.user import User, UserRole
+from app.services.event_service import event_cache
+
+logger = logging.getLogger(__name__)
+
+material_store = ContentStore(settings.MATERIAL_FILES_DIR)
+
+# tipo/subtipo (tokens da RFC 9110) e o tamanho da coluna EventMaterial.content_type
+_MEDIA_TYPE = re.compile(r"[!#$%&'*+.^_`|~0-9a-z-]+/[!#$%&'*+.^_`|~0-9a-z-]+")
+_PRINTABLE_PARAMETERS = re.compile(r"[\x20-\x7e]*")
+CONTENT_TYPE_MAX_LENGTH = 100
+
+def _clean_filename(filename: str) -> str:
+    # Só o nome, sem pastas (o nome vai para o Content-Disposition do download)
+    name = PurePosixPath(filename.replace("\\", "/")).name.strip()
+    if not name or name in (".", ".."):
+        raise HTTPException(status_code=400, detail="Nome de arquivo inválido.")
+    return name
+
+def _clean_content_type(content_type: Optional[str]) -> str:
+    """
+    Valida o Content-Type enviado, que é gravado no banco e devolvido no
+    download. Tipo inválido ou multipart: 415. Parâmetros (ex.: charset) só
+    são mantidos se forem texto simples e o valor couber na coluna.
+    """
+    if not content_type or not content_type.strip():
+        return "application/octet-stream"
+
+    media_type, _, parameters = content_type.partition(";")
+    media_type = media_type.strip().lower()
+    if media_type.startswith("multipart/"):
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Envie o arquivo direto no corpo da requisição, sem multipart."
+        )
+    if len(media_type) > CONTENT_TYPE_MAX_LENGTH or not _MEDIA_TYPE.fullmatch(media_type):
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Content-Type inválido: informe o tipo do arquivo (ex.: application/pdf)."
+        )
+
+    parameters = parameters.strip()
+    full = f"{media_type}; {parameters}" if parameters else media_type
+    if len(full) <= CONTENT_TYPE_MAX_LENGTH and _PRINTABLE_PARAMETERS.fullmatch(parameters):
+        return full
+    return media_type
+
+async def _get_editable_event(db: AsyncSession, event_id: int, user: User) -> Event:
+    """Mesma regra da edição do evento: só o criador ou um admin."""
+    event = await db.get(Event, event_id)
+    if not event:
+        raise HTTPException(status_code=404, detail="Evento não encontrado")
+    if event.creator_id != user.id and user.role != UserRole.admin:
+        raise HTTPException(status_code=403, detail="Sem permissão para editar")
+    return event
+
+async def _touch_event(db: AsyncSession, event_id: int):
+    # Os materiais fazem parte da resposta do evento: muda a versão (ETag) e o updated_at
+    await db.execute(
+        update(Event)
+        .where(Event.id == event_id)
+        .values(version=Event.version + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+async def upload_material(
+    db: AsyncSession,
+    event_id: int,
+    user: User,
+    filename: str,
+    title: Optional[str],
+    content_type: Optional[str],
+    content_length: Optional[int],
+    chunks: AsyncIterator[bytes]
+) -> EventMaterial:
+    """
+    Grava em disco, em partes, o arquivo enviado no corpo da requisição e o
+    registra como material do evento. Arquivos iguais (mesmo SHA-256) são
+    armazenados uma vez só, mesmo em eventos diferentes.
+    """
+    filename = _clean_filename(filename)
+    content_type = _clean_content_type(content_type)
+    await _get_editable_event(db, event_id, user)
+
+    # Recusa antes de ler o corpo quando o tamanho declarado já passa do limite
+    if content_length is not None and settings.MATERIAL_MAX_BYTES and content_length > settings.MATERIAL_MAX_BYTES:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"O arquivo excede o limite de {settings.MATERIAL_MAX_BYTES} bytes."
+        )
+
+    # Devolve a conexão ao pool enquanto o corpo é recebido (pode levar minutos)
+    await db.rollback()
+
+    stored = await material_store.save(chunks, max_bytes=settings.MATERIAL_MAX_BYTES)
+
+    material = EventMaterial(
+        event_id=event_id,
+        title=title or filename,
+        url_or_filename=filename,
+        content_sha256=stored.sha256,
+        size_bytes=stored.size,
+        content_type=content_type,
+    )
+    db.add(material)
+    await _touch_event(db, event_id)
+    await db.commit()
+    await event_cache.invalidate()
+    return material
+
+async def get_material_file(
+    db: AsyncSession, event_id: int, material_id: int, user: Optional[User]
+) -> Tuple[EventMaterial, bool]:
+    """
+    Busca o material com arquivo para download, com a mesma visibilidade do
+    evento. Retorna o material e se o evento é público.
+    """
+    result = await db.execute(
+        select(EventMaterial, Event.is_public)
+        .join(Event, EventMaterial.event_id == Event.id)
+        .where(EventMaterial.id == material_id, EventMaterial.event_id == event_id)
+    )
+    row = result.first()
+
+    if not row:
+        raise HTTPException(status_code=404, detail="Material não encontrado")
+
+    material, is_public = row
+    if not is_public and (not user or user.role not in [UserRole.admin, UserRole.organizer]):
+        raise HTTPException(status_code=404, detail="Material não encontrado")
+
+    if material.content_sha256 is None:
+        raise HTTPException(status_code=404, detail="Este material é um link, sem arquivo para baixar.")
+
+    if not material_store.path(material.content_sha256).is_file():
+        logger.error("Arquivo do material %s ausente: %s", material.id, material.content_sha256)
+        raise HTTPException(status_code=404, detail="Arquivo do material não encontrado.")
+
+    # O download pode demorar: devolve a conexão ao pool antes de transmitir
+    db.expunge(material)
+    await db.rollback()
+    return material, is_public
+
+async def delete_material(db: AsyncSession, event_id: int, material_id: int, user: User):
+    """
+    Remove um material (link ou arquivo). O arquivo pode ser usado por outros
+    materiais e fica no disco até a limpeza (prune_material_files).
+    """
+    await _get_editable_event(db, event_id, user)
+
+    material = await db.get(EventMaterial, material_id)
+    if not material or material.event_id != event_id:
+        raise HTTPException(status_code=404, detail="Material não encontrado")
+
+    await db.delete(material)
+    await _touch_event(db, event_id)
+    await db.commit()
+    await event_cache.invalidate()
+
+async def prune_material_files(db: AsyncSession, older_than_seconds: float = 3600) -> Tuple[int, int]:
+    """
+    Apaga os arquivos que nenhum material usa mais (materiais ou eventos
+    removidos). Retorna (arquivos apagados, bytes liberados).
+    """
+    result = await db.execute(
+        select(EventMaterial.content_sha256).where(EventMaterial.content_sha256.is_not(None)).distinct()
+    )
+    referenced = set(result.scalars().all())
+    # A margem protege os arquivos de envios cujo material ainda não foi gravado
+    return material_store.remove_unreferenced(referenced, older_than_seconds)
@@ -0,0 +1,166 @@
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy import case, delete, func, literal, update
+from sqlalchemy.sql import tuple_
+from fastapi import HTTPException, status
+
+from app.core.pagination import encode_cursor, decode_cursor
+from app.db.dialects import upsert_insert
+from app.db.models.event import Event
+from app.db.models.rating import Rating, EventRatingStats
+from app.db.models.user import User
+from app.schemas.rating import RatingCreate
+
+_HISTOGRAM_COLUMNS = {score: f"count_{score}" for score in range(1, 6)}
+
+def _stats_values(rating):
+    """Colunas do agregado para uma avaliação (valor fixo ou coluna de Rating)."""
+    values = {
+        "ratings_count": literal(1) if isinstance(rating, int) else func.count(),
+        "ratings_sum": literal(rating) if isinstance(rating, int) else func.sum(rating),
+    }
+    for score, column in _HISTOGRAM_COLUMNS.items():
+        if isinstance(rating, int):
+            values[column] = literal(1 if rating == score else 0)
+        else:
+            values[column] = func.sum(case((rating == score, 1), else_=0))
+    return values
+
+async def create_rating(db: AsyncSession, rating_in: RatingCreate, current_user: User) -> Rating:
+    """
+    Cria uma avaliação (uma por usuário em cada evento) e atualiza,
+    na mesma transação, o agregado de avaliações do evento.
+    """
+    if rating_in.user_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Você não pode avaliar em nome de outro usuário.")
+
+    if not await db.get(Event, rating_in.event_id):
+        raise HTTPException(status_code=404, detail="Evento não encontrado")
+
+    new_rating = Rating(
+        event_id=rating_in.event_id,
+        user_id=rating_in.user_id,
+        rating=rating_in.rating,
+        comment=rating_in.comment
+    )
+    db.add(new_rating)
+
+    try:
+        await db.flush()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="Você já avaliou este evento.")
+
+    values = _stats_values(rating_in.rating)
+    statement = upsert_insert(db, EventRatingStats).values(event_id=rating_in.event_id, **values)
+    statement = statement.on_conflict_do_update(
+        index_elements=["event_id"],
+        set_={
+            column: getattr(EventRatingStats, column) + getattr(statement.excluded, column)
+            for column in values
+        }
+    )
+    await db.execute(statement)
+
+    await db.commit()
+    await db.refresh(new_rating)
+    return new_rating
+
+async def get_event_ratings(db: AsyncSession, event_id: int) -> List[Rating]:
+    """Lista todas as avaliações de um evento (mais recentes primeiro)."""
+    result = await db.execute(
+        select(Rating)
+        .where(Rating.event_id == event_id)
+        .order_by(Rating.created_at.desc(), Rating.id.desc())
+    )
+    return result.scalars().all()
+
+async def get_rating_summary(db: AsyncSession, event_id: int) -> dict:
+    """Retorna quantidade, média e histograma (1–5) a partir do agregado."""
+    stats = await db.get(EventRatingStats, event_id)
+
+    count = stats.ratings_count if stats else 0
+    return {
+        "event_id": event_id,
+        "count": count,
+        "average": round(stats.ratings_sum / count, 2) if count else None,
+        "histogram": {
+            score: getattr(stats, column) if stats else 0
+            for score, column in _HISTOGRAM_COLUMNS.items()
+        },
+    }
+
+async def get_rating_feed(
+    db: AsyncSession,
+    event_id: int,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    only_comments: bool = True
+) -> dict:
+    """
+    Feed paginado por cursor das avaliações de um evento, das mais
+    recentes para as mais antigas, sobre (created_at, id).
+    """
+    query = select(Rating).where(Rating.event_id == event_id)
+
+    if only_comments:
+        query = query.where(Rating.comment != None, Rating.comment != "")
+
+    if cursor:
+        created_at, rating_id = decode_cursor(cursor, size=2)
+        try:
+            last_key = tuple_(datetime.fromisoformat(created_at), int(rating_id))
+        except (TypeError, ValueError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cursor de paginação inválido."
+            )
+        query = query.where(tuple_(Rating.created_at, Rating.id) < last_key)
+
+    query = query.order_by(Rating.created_at.desc(), Rating.id.desc()).limit(limit + 1)
+    result = await db.execute(query)
+    ratings = result.scalars().all()
+
+    next_cursor = None
+    if len(ratings) > limit:
+        ratings = ratings[:limit]
+        next_cursor = encode_cursor(ratings[-1].created_at, ratings[-1].id)
+
+    return {"items": ratings, "next_cursor": next_cursor}
+
+async def rebuild_rating_stats(db: AsyncSession):
+    """Recalcula os agregados de avaliações de todos os eventos."""
+    await db.execute(delete(EventRatingStats))
+
+    values = _stats_values(Rating.rating)
+    source = select(Rating.event_id, *values.values()).group_by(Rating.event_id)
+    await db.execute(
+        upsert_insert(db, EventRatingStats).from_select(["event_id", *values], source)
+    )
+    await db.commit()
+
+async def remove_user_ratings(db: AsyncSession, user_id: int):
+    """
+    Apaga as avaliações de um usuário que será excluído, retirando-as antes
+    dos agregados dos eventos (quantidade, soma e histograma). Não faz commit.
+    """
+    values = _stats_values(Rating.rating)
+    removed = (
+        select(Rating.event_id, *(value.label(column) for column, value in values.items()))
+        .where(Rating.user_id == user_id)
+        .group_by(Rating.event_id)
+        .subquery()
+    )
+    await db.execute(
+        update(EventRatingStats)
+        .where(EventRatingStats.event_id == removed.c.event_id)
+        .values({
+            column: getattr(EventRatingStats, column) - removed.c[column]
+            for column in values
+        })
+        .execution_options(synchronize_session=False)
+    )
+    await db.execute(delete(Rating).where(Rating.user_id == user_id))
@@ -0,0 +1,135 @@
+import re
+from typing import List, Optional
+from sqlalchemy import Float, Integer, text
+from sqlalchemy.ext.asyncio import AsyncSession, AsyncConnection
+from sqlalchemy.future import select
+from sqlalchemy.orm import selectinload
+from sqlalchemy.sql import func, or_, literal_column
+from fastapi import HTTPException, status
+
+from app.db.models.event import (
+    Event,
+    EventType,
+    POSTGRESQL_SEARCH_DDL,
+    SQLITE_SEARCH_DDL,
+    SEARCH_INDEXES,
+    event_search_vector,
+    unaccented,
+)
+from app.db.models.user import User, UserRole
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+# No SQLite, o bm25 só é calculado para os N casamentos mais recentes: termos
+# comuns (um prefixo curto) casam com boa parte da tabela, e ordenar todos
+# custava dezenas de ms em 100 mil eventos
+SQLITE_SEARCH_CANDIDATES = 1000
+
+def _tokens(query: str) -> List[str]:
+    tokens = _TOKEN.findall(query.lower())
+    if not tokens:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Informe ao menos uma palavra para a busca."
+        )
+    return tokens
+
+def _postgresql_search(query: str, tokens: List[str]):
+    # Todas as palavras são obrigatórias e a última vale como prefixo (digitação em andamento)
+    ts_query = func.to_tsquery(
+        literal_column("'portuguese'"),
+        func.immutable_unaccent(" & ".join(tokens[:-1] + [f"{tokens[-1]}:*"]))
+    )
+    vector = event_search_vector()
+    title_similarity = func.similarity(unaccented(Event.title), unaccented(query))
+
+    return (
+        select(Event)
+        .where(or_(
+            vector.op("@@")(ts_query),
+            # Busca aproximada no título (erros de digitação), via pg_trgm
+            unaccented(Event.title).op("%")(unaccented(query))
+        ))
+        .order_by(
+            func.greatest(func.ts_rank(vector, ts_query), title_similarity).desc(),
+            Event.start_time.desc()
+        )
+    )
+
+def _sqlite_search(tokens: List[str]):
+    # Sintaxe do FTS5: termos entre aspas, o último como prefixo
+    match = " ".join(f'"{token}"' for token in tokens[:-1]) + f' "{tokens[-1]}"*'
+    # ORDER BY rowid (o id do evento) com LIMIT para a leitura do índice no
+    # N-ésimo casamento, sem percorrer os demais
+    matches = (
+        text(
+            "SELECT rowid AS id, bm25(events_fts, 10.0, 1.0, 5.0, 5.0) AS score "
+            "FROM events_fts WHERE events_fts MATCH :match "
+            "ORDER BY rowid DESC LIMIT :candidates"
+        )
+        .bindparams(match=match.strip(), candidates=SQLITE_SEARCH_CANDIDATES)
+        .columns(id=Integer, score=Float)
+        .subquery()
+    )
+    # No bm25 do SQLite, quanto menor o valor, mais relevante
+    return (
+        select(Event)
+        .join(matches, matches.c.id == Event.id)
+        .order_by(matches.c.score, Event.start_time.desc())
+    )
+
+async def search_events(
+    db: AsyncSession,
+    user: Optional[User],
+    query: str,
+    event_type: Optional[EventType] = None,
+    limit: int = 20
+) -> List[Event]:
+    """
+    Busca eventos por título, descrição, host e local, ordenados por relevância.
+    Ignora acentos e trata a última palavra como prefixo. No PostgreSQL também
+    encontra títulos parecidos (trigramas); no SQLite usa o índice FTS5 e
+    ordena por relevância os SQLITE_SEARCH_CANDIDATES casamentos mais recentes.
+    """
+    tokens = _tokens(query)
+
+    if db.bind.dialect.name == "postgresql":
+        statement = _postgresql_search(query, tokens)
+    elif db.bind.dialect.name == "sqlite":
+        statement = _sqlite_search(tokens)
+    else:
+        pattern = f"%{tokens[0]}%"
+        statement = select(Event).where(or_(
+            Event.title.ilike(pattern),
+            Event.description.ilike(pattern),
+            Event.host.ilike(pattern),
+            Event.location.ilike(pattern)
+        )).order_by(Event.start_time.desc())
+
+    statement = statement.options(selectinload(Event.materials))
+
+    if not user or user.role == UserRole.participant:
+        statement = statement.where(Event.is_public == True)
+
+    if event_type:
+        statement = statement.where(Event.event_type == event_type)
+
+    result = await db.execute(statement.limit(limit))
+    return result.scalars().all()
+
+async def ensure_search_index(conn: AsyncConnection):
+    """
+    Cria as estruturas da busca em um banco já existente (extensões e índices
+    no PostgreSQL; tabela FTS5 e triggers no SQLite) e reconstrói o índice FTS5.
+    """
+    dialect = conn.dialect.name
+
+    if dialect == "postgresql":
+        for statement in POSTGRESQL_SEARCH_DDL:
+            await conn.execute(text(statement))
+        for index in SEARCH_INDEXES:
+            await conn.run_sync(lambda sync_conn: index.create(sync_conn, checkfirst=True))
+    elif dialect == "sqlite":
+        for statement in SQLITE_SEARCH_DDL:
+            await conn.execute(text(statement))
+        await conn.execute(text("INSERT INTO events_fts(events_fts) VALUES ('rebuild')"))
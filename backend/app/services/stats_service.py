@@ -0,0 +1,145 @@
+from collections import defaultdict
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy import delete, literal, literal_column
+from sqlalchemy.sql import func
+
+from app.db.dialects import upsert_insert
+from app.db.models.event import Event
+from app.db.models.inscription import Inscription
+from app.db.models.stats import EventStatsRollup
+
+_KEY_COLUMNS = ["creator_id", "event_type", "month", "host"]
+_COUNT_COLUMNS = ["events_count", "inscriptions_count", "checked_in_count"]
+
+def _month(db: AsyncSession):
+    """Mês (AAAA-MM, em UTC) do início do evento, calculado no banco."""
+    # Literais (e não parâmetros), para a expressão ser a mesma no SELECT e no GROUP BY
+    if db.bind.dialect.name == "postgresql":
+        return func.to_char(
+            func.timezone(literal_column("'UTC'"), Event.start_time), literal_column("'YYYY-MM'")
+        )
+    return func.strftime(literal_column("'%Y-%m'"), Event.start_time)
+
+def _delta(value):
+    return literal(value) if isinstance(value, int) else value
+
+async def _apply(db: AsyncSession, where, events=0, inscriptions=0, checked_in=0):
+    """
+    Soma deltas às linhas de rollup dos eventos selecionados por `where`,
+    em um único INSERT ... SELECT ... ON CONFLICT DO UPDATE. Os deltas podem
+    ser inteiros ou expressões sobre as colunas de Event.
+
+    Ordem dos bloqueios: quem chama já deve ter bloqueado as linhas dos
+    eventos (UPDATE ou SELECT ... FOR UPDATE) e só então mexer nos rollups,
+    que ficam para o fim da transação. Na ordem inversa, uma edição de
+    evento e uma inscrição simultâneas podem entrar em deadlock.
+    """
+    month = _month(db)
+    host = func.coalesce(Event.host, literal_column("''"))
+    source = (
+        select(
+            Event.creator_id,
+            Event.event_type,
+            month,
+            host,
+            func.sum(_delta(events)),
+            func.sum(_delta(inscriptions)),
+            func.sum(_delta(checked_in)),
+        )
+        .where(where, Event.creator_id != None)
+        .group_by(Event.creator_id, Event.event_type, month, host)
+    )
+
+    statement = upsert_insert(db, EventStatsRollup).from_select(_KEY_COLUMNS + _COUNT_COLUMNS, source)
+    statement = statement.on_conflict_do_update(
+        index_elements=_KEY_COLUMNS,
+        set_={
+            column: getattr(EventStatsRollup, column) + getattr(statement.excluded, column)
+            for column in _COUNT_COLUMNS
+        }
+    )
+    await db.execute(statement)
+
+async def add_events(db: AsyncSession, where):
+    """Inclui nos rollups os eventos selecionados (com seus contadores atuais)."""
+    await _apply(db, where, 1, Event.inscriptions_count, Event.checked_in_count)
+
+async def remove_events(db: AsyncSession, where):
+    """Retira dos rollups os eventos selecionados (antes de apagá-los ou movê-los de chave)."""
+    await _apply(db, where, -1, -Event.inscriptions_count, -Event.checked_in_count)
+
+async def add_inscriptions(db: AsyncSession, event_id: int, inscriptions: int = 0, checked_in: int = 0):
+    """Registra inscrições/check-ins (positivos ou negativos) de um evento."""
+    await _apply(db, Event.id == event_id, 0, inscriptions, checked_in)
+
+async def remove_user_inscriptions(db: AsyncSession, user_id: int):
+    """Retira dos rollups as inscrições de um usuário que será excluído."""
+    user_inscriptions = select(func.count(Inscription.id)).where(
+        Inscription.event_id == Event.id, Inscription.user_id == user_id
+    )
+    await _apply(
+        db,
+        Event.id.in_(select(Inscription.event_id).where(Inscription.user_id == user_id)),
+        0,
+        -user_inscriptions.scalar_subquery(),
+        -user_inscriptions.where(Inscription.checked_in == True).scalar_subquery(),
+    )
+
+async def rebuild_rollups(db: AsyncSession, creator_id: int | None = None):
+    """Recalcula os rollups a partir da tabela de eventos (todos ou de um organizador)."""
+    clear = delete(EventStatsRollup)
+    where = Event.id != None
+    if creator_id is not None:
+        clear = clear.where(EventStatsRollup.creator_id == creator_id)
+        where = Event.creator_id == creator_id
+
+    await db.execute(clear)
+    await add_events(db, where)
+    await db.commit()
+
+async def get_dashboard_stats(db: AsyncSession, user_id: int) -> dict:
+    """
+    Estatísticas do organizador (RF26) a partir dos rollups, em uma única
+    leitura pela chave primária: totais e quebras por tipo, mês e host.
+    """
+    result = await db.execute(
+        select(EventStatsRollup).where(EventStatsRollup.creator_id == user_id)
+    )
+    rollups = result.scalars().all()
+
+    totals = {column: 0 for column in _COUNT_COLUMNS}
+    breakdowns = {"event_type": defaultdict(dict), "month": defaultdict(dict), "host": defaultdict(dict)}
+
+    for rollup in rollups:
+        keys = {
+            "event_type": rollup.event_type.value,
+            "month": rollup.month,
+            "host": rollup.host or None,
+        }
+        for column in _COUNT_COLUMNS:
+            value = getattr(rollup, column)
+            totals[column] += value
+            for dimension, key in keys.items():
+                entry = breakdowns[dimension][key]
+                entry[column] = entry.get(column, 0) + value
+
+    def as_list(dimension: str):
+        return [
+            {"key": key, "events": entry["events_count"], "inscriptions": entry["inscriptions_count"],
+             "checked_in": entry["checked_in_count"]}
+            for key, entry in breakdowns[dimension].items()
+            if entry["events_count"] > 0
+        ]
+
+    by_month = sorted(as_list("month"), key=lambda item: item["key"])
+    by_host = sorted(as_list("host"), key=lambda item: -item["inscriptions"])
+
+    return {
+        "total_events": totals["events_count"],
+        "total_inscriptions": totals["inscriptions_count"],
+        "total_checked_in": totals["checked_in_count"],
+        "by_type": as_list("event_type"),
+        "by_month": by_month,
+        "by_host": by_host,
+    }
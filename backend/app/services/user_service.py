@@ -1,11 +1,25 @@
 from typing import List
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy import func, update
 from app.db.models.user import User
+from app.db.models.event import Event
+from app.db.models.inscription import Inscription
 from app.schemas.user import UserCreate, UserUpdate
 from app.core.security import get_password_hash
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.services import rating_service, stats_service
+from app.services.event_service import event_cache
 from fastapi import HTTPException, status
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import selectinload, make_transient_to_detached
+
+# Usuários autenticados já resolvidos, indexados pelo e-mail (subject do token).
+# O cache é por processo: update_user e delete_user invalidam a entrada local
+# e o TTL limita por quanto tempo outros workers podem ver dados antigos.
+principal_cache = TTLCache(
+    maxsize=settings.AUTH_CACHE_MAX_SIZE, ttl=settings.AUTH_CACHE_TTL_SECONDS
+)
 
 async def create_user(db: AsyncSession, user_in: UserCreate) -> User:
     """
@@ -21,7 +35,7 @@ async def create_user(db: AsyncSession, user_in: UserCreate) -> User:
             detail="Este e-mail já está cadastrado."
         )
 
-    hashed_password = get_password_hash(user_in.password)
+    hashed_password = await get_password_hash(user_in.password)
 
     new_user = User(
         email=user_in.email,
@@ -43,6 +57,25 @@ async def get_user_by_email(db: AsyncSession, email: str) -> User | None:
     result = await db.execute(query)
     return result.scalars().first()
 
+async def get_principal(db: AsyncSession, email: str) -> User | None:
+    """
+    Busca o usuário autenticado pelo e-mail do token, usando o cache de
+    usuários. Em um acerto não há consulta ao banco: a cópia em cache é
+    anexada à sessão atual com merge(load=False).
+    """
+    cached = principal_cache.get(email)
+    if cached is not None:
+        return await db.merge(cached, load=False)
+
+    user = await get_user_by_email(db, email=email)
+    if user is not None and principal_cache.enabled:
+        snapshot = User(**{
+            column.key: getattr(user, column.key) for column in User.__table__.columns
+        })
+        make_transient_to_detached(snapshot)
+        principal_cache.set(email, snapshot)
+    return user
+
 async def get_all_users(db: AsyncSession) -> List[User]:
     """Busca todos os usuários do banco."""
     query = select(User)
@@ -60,9 +93,10 @@ async def update_user(
         )
 
     update_data = user_in.model_dump(exclude_unset=True)
+    previous_email = user.email
 
     if "password" in update_data:
-        hashed_password = get_password_hash(update_data["password"])
+        hashed_password = await get_password_hash(update_data["password"])
         del update_data["password"]
         user.hashed_password = hashed_password
 
@@ -71,17 +105,39 @@ async def update_user(
 
     db.add(user)
     await db.commit()
+    principal_cache.invalidate(previous_email)
+    principal_cache.invalidate(user.email)
     await db.refresh(user)
     return user
 
 async def delete_user(db: AsyncSession, user_id: int):
-    """Deleta um usuário (e suas inscrições via cascade)."""
+    """Deleta um usuário (e suas inscrições via cascade, e avaliações)."""
     user = await db.get(User, user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Usuário não encontrado"
         )
-        
+
+    # Libera nos contadores dos eventos (e depois nos rollups) as vagas das inscrições removidas
+    user_inscriptions = select(func.count(Inscription.id)).where(
+        Inscription.event_id == Event.id, Inscription.user_id == user_id
+    )
+    await db.execute(
+        update(Event)
+        .where(Event.id.in_(select(Inscription.event_id).where(Inscription.user_id == user_id)))
+        .values(
+            inscriptions_count=Event.inscriptions_count - user_inscriptions.scalar_subquery(),
+            checked_in_count=Event.checked_in_count - user_inscriptions.where(
+                Inscription.checked_in == True
+            ).scalar_subquery()
+        )
+        .execution_options(synchronize_session=False)
+    )
+    await stats_service.remove_user_inscriptions(db, user_id)
+    await rating_service.remove_user_ratings(db, user_id)
+
     await db.delete(user)
     await db.commit()
+    principal_cache.invalidate(user.email)
+    await event_cache.invalidate()
     return
\ No newline at end of file
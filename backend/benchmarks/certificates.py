@@ -0,0 +1,106 @@
+"""
+Benchmark da geração de certificados.
+
+Cria um evento com N participantes com check-in em um SQLite temporário e
+mede a geração do ZIP completo (o mesmo fluxo de GET /events/{id}/certificates)
+com diferentes quantidades de processos no pool. Não precisa da API rodando.
+
+Uso (estando na pasta /backend):
+    python benchmarks/certificates.py --attendees 2000 --workers 1 2 4
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--attendees", type=int, default=2000, help="Participantes com check-in.")
+    parser.add_argument(
+        "--workers", type=int, nargs="+", default=[1, os.cpu_count() or 1],
+        help="Quantidades de processos a comparar."
+    )
+    return parser.parse_args()
+
+async def create_event(attendees: int) -> int:
+    from sqlalchemy import insert
+
+    from app.db.base import SessionLocal
+    from app.db.migrations import upgrade_schema
+    from app.db.models.event import Event, EventType
+    from app.db.models.inscription import Inscription
+
+    await upgrade_schema()
+    start = datetime(2025, 3, 10, 14, tzinfo=timezone.utc)
+    async with SessionLocal() as db:
+        event_id = await db.scalar(insert(Event).values(
+            title="Oficina de Introdução à Programação", event_type=EventType.oficina,
+            start_time=start, end_time=start + timedelta(hours=3), location="Auditório",
+            host="Profa. Ana Souza", max_vacancies=0, is_public=True,
+            inscriptions_count=attendees, checked_in_count=attendees,
+        ).returning(Event.id))
+        await db.execute(insert(Inscription), [{
+            "event_id": event_id, "guest_name": f"Participante Número {n}",
+            "guest_email": f"participante{n}@example.com", "checked_in": True,
+        } for n in range(attendees)])
+        await db.commit()
+    return event_id
+
+async def build_zip(event_id: int) -> tuple:
+    from app.db.base import SessionLocal
+    from app.db.models.event import Event
+    from app.services import certificate_service
+
+    async with SessionLocal() as db:
+        event = await db.get(Event, event_id)
+
+    started = time.perf_counter()
+    size, first_chunk = 0, None
+    async for chunk in certificate_service.stream_certificates_zip(event):
+        if first_chunk is None and chunk:
+            first_chunk = time.perf_counter() - started
+        size += len(chunk)
+    return time.perf_counter() - started, first_chunk, size
+
+async def run(args, event_id: int):
+    from app.core.config import settings
+    from app.services import certificate_service
+
+    print(f"{args.attendees} certificados")
+    print(f"{'processos':>9} | {'total (s)':>9} | {'1º byte (s)':>11} | {'cert/s':>8} | {'ZIP (MB)':>8}")
+    for workers in args.workers:
+        settings.CERTIFICATE_WORKERS = workers
+        certificate_service.shutdown_certificate_pool()
+        # Sobe o pool antes de medir (custo único por worker do uvicorn)
+        await asyncio.gather(*(certificate_service._render({}, []) for _ in range(workers)))
+
+        elapsed, first_chunk, size = await build_zip(event_id)
+        print(
+            f"{workers:>9} | {elapsed:>9.2f} | {first_chunk or 0:>11.3f} | "
+            f"{args.attendees / elapsed:>8.0f} | {size / 1e6:>8.2f}"
+        )
+    certificate_service.shutdown_certificate_pool()
+
+def main():
+    args = parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{directory}/certificates.db"
+        sys.path.insert(0, str(BACKEND_DIR))
+        os.chdir(BACKEND_DIR)
+
+        async def bench():
+            from app.db.base import engine
+            event_id = await create_event(args.attendees)
+            await run(args, event_id)
+            await engine.dispose()
+
+        asyncio.run(bench())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Teste de estresse de inscrições simultâneas.
+
+Cria um evento com poucas vagas e dispara centenas de
+POST /events/{id}/inscribe em paralelo (como visitantes), verificando
+que nenhuma vaga foi vendida a mais e reportando a vazão.
+
+Uso (com a API rodando e um usuário organizador/admin já criado):
+    python benchmarks/inscription_rush.py --email admin@sistema.com --password senhaforte123
+"""
+import argparse
+import json
+import sys
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+def request(method: str, url: str, body: dict | None = None, token: str | None = None, form: bool = False):
+    headers = {}
+    data = None
+    if body is not None:
+        if form:
+            data = urllib.parse.urlencode(body).encode()
+            headers["Content-Type"] = "application/x-www-form-urlencoded"
+        else:
+            data = json.dumps(body).encode()
+            headers["Content-Type"] = "application/json"
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+
+    req = urllib.request.Request(url, data=data, headers=headers, method=method)
+    try:
+        with urllib.request.urlopen(req, timeout=60) as response:
+            return response.status, json.loads(response.read() or b"null")
+    except urllib.error.HTTPError as error:
+        return error.code, json.loads(error.read() or b"null")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--email", required=True, help="E-mail de um organizador/admin.")
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--requests", type=int, default=500, help="Total de inscrições disparadas.")
+    parser.add_argument("--concurrency", type=int, default=100, help="Requisições em paralelo.")
+    parser.add_argument("--vacancies", type=int, default=50, help="Vagas do evento criado.")
+    args = parser.parse_args()
+
+    status, body = request(
+        "POST", f"{args.base_url}/token",
+        {"username": args.email, "password": args.password}, form=True
+    )
+    if status != 200:
+        sys.exit(f"Falha no login ({status}): {body}")
+    token = body["access_token"]
+
+    run_id = uuid.uuid4().hex[:8]
+    start = datetime.now(timezone.utc) + timedelta(days=365)
+    status, event = request("POST", f"{args.base_url}/events", {
+        "title": f"Estresse de inscrições {run_id}",
+        "event_type": "palestra",
+        "start_time": start.isoformat(),
+        "end_time": (start + timedelta(hours=1)).isoformat(),
+        "location": f"Sala de estresse {run_id}",
+        "host": f"Benchmark {run_id}",
+        "max_vacancies": args.vacancies,
+    }, token=token)
+    if status != 201:
+        sys.exit(f"Falha ao criar o evento ({status}): {event}")
+
+    def inscribe(i: int) -> int:
+        status, _ = request("POST", f"{args.base_url}/events/{event['id']}/inscribe", {
+            "guest_name": f"Visitante {i}",
+            "guest_email": f"visitante{i}-{run_id}@example.com",
+        })
+        return status
+
+    began = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        statuses = list(pool.map(inscribe, range(args.requests)))
+    elapsed = time.perf_counter() - began
+
+    accepted = statuses.count(201)
+    rejected = statuses.count(400)
+    errors = len(statuses) - accepted - rejected
+
+    _, final_event = request("GET", f"{args.base_url}/events/{event['id']}", token=token)
+    count = final_event["inscriptions_count"]
+
+    print(f"Evento {event['id']}: {args.vacancies} vagas, {args.requests} requisições, concorrência {args.concurrency}")
+    print(f"  aceitas: {accepted}  recusadas: {rejected}  erros: {errors}")
+    print(f"  inscriptions_count final: {count}")
+    print(f"  tempo total: {elapsed:.2f}s  vazão: {args.requests / elapsed:.1f} req/s")
+
+    oversold = accepted > args.vacancies or count > args.vacancies or count != accepted
+    if oversold or errors:
+        sys.exit("FALHA: vagas vendidas a mais, contador inconsistente ou erros inesperados.")
+    print("OK: nenhuma vaga vendida a mais.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Benchmark da serialização JSON das listagens.
+
+Compara, para listas de eventos e de inscrições, o caminho padrão do
+FastAPI (response_model → jsonable_encoder → json da biblioteca padrão)
+com o caminho rápido de app.core.responses (TypeAdapter do pydantic v2
+serializando direto para bytes), dentro de uma aplicação ASGI mínima.
+Não precisa da API nem do banco rodando.
+
+Uso (estando na pasta /backend):
+    python benchmarks/json_serialization.py --items 100 1000 5000 --repeat 20
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from fastapi import FastAPI
+
+from app.core.responses import json_response
+from app.db.models import user, event, inscription, rating, stats  # noqa: F401 (registra os modelos)
+from app.db.models.event import Event, EventMaterial, EventType
+from app.db.models.inscription import Inscription
+from app.schemas.event import EventRead
+from app.schemas.inscription import InscriptionRead
+
+def make_events(count: int) -> list:
+    start = datetime(2025, 1, 1, 10, tzinfo=timezone.utc)
+    return [
+        Event(
+            id=i,
+            title=f"Evento {i}",
+            description="Descrição do evento " * 10,
+            event_type=EventType.palestra,
+            start_time=start + timedelta(hours=i),
+            end_time=start + timedelta(hours=i + 1),
+            location=f"Sala {i % 20}",
+            host=f"Host {i % 50}",
+            max_vacancies=100,
+            is_public=True,
+            inscriptions_count=i % 100,
+            checked_in_count=i % 10,
+            version=1,
+            updated_at=start,
+            creator_id=1,
+            materials=[
+                EventMaterial(id=i * 2 + k, title=f"Material {k}", url_or_filename=f"https://example.com/{i}/{k}.pdf")
+                for k in range(2)
+            ],
+        )
+        for i in range(count)
+    ]
+
+def make_inscriptions(count: int) -> list:
+    now = datetime(2025, 1, 1, 10, tzinfo=timezone.utc)
+    return [
+        Inscription(
+            id=i,
+            event_id=1,
+            guest_name=f"Visitante {i}",
+            guest_email=f"visitante{i}@example.com",
+            guest_phone="(11) 99999-0000",
+            registration_time=now,
+            checked_in=i % 3 == 0,
+        )
+        for i in range(count)
+    ]
+
+def build_app(events: list, inscriptions: list) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/default/events", response_model=List[EventRead])
+    async def default_events():
+        return events
+
+    @app.get("/fast/events", response_model=List[EventRead])
+    async def fast_events():
+        return json_response(List[EventRead], events)
+
+    @app.get("/default/inscriptions", response_model=List[InscriptionRead])
+    async def default_inscriptions():
+        return inscriptions
+
+    @app.get("/fast/inscriptions", response_model=List[InscriptionRead])
+    async def fast_inscriptions():
+        return json_response(List[InscriptionRead], inscriptions)
+
+    return app
+
+async def call(app: FastAPI, path: str) -> bytes:
+    """Executa um GET direto na aplicação ASGI, sem rede."""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": path, "raw_path": path.encode(),
+        "query_string": b"", "root_path": "", "headers": [],
+        "client": ("127.0.0.1", 0), "server": ("127.0.0.1", 80),
+    }
+    chunks = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return b"".join(chunks)
+
+async def measure(app: FastAPI, path: str, repeat: int) -> float:
+    await call(app, path)  # aquecimento
+    samples = []
+    for _ in range(repeat):
+        began = time.perf_counter()
+        await call(app, path)
+        samples.append(time.perf_counter() - began)
+    return statistics.median(samples) * 1000
+
+async def run(args: argparse.Namespace):
+    print(f"{'lista':<14}{'itens':>8}{'padrão (ms)':>14}{'rápido (ms)':>14}{'ganho':>8}")
+    for count in args.items:
+        app = build_app(make_events(count), make_inscriptions(count))
+        for resource in ("events", "inscriptions"):
+            default_body = await call(app, f"/default/{resource}")
+            fast_body = await call(app, f"/fast/{resource}")
+            if json.loads(default_body) != json.loads(fast_body):
+                sys.exit(f"FALHA: respostas diferentes para /{resource} com {count} itens.")
+
+            default_ms = await measure(app, f"/default/{resource}", args.repeat)
+            fast_ms = await measure(app, f"/fast/{resource}", args.repeat)
+            print(f"{resource:<14}{count:>8}{default_ms:>14.2f}{fast_ms:>14.2f}{default_ms / fast_ms:>7.1f}x")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, nargs="+", default=[100, 1000, 5000], help="Tamanhos de lista medidos.")
+    parser.add_argument("--repeat", type=int, default=20, help="Repetições por medida (usa a mediana).")
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,373 @@
+"""
+Teste de carga da API.
+
+Dispara, com várias threads em paralelo, um cenário de uso contra a API
+rodando (POST /token, GET /events, detalhes, inscrição, check-in e
+exportação), sobre os dados criados pelo seed.py. Reporta por endpoint a
+vazão e as latências p50/p95/p99 e grava o resultado em
+benchmarks/results/ para comparar execuções (--compare).
+
+Cenários: login, browse, inscribe, checkin, export e mixed.
+
+Uso (com a API rodando e o banco populado pelo seed.py):
+    python benchmarks/load_test.py --scenario mixed --concurrency 32 --duration 30
+    python benchmarks/load_test.py --scenario browse --compare benchmarks/results/<execução anterior>.json
+"""
+import argparse
+import http.client
+import json
+import math
+import platform
+import random
+import subprocess
+import sys
+import threading
+import time
+import urllib.parse
+import uuid
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+# Peso de cada operação em cada cenário
+SCENARIOS = {
+    "login": {"login": 1},
+    "browse": {"list_events": 5, "next_page": 2, "event_detail": 5},
+    "inscribe": {"inscribe": 1},
+    "checkin": {"checkin": 1},
+    "export": {"export": 1},
+    "mixed": {
+        "list_events": 30, "next_page": 10, "event_detail": 30, "login": 5,
+        "inscribe": 15, "checkin": 7, "export": 3,
+    },
+}
+
+# Recusas de negócio esperadas (ex.: já inscrito, vagas esgotadas) não contam como erro
+EXPECTED_REJECTIONS = {"POST /events/{id}/inscribe": {400}}
+
+class Client:
+    """Cliente HTTP com conexão persistente (keep-alive), um por thread."""
+
+    def __init__(self, base_url: str):
+        parsed = urllib.parse.urlparse(base_url)
+        self.host = parsed.hostname
+        self.port = parsed.port or 80
+        self.connection = None
+
+    def request(self, method: str, path: str, body: dict | None = None, token: str | None = None, form: bool = False):
+        headers = {}
+        data = None
+        if body is not None:
+            if form:
+                data = urllib.parse.urlencode(body).encode()
+                headers["Content-Type"] = "application/x-www-form-urlencoded"
+            else:
+                data = json.dumps(body).encode()
+                headers["Content-Type"] = "application/json"
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+
+        for attempt in range(2):
+            if self.connection is None:
+                self.connection = http.client.HTTPConnection(self.host, self.port, timeout=60)
+            try:
+                self.connection.request(method, path, body=data, headers=headers)
+                response = self.connection.getresponse()
+                return response.status, response.read()
+            except (http.client.HTTPException, OSError):
+                # Conexão fechada pelo servidor: reabre uma vez
+                self.connection.close()
+                self.connection = None
+                if attempt:
+                    raise
+
+class Recorder:
+    """Latências e status por endpoint, compartilhados entre as threads."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+
+    def timed(self, client: Client, endpoint: str, method: str, path: str, **kwargs):
+        began = time.perf_counter()
+        try:
+            status, payload = client.request(method, path, **kwargs)
+        except (http.client.HTTPException, OSError):
+            status, payload = 0, b""
+        elapsed = time.perf_counter() - began
+        with self.lock:
+            self.latencies[endpoint].append(elapsed)
+            self.statuses[endpoint][status] += 1
+        return status, payload
+
+def percentile(sorted_values: list, p: float) -> float:
+    """Percentil pelo método nearest-rank."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+def login(client: Client, base: str, email: str, password: str) -> str:
+    status, payload = client.request("POST", "/token", {"username": email, "password": password}, form=True)
+    if status != 200:
+        sys.exit(f"Falha no login de {email} ({status}): {payload[:200]!r}")
+    return json.loads(payload)["access_token"]
+
+def prepare(args: argparse.Namespace, manifest: dict) -> dict:
+    """Faz login e coleta eventos/inscrições antes da medição."""
+    client = Client(args.base_url)
+    admin_token = login(client, args.base_url, manifest["admin_email"], manifest["password"])
+
+    participants = min(manifest["users"], args.participants)
+    participant_tokens = [
+        login(client, args.base_url, f"{manifest['prefix']}-user-{n}@example.com", manifest["password"])
+        for n in range(participants)
+    ]
+
+    public_events, all_events, cursor = [], [], None
+    while len(all_events) < args.max_events:
+        query = "/events?limit=100" + (f"&cursor={cursor}" if cursor else "")
+        status, payload = client.request("GET", query, token=admin_token)
+        page = json.loads(payload)
+        for item in page["items"]:
+            all_events.append(item["id"])
+            if item["is_public"]:
+                public_events.append(item["id"])
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+
+    if not public_events:
+        sys.exit("Nenhum evento público encontrado. Rode o seed.py antes.")
+
+    inscriptions = []
+    for event_id in all_events[:20]:
+        status, payload = client.request("GET", f"/events/{event_id}/inscriptions", token=admin_token)
+        inscriptions += [item["id"] for item in json.loads(payload)]
+
+    return {
+        "admin_token": admin_token,
+        "participant_tokens": participant_tokens,
+        "public_events": public_events,
+        "all_events": all_events,
+        "inscriptions": inscriptions,
+        "cursors": [],
+    }
+
+def make_operations(args: argparse.Namespace, manifest: dict, state: dict, recorder: Recorder):
+    def list_events(client, rng):
+        token = rng.choice(state["participant_tokens"] + [None])
+        status, payload = recorder.timed(client, "GET /events", "GET", "/events?limit=20", token=token)
+        if status == 200:
+            cursor = json.loads(payload).get("next_cursor")
+            if cursor and len(state["cursors"]) < 100:
+                state["cursors"].append(cursor)
+
+    def next_page(client, rng):
+        if not state["cursors"]:
+            return list_events(client, rng)
+        cursor = rng.choice(state["cursors"])
+        recorder.timed(client, "GET /events?cursor", "GET", f"/events?limit=20&cursor={cursor}")
+
+    def event_detail(client, rng):
+        event_id = rng.choice(state["public_events"])
+        recorder.timed(client, "GET /events/{id}", "GET", f"/events/{event_id}")
+
+    def do_login(client, rng):
+        n = rng.randrange(manifest["users"])
+        recorder.timed(
+            client, "POST /token", "POST", "/token",
+            body={"username": f"{manifest['prefix']}-user-{n}@example.com", "password": manifest["password"]},
+            form=True
+        )
+
+    def inscribe(client, rng):
+        event_id = rng.choice(state["public_events"])
+        if rng.random() < 0.5 and state["participant_tokens"]:
+            body, token = {}, rng.choice(state["participant_tokens"])
+        else:
+            body, token = {
+                "guest_name": "Visitante de carga",
+                "guest_email": f"{manifest['prefix']}-load-{uuid.uuid4().hex[:12]}@example.com",
+            }, None
+        recorder.timed(
+            client, "POST /events/{id}/inscribe", "POST", f"/events/{event_id}/inscribe",
+            body=body, token=token
+        )
+
+    def checkin(client, rng):
+        if not state["inscriptions"]:
+            return
+        inscription_id = rng.choice(state["inscriptions"])
+        recorder.timed(
+            client, "PUT /inscriptions/{id}/checkin", "PUT", f"/inscriptions/{inscription_id}/checkin",
+            token=state["admin_token"]
+        )
+
+    def export(client, rng):
+        event_id = rng.choice(state["all_events"])
+        recorder.timed(
+            client, "GET /events/{id}/inscriptions/export", "GET",
+            f"/events/{event_id}/inscriptions/export?format={args.export_format}",
+            token=state["admin_token"]
+        )
+
+    return {
+        "list_events": list_events,
+        "next_page": next_page,
+        "event_detail": event_detail,
+        "login": do_login,
+        "inscribe": inscribe,
+        "checkin": checkin,
+        "export": export,
+    }
+
+def run(args: argparse.Namespace, manifest: dict) -> dict:
+    state = prepare(args, manifest)
+    recorder = Recorder()
+    operations = make_operations(args, manifest, state, recorder)
+    weights = SCENARIOS[args.scenario]
+    names, counts = list(weights), list(weights.values())
+
+    deadline = time.perf_counter() + args.duration
+    remaining = [args.requests] if args.requests else None
+    remaining_lock = threading.Lock()
+
+    def worker(index: int):
+        rng = random.Random(args.seed * 1000 + index)
+        client = Client(args.base_url)
+        while time.perf_counter() < deadline:
+            if remaining is not None:
+                with remaining_lock:
+                    if remaining[0] <= 0:
+                        return
+                    remaining[0] -= 1
+            operations[rng.choices(names, counts)[0]](client, rng)
+
+    began = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(args.concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - began
+
+    endpoints = {}
+    for endpoint, latencies in sorted(recorder.latencies.items()):
+        latencies.sort()
+        statuses = dict(recorder.statuses[endpoint])
+        expected = EXPECTED_REJECTIONS.get(endpoint, set())
+        errors = sum(
+            count for status, count in statuses.items()
+            if not (200 <= status < 400) and status not in expected
+        )
+        endpoints[endpoint] = {
+            "requests": len(latencies),
+            "errors": errors,
+            "statuses": {str(status): count for status, count in sorted(statuses.items())},
+            "throughput_rps": len(latencies) / elapsed,
+            "mean_ms": sum(latencies) / len(latencies) * 1000,
+            "p50_ms": percentile(latencies, 50) * 1000,
+            "p95_ms": percentile(latencies, 95) * 1000,
+            "p99_ms": percentile(latencies, 99) * 1000,
+            "max_ms": latencies[-1] * 1000,
+        }
+
+    total = sum(item["requests"] for item in endpoints.values())
+    return {
+        "scenario": args.scenario,
+        "label": args.label,
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "git_commit": git_commit(),
+        "base_url": args.base_url,
+        "concurrency": args.concurrency,
+        "elapsed_seconds": elapsed,
+        "python": platform.python_version(),
+        "seed_manifest": manifest,
+        "total": {
+            "requests": total,
+            "errors": sum(item["errors"] for item in endpoints.values()),
+            "throughput_rps": total / elapsed,
+        },
+        "endpoints": endpoints,
+    }
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def print_report(result: dict, baseline: dict | None):
+    print(
+        f"Cenário {result['scenario']}: {result['total']['requests']} requisições em "
+        f"{result['elapsed_seconds']:.1f}s ({result['total']['throughput_rps']:.1f} req/s), "
+        f"concorrência {result['concurrency']}, erros {result['total']['errors']}"
+    )
+    header = f"{'endpoint':<40}{'req':>7}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'erros':>7}"
+    print(header)
+    for endpoint, item in result["endpoints"].items():
+        print(
+            f"{endpoint:<40}{item['requests']:>7}{item['throughput_rps']:>9.1f}"
+            f"{item['p50_ms']:>9.1f}{item['p95_ms']:>9.1f}{item['p99_ms']:>9.1f}{item['errors']:>7}"
+        )
+
+    if not baseline:
+        return
+
+    print(f"\nComparação com {baseline.get('label') or baseline['started_at']} (commit {baseline.get('git_commit')}):")
+    print(f"{'endpoint':<40}{'req/s':>10}{'p50':>10}{'p95':>10}{'p99':>10}")
+
+    def delta(new: float, old: float) -> str:
+        return f"{(new - old) / old * 100:+.0f}%" if old else "-"
+
+    for endpoint, item in result["endpoints"].items():
+        old = baseline["endpoints"].get(endpoint)
+        if not old:
+            continue
+        print(
+            f"{endpoint:<40}{delta(item['throughput_rps'], old['throughput_rps']):>10}"
+            f"{delta(item['p50_ms'], old['p50_ms']):>10}{delta(item['p95_ms'], old['p95_ms']):>10}"
+            f"{delta(item['p99_ms'], old['p99_ms']):>10}"
+        )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="mixed")
+    parser.add_argument("--manifest", type=Path, default=RESULTS_DIR / "seed-bench.json", help="Manifesto gerado pelo seed.py.")
+    parser.add_argument("--concurrency", type=int, default=16, help="Threads disparando requisições.")
+    parser.add_argument("--duration", type=float, default=30, help="Duração máxima, em segundos.")
+    parser.add_argument("--requests", type=int, default=None, help="Encerra após este número de operações.")
+    parser.add_argument("--participants", type=int, default=20, help="Participantes logados antes da medição.")
+    parser.add_argument("--max-events", type=int, default=1000, help="Eventos coletados para os cenários.")
+    parser.add_argument("--export-format", choices=["csv", "xlsx"], default="csv")
+    parser.add_argument("--seed", type=int, default=42, help="Semente da escolha das operações.")
+    parser.add_argument("--label", default=None, help="Nome desta execução no arquivo de resultado.")
+    parser.add_argument("--compare", type=Path, default=None, help="Resultado anterior para comparar.")
+    parser.add_argument("--no-save", action="store_true", help="Não grava o resultado em benchmarks/results/.")
+    args = parser.parse_args()
+
+    if not args.manifest.exists():
+        sys.exit(f"Manifesto {args.manifest} não encontrado. Rode o seed.py antes.")
+    manifest = json.loads(args.manifest.read_text())
+    baseline = json.loads(args.compare.read_text()) if args.compare else None
+
+    result = run(args, manifest)
+    print_report(result, baseline)
+
+    if not args.no_save:
+        RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        suffix = f"-{args.label}" if args.label else ""
+        path = RESULTS_DIR / f"{stamp}-{args.scenario}{suffix}.json"
+        path.write_text(json.dumps(result, indent=2, ensure_ascii=False))
+        print(f"\nResultado gravado em {path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+"""
+Gerador de dados sintéticos para os benchmarks.
+
+Cria, direto no banco (SQLite ou PostgreSQL local), um admin, organizadores,
+participantes, eventos dos três tipos (públicos e privados), inscrições
+(de usuários e visitantes, parte com check-in) e avaliações, de forma
+reprodutível (--seed). Os contadores dos eventos, os rollups do dashboard
+e os agregados de avaliações ficam consistentes ao final.
+
+Todos os usuários usam a mesma senha (--password) e e-mails no formato
+<prefixo>-admin@example.com, <prefixo>-org-<n>@example.com e
+<prefixo>-user-<n>@example.com. Um manifesto com esses dados é gravado em
+benchmarks/results/seed-<prefixo>.json para o load_test.py.
+
+Uso (estando na pasta /backend):
+    python benchmarks/seed.py --users 1000 --events 200 --inscriptions-per-event 50
+    python benchmarks/seed.py --database-url sqlite+aiosqlite:///./bench.db --users 200 --events 50
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+RESULTS_DIR = BACKEND_DIR / "benchmarks" / "results"
+BATCH_SIZE = 1000
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=None, help="Sobrescreve o DATABASE_URL do .env.")
+    parser.add_argument("--prefix", default="bench", help="Prefixo dos e-mails gerados (identifica a carga).")
+    parser.add_argument("--password", default="bench-password", help="Senha de todos os usuários gerados.")
+    parser.add_argument("--users", type=int, default=500, help="Participantes.")
+    parser.add_argument("--organizers", type=int, default=10)
+    parser.add_argument("--events", type=int, default=100)
+    parser.add_argument("--private-ratio", type=float, default=0.2, help="Fração de eventos privados.")
+    parser.add_argument("--inscriptions-per-event", type=int, default=30, help="Média de inscrições por evento.")
+    parser.add_argument("--guest-ratio", type=float, default=0.3, help="Fração das inscrições feitas por visitantes.")
+    parser.add_argument("--checkin-ratio", type=float, default=0.5, help="Fração das inscrições com check-in.")
+    parser.add_argument("--ratings-per-event", type=int, default=10, help="Média de avaliações por evento.")
+    parser.add_argument("--seed", type=int, default=42, help="Semente do gerador (cargas reprodutíveis).")
+    return parser.parse_args()
+
+def batched(rows: list):
+    for start in range(0, len(rows), BATCH_SIZE):
+        yield rows[start:start + BATCH_SIZE]
+
+async def insert_rows(db, model, rows: list, returning=None) -> list:
+    from sqlalchemy import insert
+
+    ids = []
+    for batch in batched(rows):
+        statement = insert(model)
+        if returning is not None:
+            result = await db.execute(statement.returning(returning, sort_by_parameter_order=True), batch)
+            ids.extend(result.scalars().all())
+        else:
+            await db.execute(statement, batch)
+    return ids
+
+async def seed(args: argparse.Namespace) -> dict:
+    from sqlalchemy import func, select
+
+    from app.core.security import get_password_hash, shutdown_hashing_pool
+    from app.db.base import SessionLocal, engine
+    from app.db.migrations import upgrade_schema
+    from app.db.models.event import Event, EventType
+    from app.db.models.inscription import Inscription
+    from app.db.models.rating import Rating
+    from app.db.models.user import User, UserRole
+    from app.services import inscription_service, rating_service
+
+    rng = random.Random(args.seed)
+    await upgrade_schema()
+
+    async with SessionLocal() as db:
+        existing = await db.scalar(
+            select(func.count(User.id)).where(User.email.like(f"{args.prefix}-%@example.com"))
+        )
+        if existing:
+            sys.exit(f"Já existem usuários com o prefixo '{args.prefix}'. Use outro --prefix ou um banco limpo.")
+
+        # Um único hash para todos: o bcrypt é caro de propósito
+        hashed_password = await get_password_hash(args.password)
+        shutdown_hashing_pool()
+
+        users = [{
+            "name": "Admin do benchmark", "email": f"{args.prefix}-admin@example.com", "phone": None,
+            "hashed_password": hashed_password, "role": UserRole.admin,
+        }]
+        users += [{
+            "name": f"Organizador {n}", "email": f"{args.prefix}-org-{n}@example.com", "phone": None,
+            "hashed_password": hashed_password, "role": UserRole.organizer,
+        } for n in range(args.organizers)]
+        users += [{
+            "name": f"Participante {n}", "email": f"{args.prefix}-user-{n}@example.com",
+            "phone": f"(11) 9{n:08d}", "hashed_password": hashed_password, "role": UserRole.participant,
+        } for n in range(args.users)]
+        user_ids = await insert_rows(db, User, users, returning=User.id)
+        creator_ids = user_ids[:1 + args.organizers]
+        participant_ids = user_ids[1 + args.organizers:]
+
+        now = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+        event_types = list(EventType)
+        plans = []
+        for n in range(args.events):
+            size = max(0, round(rng.gauss(args.inscriptions_per_event, args.inscriptions_per_event / 3)))
+            from_users = min(round(size * (1 - args.guest_ratio)), len(participant_ids))
+            guests = size - from_users
+            start = now + timedelta(days=rng.randint(-180, 180), hours=rng.randint(8, 20) - now.hour)
+            plans.append({
+                "users": rng.sample(participant_ids, from_users),
+                "guests": guests,
+                "event": {
+                    "title": f"{rng.choice(['Oficina', 'Palestra', 'Reunião', 'Workshop'])} {n} de {args.prefix}",
+                    "description": f"Evento sintético {n} gerado para benchmark.",
+                    "event_type": event_types[n % len(event_types)],
+                    "start_time": start,
+                    "end_time": start + timedelta(hours=rng.choice([1, 2, 3])),
+                    "location": f"Sala {rng.randint(1, 40)}",
+                    "host": f"Palestrante {rng.randint(1, 60)}",
+                    # 0 = vagas ilimitadas; senão deixa uma folga para os cenários de inscrição
+                    "max_vacancies": rng.choice([0, size + rng.randint(5, 50)]),
+                    "is_public": rng.random() >= args.private_ratio,
+                    "creator_id": rng.choice(creator_ids),
+                },
+            })
+
+        event_ids = await insert_rows(db, Event, [plan["event"] for plan in plans], returning=Event.id)
+
+        inscriptions, ratings = [], []
+        for event_id, plan in zip(event_ids, plans):
+            registered_at = plan["event"]["start_time"] - timedelta(days=rng.randint(1, 30))
+            rows = [{
+                "user_id": user_id, "guest_name": None, "guest_email": None, "guest_phone": None,
+            } for user_id in plan["users"]]
+            rows += [{
+                "user_id": None,
+                "guest_name": f"Visitante {event_id}-{g}",
+                "guest_email": f"{args.prefix}-guest-{event_id}-{g}@example.com",
+                "guest_phone": "(11) 90000-0000",
+            } for g in range(plan["guests"])]
+            for row in rows:
+                row.update(
+                    event_id=event_id,
+                    registration_time=registered_at,
+                    checked_in=rng.random() < args.checkin_ratio,
+                )
+            inscriptions += rows
+
+            raters = plan["users"][:max(0, round(rng.gauss(args.ratings_per_event, args.ratings_per_event / 3)))]
+            ratings += [{
+                "event_id": event_id,
+                "user_id": user_id,
+                "rating": rng.choices([1, 2, 3, 4, 5], weights=[1, 2, 4, 6, 5])[0],
+                "comment": rng.choice([None, "Muito bom!", "Poderia ser mais longo.", "Excelente conteúdo."]),
+                "created_at": plan["event"]["end_time"].replace(tzinfo=None) + timedelta(hours=rng.randint(1, 72)),
+            } for user_id in raters]
+
+        await insert_rows(db, Inscription, inscriptions)
+        await insert_rows(db, Rating, ratings)
+        await db.commit()
+
+        # Contadores, rollups e agregados a partir do que foi inserido
+        await inscription_service.recount_inscriptions(db)
+        await rating_service.rebuild_rating_stats(db)
+
+    await engine.dispose()
+
+    return {
+        "prefix": args.prefix,
+        "password": args.password,
+        "seed": args.seed,
+        "database": engine.url.get_backend_name(),
+        "admin_email": f"{args.prefix}-admin@example.com",
+        "organizers": args.organizers,
+        "users": args.users,
+        "events": len(event_ids),
+        "inscriptions": len(inscriptions),
+        "ratings": len(ratings),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+def main():
+    args = parse_args()
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    # Importa o pacote app a partir da pasta /backend
+    sys.path.insert(0, str(BACKEND_DIR))
+    os.chdir(BACKEND_DIR)
+
+    began = time.perf_counter()
+    manifest = asyncio.run(seed(args))
+    elapsed = time.perf_counter() - began
+
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    path = RESULTS_DIR / f"seed-{args.prefix}.json"
+    path.write_text(json.dumps(manifest, indent=2, ensure_ascii=False))
+
+    print(
+        f"Banco {manifest['database']}: {manifest['users']} participantes, {manifest['organizers']} organizadores, "
+        f"{manifest['events']} eventos, {manifest['inscriptions']} inscrições, {manifest['ratings']} avaliações "
+        f"em {elapsed:.1f}s"
+    )
+    print(f"Manifesto: {path}")
+
+if __name__ == "__main__":
+    main()
@@ -42,8 +42,12 @@ interface RatingDisplay {
   createdAt: string;
 }
 
+const EVENTS_PAGE_SIZE = 20;
+
 const AdminDashboard = () => {
   const [events, setEvents] = useState<Event[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [isLoadingMore, setIsLoadingMore] = useState(false);
   const [enrollmentsList, setEnrollmentsList] = useState<EnrollmentDisplay[]>([]);
   const [ratingsList, setRatingsList] = useState<RatingDisplay[]>([]);
   const [isLoading, setIsLoading] = useState(true);
@@ -89,50 +93,84 @@ const AdminDashboard = () => {
     loadAllData();
   }, []);
 
+  // Inscrições e avaliações dos eventos de uma página
+  const loadEventDetails = async (pageEvents: Event[]) => {
+    const enrollmentsPromises = pageEvents.map(async (ev) => {
+      try {
+        const result = await enrollmentAPI.getByEvent(ev.id);
+        return result.map(enr => ({
+          id: enr.id,
+          eventName: ev.title,
+          userId: enr.userId,
+          // MAPEAMENTO DOS DADOS DO USUÁRIO (Vem do Backend)
+          // @ts-expect-error (O TS pode não ver esses campos se não estiverem na interface Enrollment do api.ts, mas o backend manda)
+          userName: enr.user_name || enr.guest_name || "Anônimo",
+          // eslint-disable-next-line @typescript-eslint/ban-ts-comment
+          // @ts-expect-error
+          userEmail: enr.user_email || enr.guest_email || "-",
+          status: enr.status || "confirmed" // Default para confirmado se vier vazio
+        }));
+      } catch { return []; }
+    });
+
+    const ratingsPromises = pageEvents.map(async (ev) => {
+      try {
+        const result = await ratingAPI.getByEvent(ev.id);
+        return result.map(rt => ({
+          id: rt.id,
+          eventName: ev.title,
+          userId: rt.userId,
+          rating: rt.rating,
+          comment: rt.comment,
+          createdAt: rt.createdAt
+        }));
+      } catch { return []; }
+    });
+
+    const allEnrollmentsResults = await Promise.all(enrollmentsPromises);
+    const allRatingsResults = await Promise.all(ratingsPromises);
+
+    return {
+      enrollments: allEnrollmentsResults.flat(),
+      ratings: allRatingsResults.flat(),
+    };
+  };
+
+  // Recarrega a partir da primeira página de eventos (as próximas vêm pelo "Carregar mais")
   const loadAllData = async () => {
     setIsLoading(true);
     try {
-      const allEvents = await eventAPI.getAll();
-      setEvents(allEvents);
-
-      const enrollmentsPromises = allEvents.map(async (ev) => {
-        try {
-          const result = await enrollmentAPI.getByEvent(ev.id);
-          return result.map(enr => ({
-            id: enr.id,
-            eventName: ev.title,
-            userId: enr.userId,
-            // MAPEAMENTO DOS DADOS DO USUÁRIO (Vem do Backend)
-            // @ts-expect-error (O TS pode não ver esses campos se não estiverem na interface Enrollment do api.ts, mas o backend manda)
-            userName: enr.user_name || enr.guest_name || "Anônimo",
-            // eslint-disable-next-line @typescript-eslint/ban-ts-comment
-            // @ts-expect-error
-            userEmail: enr.user_email || enr.guest_email || "-",
-            status: enr.status || "confirmed" // Default para confirmado se vier vazio
-          }));
-        } catch { return []; }
-      });
+      const page = await eventAPI.getPage(null, EVENTS_PAGE_SIZE);
+      const details = await loadEventDetails(page.items);
 
-      const ratingsPromises = allEvents.map(async (ev) => {
-        try {
-          const result = await ratingAPI.getByEvent(ev.id);
-          return result.map(rt => ({
-            id: rt.id,
-            eventName: ev.title,
-            userId: rt.userId,
-            rating: rt.rating,
-            comment: rt.comment,
-            createdAt: rt.createdAt
-          }));
-        } catch { return []; }
-      });
+      setEvents(page.items);
+      setNextCursor(page.next_cursor);
+      setEnrollmentsList(details.enrollments);
+      setRatingsList(details.ratings);
 
-      const allEnrollmentsResults = await Promise.all(enrollmentsPromises);
-      const allRatingsResults = await Promise.all(ratingsPromises);
+    } catch (error) {
+      console.error("Erro ao carregar dados:", error);
+      toast({
+        variant: "destructive",
+        title: "Erro ao carregar",
+        description: "Falha ao buscar dados do servidor."
+      });
+    } finally {
+      setIsLoading(false);
+    }
+  };
 
-      setEnrollmentsList(allEnrollmentsResults.flat());
-      setRatingsList(allRatingsResults.flat());
+  const loadMoreEvents = async () => {
+    if (!nextCursor) return;
+    setIsLoadingMore(true);
+    try {
+      const page = await eventAPI.getPage(nextCursor, EVENTS_PAGE_SIZE);
+      const details = await loadEventDetails(page.items);
 
+      setEvents((current) => [...current, ...page.items]);
+      setNextCursor(page.next_cursor);
+      setEnrollmentsList((current) => [...current, ...details.enrollments]);
+      setRatingsList((current) => [...current, ...details.ratings]);
     } catch (error) {
       console.error("Erro ao carregar dados:", error);
       toast({
@@ -141,7 +179,7 @@ const AdminDashboard = () => {
         description: "Falha ao buscar dados do servidor."
       });
     } finally {
-      setIsLoading(false);
+      setIsLoadingMore(false);
     }
   };
 
@@ -516,6 +554,14 @@ const AdminDashboard = () => {
                         </div>
                       );
                     })}
+                    {nextCursor && (
+                      <div className="flex justify-center pt-2">
+                        <Button variant="outline" onClick={loadMoreEvents} disabled={isLoadingMore}>
+                          {isLoadingMore && <Loader2 className="mr-2 h-4 w-4 animate-spin" />}
+                          Carregar mais eventos
+                        </Button>
+                      </div>
+                    )}
                   </div>
                 )}
               </CardContent>
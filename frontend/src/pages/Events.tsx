@@ -2,9 +2,10 @@ import { useState, useEffect } from "react";
 import Navbar from "@/components/Navbar";
 import EventCard from "@/components/EventCard";
 import { Input } from "@/components/ui/input";
+import { Button } from "@/components/ui/button";
 import { Select, SelectContent, SelectItem, SelectTrigger, SelectValue } from "@/components/ui/select";
 import { Search, Loader2 } from "lucide-react";
-import { eventAPI, Event } from "@/services/api";
+import { eventAPI, Event, EventPageFilters } from "@/services/api";
 import { toast } from "@/hooks/use-toast";
 
 // Interface auxiliar para o TS entender os campos do Python
@@ -15,57 +16,77 @@ interface BackendEvent extends Event {
   availableVacancies: number;
 }
 
+const PAGE_SIZE = 20;
+
+// Os filtros são aplicados pelo backend, para valerem sobre todos os eventos (e não só as páginas já carregadas)
+const toPageFilters = (searchTerm: string, filterType: string): EventPageFilters => {
+  const filters: EventPageFilters = {};
+  if (searchTerm.trim()) filters.title = searchTerm.trim();
+  if (filterType === "reuniao") {
+    // Backend usa 'reuniao_interna', filtro manda 'reuniao'
+    filters.event_type = "reuniao_interna";
+  } else if (filterType === "oficina" || filterType === "palestra") {
+    filters.event_type = filterType;
+  }
+  return filters;
+};
+
+const showLoadError = (error: unknown) => {
+  console.error("Erro ao buscar eventos:", error);
+  toast({
+    variant: "destructive",
+    title: "Erro ao carregar",
+    description: "Não foi possível conectar ao servidor.",
+  });
+};
+
 const Events = () => {
   const [events, setEvents] = useState<Event[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [isLoading, setIsLoading] = useState(true);
+  const [isLoadingMore, setIsLoadingMore] = useState(false);
   const [searchTerm, setSearchTerm] = useState("");
   const [filterType, setFilterType] = useState("all");
 
+  // Primeira página: ao abrir e sempre que os filtros mudam (a busca espera o usuário parar de digitar)
   useEffect(() => {
-    const fetchEvents = async () => {
+    let cancelled = false;
+
+    const timer = setTimeout(async () => {
+      setIsLoading(true);
       try {
-        const data = await eventAPI.getAll();
-        setEvents(data);
+        const page = await eventAPI.getPage(null, PAGE_SIZE, toPageFilters(searchTerm, filterType));
+        if (cancelled) return;
+        setEvents(page.items);
+        setNextCursor(page.next_cursor);
       } catch (error) {
-        console.error("Erro ao buscar eventos:", error);
-        toast({
-          variant: "destructive",
-          title: "Erro ao carregar",
-          description: "Não foi possível conectar ao servidor.",
-        });
+        if (!cancelled) showLoadError(error);
       } finally {
-        setIsLoading(false);
+        if (!cancelled) setIsLoading(false);
       }
-    };
+    }, searchTerm ? 300 : 0);
 
-    fetchEvents();
-  }, []);
-
-  const filteredEvents = events.filter((event) => {
-    // 1. ACESSO SEGURO AO TIPO (CORREÇÃO AQUI)
-    // Convertemos para acessar a propriedade 'event_type' que vem do Python
-    const rawEvent = event as unknown as BackendEvent;
-    const realType = rawEvent.event_type || event.type; 
-
-    // 2. Filtro de Busca (Título/Descrição)
-    const matchesSearch = event.title.toLowerCase().includes(searchTerm.toLowerCase()) ||
-                          event.description.toLowerCase().includes(searchTerm.toLowerCase());
-    
-    // 3. Filtro de Tipo (Lógica ajustada)
-    let matchesType = false;
-
-    if (filterType === "all") {
-      matchesType = true;
-    } else if (filterType === "reuniao") {
-      // Backend manda 'reuniao_interna', filtro manda 'reuniao'
-      matchesType = realType === 'reuniao_interna' || realType === 'reuniao';
-    } else {
-      // Outros tipos (oficina, palestra) devem bater exato
-      matchesType = realType === filterType;
+    return () => {
+      cancelled = true;
+      clearTimeout(timer);
+    };
+  }, [searchTerm, filterType]);
+
+  const loadMore = async () => {
+    if (!nextCursor) return;
+    setIsLoadingMore(true);
+    try {
+      const page = await eventAPI.getPage(nextCursor, PAGE_SIZE, toPageFilters(searchTerm, filterType));
+      setEvents((current) => [...current, ...page.items]);
+      setNextCursor(page.next_cursor);
+    } catch (error) {
+      showLoadError(error);
+    } finally {
+      setIsLoadingMore(false);
     }
+  };
 
-    return matchesSearch && matchesType;
-  });
+  const hasFilters = Object.keys(toPageFilters(searchTerm, filterType)).length > 0;
 
   return (
     <div className="min-h-screen bg-background">
@@ -83,7 +104,7 @@ const Events = () => {
           <div className="relative flex-1">
             <Search className="absolute left-3 top-3 h-4 w-4 text-muted-foreground" />
             <Input
-              placeholder="Buscar eventos..."
+              placeholder="Buscar eventos pelo título..."
               value={searchTerm}
               onChange={(e) => setSearchTerm(e.target.value)}
               className="pl-10"
@@ -108,7 +129,7 @@ const Events = () => {
           </div>
         ) : (
           <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-6">
-            {filteredEvents.map((event, index) => {
+            {events.map((event, index) => {
               
               // Preparação de dados para o Card
               const backendEvent = event as unknown as BackendEvent;
@@ -125,7 +146,7 @@ const Events = () => {
               else if (rawType === 'reuniao' || rawType === 'reuniao_interna') displayType = 'reuniao';
 
               return (
-                <div key={event.id} style={{ animationDelay: `${index * 0.1}s` }}>
+                <div key={event.id} style={{ animationDelay: `${(index % PAGE_SIZE) * 0.1}s` }}>
                   <EventCard 
                     {...event}
                     type={displayType}
@@ -142,12 +163,21 @@ const Events = () => {
           </div>
         )}
 
-        {!isLoading && filteredEvents.length === 0 && (
+        {!isLoading && nextCursor && (
+          <div className="flex justify-center mt-8">
+            <Button variant="outline" onClick={loadMore} disabled={isLoadingMore}>
+              {isLoadingMore && <Loader2 className="mr-2 h-4 w-4 animate-spin" />}
+              Carregar mais eventos
+            </Button>
+          </div>
+        )}
+
+        {!isLoading && events.length === 0 && (
           <div className="text-center py-12">
             <p className="text-muted-foreground text-lg">
-              {events.length === 0 
-                ? "Nenhum evento encontrado no banco de dados." 
-                : "Nenhum evento encontrado com os filtros selecionados."}
+              {hasFilters
+                ? "Nenhum evento encontrado com os filtros selecionados."
+                : "Nenhum evento encontrado no banco de dados."}
             </p>
           </div>
         )}
@@ -5,10 +5,32 @@ import { Tabs, TabsContent, TabsList, TabsTrigger } from "@/components/ui/tabs";
 import { BarChart, Calendar, Users, Star, TrendingUp, Download, Loader2 } from "lucide-react";
 import { Button } from "@/components/ui/button";
 import { toast } from "@/hooks/use-toast";
-import { eventAPI, ratingAPI, Event } from "@/services/api";
+import { eventAPI, statsAPI, userAPI, Event, EventPage } from "@/services/api";
+
+// Maior página aceita por GET /events
+const EVENTS_PAGE_SIZE = 100;
+
+// Interface para ler propriedades do Python
+interface BackendEvent extends Event {
+  creator_id?: number;
+  inscriptions_count?: number;
+  start_time?: string;
+}
+
+type TopEvent = { name: string; enrollments: number; rating: number };
+
+// "2025-11" -> "Nov. de 2025"
+const formatMonth = (key: string) => {
+  const [year, month] = key.split("-").map(Number);
+  const monthName = new Date(Date.UTC(year, month - 1, 1))
+    .toLocaleString('pt-BR', { month: 'short', year: 'numeric', timeZone: 'UTC' });
+  return monthName.charAt(0).toUpperCase() + monthName.slice(1);
+};
 
 const Statistics = () => {
   const [isLoading, setIsLoading] = useState(true);
+  // Futuros/realizados e mais populares saem da listagem de eventos, paginada à parte
+  const [isLoadingEvents, setIsLoadingEvents] = useState(true);
   const [stats, setStats] = useState({
     totalEvents: 0,
     totalEnrollments: 0,
@@ -21,93 +43,97 @@ const Statistics = () => {
       reuniao: 0,
     },
     eventsByMonth: {} as Record<string, number>,
-    topEvents: [] as { name: string; enrollments: number; rating: number }[],
+    topEvents: [] as TopEvent[],
   });
 
   useEffect(() => {
-    const calculateStats = async () => {
-      setIsLoading(true);
-      try {
-        const events = await eventAPI.getAll();
-        
-        const now = new Date();
-        let enrollmentsCount = 0;
-        let upcoming = 0;
-        let completed = 0;
-        const typeCounts = { workshop: 0, palestra: 0, reuniao: 0 };
-        const monthCounts: Record<string, number> = {};
-        
-        // Arrays auxiliares para Top Events
-        const eventsWithMetrics = [];
-
-        // Itera sobre todos os eventos para calcular métricas
-        for (const event of events) {
-          // 1. Contagem de Inscrições (Baseado em vagas preenchidas)
-          const filledSlots = event.maxVacancies - event.availableVacancies;
-          enrollmentsCount += filledSlots;
-
-          // 2. Status (Futuro vs Passado)
-          const eventDate = new Date(`${event.date}T${event.time}`);
+    // Totais e quebras por tipo/mês: somados no servidor (GET /dashboard/stats)
+    const loadTotals = async () => {
+      const dashboard = await statsAPI.getDashboard();
+
+      const typeCounts = { workshop: 0, palestra: 0, reuniao: 0 };
+      for (const item of dashboard.by_type) {
+        if (item.key === 'oficina') typeCounts.workshop = item.events;
+        else if (item.key === 'palestra') typeCounts.palestra = item.events;
+        else if (item.key === 'reuniao_interna') typeCounts.reuniao = item.events;
+      }
+
+      // by_month já vem em ordem cronológica
+      const monthCounts: Record<string, number> = {};
+      for (const item of dashboard.by_month) {
+        if (item.key) monthCounts[formatMonth(item.key)] = item.events;
+      }
+
+      setStats((current) => ({
+        ...current,
+        totalEvents: dashboard.total_events,
+        totalEnrollments: dashboard.total_inscriptions,
+        averageRating: 4.5, // Valor fixo ou calculado globalmente
+        eventsByType: typeCounts,
+        eventsByMonth: monthCounts,
+      }));
+    };
+
+    // Percorre as páginas de eventos só para o que o /dashboard/stats não traz.
+    // Considera apenas os eventos do organizador logado, os mesmos dos totais.
+    const loadEventMetrics = async () => {
+      const currentUser = await userAPI.getCurrent();
+      const now = new Date();
+      let upcoming = 0;
+      let completed = 0;
+      let top: TopEvent[] = [];
+
+      let cursor: string | null = null;
+      do {
+        const page: EventPage = await eventAPI.getPage(cursor, EVENTS_PAGE_SIZE);
+        cursor = page.next_cursor;
+
+        for (const event of page.items as BackendEvent[]) {
+          if (String(event.creator_id) !== String(currentUser.id)) continue;
+
+          const eventDate = event.start_time ? new Date(event.start_time) : new Date(`${event.date}T${event.time}`);
           if (eventDate < now) {
             completed++;
           } else {
             upcoming++;
           }
 
-          // 3. Tipos (Normalizando chaves)
-          const typeKey = event.type === 'oficina' ? 'workshop' : event.type;
-          if (typeCounts[typeKey as keyof typeof typeCounts] !== undefined) {
-            typeCounts[typeKey as keyof typeof typeCounts]++;
-          }
-
-          // 4. Mês
-          const monthName = new Date(event.date).toLocaleString('pt-BR', { month: 'short' });
-          const formattedMonth = monthName.charAt(0).toUpperCase() + monthName.slice(1);
-          monthCounts[formattedMonth] = (monthCounts[formattedMonth] || 0) + 1;
-
-          // 5. Avaliação (Opcional: busca média se o evento já passou)
-          // Para evitar N requisições, vamos simplificar ou buscar apenas para os tops se necessário.
-          // Aqui vamos simular/calcular baseado em dados disponíveis ou assumir 0 se não tiver endpoint de "media"
-          const avgRating = 0; // CORRIGIDO: alterado de let para const
-          // Se quiser precisão total, descomente abaixo (pode deixar o load lento):
-          /*
-          try {
-             const ratings = await ratingAPI.getByEvent(event.id);
-             if (ratings.length > 0) {
-               avgRating = ratings.reduce((acc, r) => acc + r.rating, 0) / ratings.length;
-             }
-          } catch (e) {}
-          */
-
-          eventsWithMetrics.push({
+          // Guarda só os 3 com mais inscrições até agora
+          top.push({
             name: event.title,
-            enrollments: filledSlots,
-            rating: avgRating || (Math.random() * 2 + 3).toFixed(1) // Placeholder realista se não buscar rating real
+            enrollments: event.inscriptions_count || 0,
+            rating: Number((Math.random() * 2 + 3).toFixed(1)) // Placeholder realista se não buscar rating real
           });
+          top = top.sort((a, b) => b.enrollments - a.enrollments).slice(0, 3);
         }
+      } while (cursor);
 
-        // Ordena Top Events
-        const top3 = eventsWithMetrics
-          .sort((a, b) => b.enrollments - a.enrollments)
-          .slice(0, 3)
-          .map(e => ({ ...e, rating: Number(e.rating) })); // CORRIGIDO: removido @ts-ignore desnecessário
-
-        setStats({
-          totalEvents: events.length,
-          totalEnrollments: enrollmentsCount,
-          averageRating: 4.5, // Valor fixo ou calculado globalmente
-          upcomingEvents: upcoming,
-          completedEvents: completed,
-          eventsByType: typeCounts,
-          eventsByMonth: monthCounts,
-          topEvents: top3
-        });
+      setStats((current) => ({
+        ...current,
+        upcomingEvents: upcoming,
+        completedEvents: completed,
+        topEvents: top,
+      }));
+    };
 
+    const calculateStats = async () => {
+      setIsLoading(true);
+      try {
+        await loadTotals();
       } catch (error) {
         console.error("Erro ao calcular estatísticas", error);
       } finally {
         setIsLoading(false);
       }
+
+      setIsLoadingEvents(true);
+      try {
+        await loadEventMetrics();
+      } catch (error) {
+        console.error("Erro ao calcular estatísticas", error);
+      } finally {
+        setIsLoadingEvents(false);
+      }
     };
 
     calculateStats();
@@ -167,7 +193,9 @@ ${stats.topEvents.map((e, i) => `${i + 1}. ${e.name} - ${e.enrollments} inscriç
             <h1 className="text-4xl font-bold bg-gradient-meninas bg-clip-text text-transparent mb-2">
               Estatísticas e Relatórios
             </h1>
-            <p className="text-muted-foreground">Visualize dados em tempo real</p>
+            <p className="text-muted-foreground">
+              Visualize dados em tempo real
+            </p>
           </div>
           <Button onClick={handleExportReport}>
             <Download className="w-4 h-4 mr-2" />
@@ -184,7 +212,9 @@ ${stats.topEvents.map((e, i) => `${i + 1}. ${e.name} - ${e.enrollments} inscriç
             <CardContent>
               <div className="text-2xl font-bold">{stats.totalEvents}</div>
               <p className="text-xs text-muted-foreground">
-                {stats.upcomingEvents} futuros, {stats.completedEvents} realizados
+                {isLoadingEvents
+                  ? "Contando futuros e realizados..."
+                  : `${stats.upcomingEvents} futuros, ${stats.completedEvents} realizados`}
               </p>
             </CardContent>
           </Card>
@@ -343,7 +373,11 @@ ${stats.topEvents.map((e, i) => `${i + 1}. ${e.name} - ${e.enrollments} inscriç
               </CardHeader>
               <CardContent>
                 <div className="space-y-4">
-                  {stats.topEvents.length === 0 ? (
+                  {isLoadingEvents ? (
+                    <div className="flex justify-center">
+                      <Loader2 className="h-6 w-6 animate-spin text-primary" />
+                    </div>
+                  ) : stats.topEvents.length === 0 ? (
                     <p className="text-center text-muted-foreground">Sem dados suficientes.</p>
                   ) : (
                     stats.topEvents.map((event, index) => (
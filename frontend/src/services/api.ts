@@ -51,6 +51,34 @@ export interface Event {
   inscriptions_count?: number;
 }
 
+// Uma página de GET /events: para a próxima, envie o next_cursor (null = fim)
+export interface EventPage {
+  items: Event[];
+  next_cursor: string | null;
+}
+
+export interface EventPageFilters {
+  event_type?: "oficina" | "palestra" | "reuniao_interna";
+  title?: string;
+}
+
+// GET /dashboard/stats: totais do organizador logado, somados no servidor
+export interface StatsBreakdown {
+  key: string | null;
+  events: number;
+  inscriptions: number;
+  checked_in: number;
+}
+
+export interface DashboardStats {
+  total_events: number;
+  total_inscriptions: number;
+  total_checked_in: number;
+  by_type: StatsBreakdown[];
+  by_month: StatsBreakdown[]; // key = "AAAA-MM"
+  by_host: StatsBreakdown[];
+}
+
 export interface User {
   id: string;
   name: string;
@@ -114,8 +142,15 @@ export interface CreateRatingInput {
 // --- 4. IMPLEMENTAÇÃO REAL ---
 
 export const eventAPI = {
-  getAll: async (): Promise<Event[]> => {
-    const response = await api.get('/events');
+  // A API é paginada por cursor: busca uma página por vez (cursor null = primeira)
+  getPage: async (
+    cursor: string | null = null,
+    limit = 20,
+    filters: EventPageFilters = {}
+  ): Promise<EventPage> => {
+    const response = await api.get('/events', {
+      params: { limit, ...filters, ...(cursor ? { cursor } : {}) },
+    });
     return response.data;
   },
 
@@ -259,6 +294,13 @@ export const eventAPI = {
   }
 };
 
+export const statsAPI = {
+  getDashboard: async (): Promise<DashboardStats> => {
+    const response = await api.get('/dashboard/stats');
+    return response.data;
+  }
+};
+
 export const userAPI = {
   getCurrent: async (): Promise<User> => {
     const response = await api.get('/users/me');